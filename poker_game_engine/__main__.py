@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+# Command line entry point: `python -m poker_game_engine` or the `poker-game-engine` script.
+# Importing the package never runs a game, only this module's main() does.
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog='poker-game-engine', description="Texas Hold'em game engine.")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('play', help="Play an interactive game in the terminal (default)")
+    simulate = commands.add_parser('simulate', help="Play hands between random agents and print statistics")
+    simulate.add_argument('--players', type=int, default=4)
+    simulate.add_argument('--hands', type=int, default=1000)
+    simulate.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'simulate':
+        from poker_game_engine.simulator import run_headless_simulation
+        result = run_headless_simulation(nb_players=args.players, hands=args.hands, seed=args.seed)
+        for name, value in result.items():
+            print(f"{name:18} {value}")
+        return 0
+    from poker_game_engine.simulator import run_game_simulation
+    run_game_simulation()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,27 +10,20 @@ class ActionHandler:
     def __init__(self, game: Game, logger: GameLogger) -> None:
         self.game = game 
         self.logger = logger 
+        self.recorder = None  # Optional hand history writer, gets every accepted decision
 
     def handle_fold(self, player: Player) -> None:
         '''
         Handles the action of a player folding their hand, setting their active status to False.
         '''
-        player.fold()
-        self.game.next_turn()
+        self.game.fold(player)
 
     def handle_bet(self, player: Player, amount: int) -> None:
         '''
         Handles the action of a player betting an amount, deducting the amount from their bankroll,
         adding it to their current bet, and updating the game's pot.
         '''
-        minimum_raise = self.game.last_bet
-        if amount >= minimum_raise:
-            if player.bet(amount):
-                self.game.pot += amount
-                self.game.last_bet = amount
-                self.game.next_turn()
-                return True
-        return False
+        return self.game.bet(player, amount)
 
     def handle_check(self, player: Player) -> None:
         '''
@@ -38,14 +31,28 @@ class ActionHandler:
         '''
         self.game.next_turn()
 
-    def handle_call(self, player: Player) -> bool:
-        max_bet = self.game.get_max_phase_bet()
-        call_amount = max(max_bet - player.total_game_bet,0)
-        if player.bet(call_amount):
-            self.game.pot += call_amount
-            self.game.next_turn()
-            return True
-        return False
+    def handle_call(self, player: Player, max_bet: int = None) -> bool:
+        '''
+        Matches the highest bet of the phase. A player who cannot cover it calls all-in for their whole bankroll.
+        `max_bet` skips the scan over the players when the caller already tracks it.
+        '''
+        return self.game.call(player, max_bet)
+
+    def handle_all_in(self, player: Player) -> bool:
+        '''
+        Handles a player betting their whole bankroll. It counts as a raise when it exceeds the current bet.
+        '''
+        return self.game.all_in(player)
+
+    def post_blind(self, player: Player, amount: int) -> None:
+        '''
+        Posts a forced blind, all-in when the bankroll is shorter than the blind.
+        '''
+        amount = min(amount, player.bankroll)
+        if amount > 0:
+            player.bet(amount)
+            self.game.pot += amount
+            self.game.last_bet = max(self.game.last_bet, amount)
 
     def handle_deal_card(self, player: Player) -> None:
         '''
@@ -62,14 +69,14 @@ class ActionHandler:
         for _ in range(number_of_cards):
             self.game.deal_community_card()
 
-    def player_action_input(self, player: Player,choice: str, amount_bet=0) -> bool:
+    def player_action_input(self, player: Player,choice: str, amount_bet=0, max_bet: int = None) -> bool:
         '''
         Gets the player for their action and processes it.
+        `max_bet` is the current highest phase bet when known (see betting.BettingRound).
         '''
         if choice == '1':
             self.handle_fold(player)
-            return True
-            
+
         elif choice == '2':
             bet_handled=self.handle_bet(player, amount_bet)
             if not bet_handled :
@@ -77,27 +84,33 @@ class ActionHandler:
                 return False            
 
         elif choice == '3':
-            if not self.can_player_check(player):
+            if not self.can_player_check(player, max_bet):
                 self.logger.log_warning("Check is not permissible. There's a bet to match.")
                 return False
+            self.handle_check(player)
         
         elif choice == '4':
-            if not self.handle_call(player):
+            if not self.handle_call(player, max_bet):
                 self.logger.log_warning("Call failed, not enough bankroll or incorrect call amount.")
                 return False 
+
+        elif choice == '5':
+            if not self.handle_all_in(player):
+                self.logger.log_warning("All-in failed, no bankroll left.")
+                return False
                 
         else:
             self.logger.log_warning("Invalid choice. Please choose again.")
             return False
         
-        self.logger.log_player_action(action=actions_vals[choice],amount=amount_bet)
+        self.logger.log_player_action(action=actions_vals[choice],amount=amount_bet,player=player)
+        if self.recorder is not None:
+            self.recorder.record_action(player, choice, amount_bet)
         return True
         
 
-    def can_player_check(self, player: Player):
-        # Check if any player has placed a bet that hasn't been matched yet
-        round_bet = player.phase_bet
-        for p in self.game.players:
-            if p.phase_bet != round_bet:
-                return False
-        return True
\ No newline at end of file
+    def can_player_check(self, player: Player, max_bet: int = None):
+        # A player can check only when no bet above their own is pending
+        if max_bet is None:
+            max_bet = self.game.get_max_phase_bet()
+        return player.phase_bet >= max_bet
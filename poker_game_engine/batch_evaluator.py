@@ -0,0 +1,98 @@
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator, get_tables
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path is used instead
+    np = None
+
+# Rows evaluated per vectorized pass, bounds the size of the temporary arrays
+CHUNK_SIZE = 1 << 16
+
+_array_tables = None
+
+
+def _get_array_tables() -> tuple:
+    # NumPy versions of the lookup tables: flush table, sorted rank-count keys and their strengths
+    global _array_tables
+    if _array_tables is None:
+        flush_table, rank_table = get_tables()
+        keys = np.array(sorted(rank_table), dtype=np.int64)
+        strengths = np.array([rank_table[key] for key in keys.tolist()], dtype=np.int64)
+        weights = np.array([5 ** index for index in range(13)], dtype=np.int64)
+        _array_tables = (np.array(flush_table, dtype=np.int64), keys, strengths, weights)
+    return _array_tables
+
+
+def _evaluate_chunk(cards):
+    flush_table, keys, strengths, weights = _get_array_tables()
+    ranks = cards >> 2
+    suits = cards & 3
+    rows = np.arange(len(cards))
+
+    # Rank histogram packed as a base-5 key, straights and pairs are resolved by the rank table
+    result = strengths[np.searchsorted(keys, weights[ranks].sum(axis=1))]
+
+    # Suit histogram, then rank masks of the flush suit for the few rows holding five suited cards
+    suit_counts = np.bincount((rows[:, None] * 4 + suits).ravel(), minlength=4 * len(cards)).reshape(-1, 4)
+    flush_suits = suit_counts.argmax(axis=1)
+    flush_rows = np.flatnonzero(suit_counts[rows, flush_suits] >= 5)
+    if len(flush_rows):
+        # A rank appears once per suit, so summing the bits is the same as or-ing them
+        in_suit = suits[flush_rows] == flush_suits[flush_rows, None]
+        flush_masks = np.where(in_suit, np.left_shift(1, ranks[flush_rows]), 0).sum(axis=1)
+        # Five suited cards out of seven rule out quads and full houses, so the flush is the best hand
+        result[flush_rows] = flush_table[flush_masks]
+    return result
+
+
+def evaluate_batch(cards):
+    '''
+    Scores many hands at once. `cards` is an (N, k) array of card codes (Card.code), 5 <= k <= 7,
+    and the result is an (N,) array of LookupHandEvaluator strengths.
+    Without NumPy, `cards` is a sequence of code sequences and a list is returned.
+    '''
+    if np is None:
+        evaluator = LookupHandEvaluator()
+        return [evaluator.evaluate_codes(hand) for hand in cards]
+
+    cards = np.asarray(cards, dtype=np.int64)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, 5..7) array of card codes, got shape {cards.shape}")
+    if len(cards) <= CHUNK_SIZE:
+        return _evaluate_chunk(cards)
+    result = np.empty(len(cards), dtype=np.int64)
+    for start in range(0, len(cards), CHUNK_SIZE):
+        result[start:start + CHUNK_SIZE] = _evaluate_chunk(cards[start:start + CHUNK_SIZE])
+    return result
+
+
+def determine_winners_batch(hole_cards, boards, active=None) -> tuple:
+    '''
+    Batch counterpart of Game.determine_winner.
+    `hole_cards` is an (N, P, 2) array of card codes for P seats at N tables, `boards` an (N, 5) array and
+    `active` an optional (N, P) boolean array of players still in the hand.
+    Returns (strengths, winners): the (N, P) strengths, -1 for inactive seats, and an (N, P) boolean
+    array flagging every player holding the best hand, so ties show up as several winners.
+    '''
+    if np is None:
+        evaluator = LookupHandEvaluator()
+        all_strengths, all_winners = [], []
+        for table, (seats, board) in enumerate(zip(hole_cards, boards)):
+            board = list(board)
+            strengths = [evaluator.evaluate_codes(list(hand) + board)
+                         if active is None or active[table][seat] else -1
+                         for seat, hand in enumerate(seats)]
+            best = max(strengths)
+            all_strengths.append(strengths)
+            all_winners.append([strength == best and strength >= 0 for strength in strengths])
+        return all_strengths, all_winners
+
+    hole_cards = np.asarray(hole_cards, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    tables, seats = hole_cards.shape[:2]
+    hands = np.concatenate([hole_cards, np.broadcast_to(boards[:, None, :], (tables, seats, boards.shape[1]))], axis=2)
+    strengths = evaluate_batch(hands.reshape(tables * seats, -1)).reshape(tables, seats)
+    if active is not None:
+        strengths = np.where(np.asarray(active, dtype=bool), strengths, -1)
+    winners = (strengths == strengths.max(axis=1, keepdims=True)) & (strengths >= 0)
+    return strengths, winners
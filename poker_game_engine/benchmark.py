@@ -0,0 +1,219 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from poker_game_engine.game_engine import Deck, Game, HandEvaluator, CARDS
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.simulator import HeadlessSimulator
+
+# Engine throughput benchmarks. Every benchmark is a setup function returning a callable that does one
+# operation; inputs come from fixed seeds so runs are comparable. Results are seconds per operation
+# (best of `repeat` timings), baselines are JSON files written by `run --save`.
+# The calibration benchmark is a fixed pure-Python workload run with every suite: comparisons divide by
+# it, so a baseline taken on another machine, or on a busy one, still compares engine code only.
+DEFAULT_THRESHOLD = 0.25
+SEED = 1234
+CALIBRATION = "calibration"
+
+
+def _random_cards(count: int, seed: int = SEED) -> list:
+    return random.Random(seed).sample(CARDS, count)
+
+
+def _evaluate_hand():
+    evaluator = HandEvaluator()
+    cards = _random_cards(5)
+    return lambda: evaluator.evaluate_hand(cards)
+
+
+def _best_hand():
+    evaluator = HandEvaluator()
+    cards = _random_cards(7)
+    return lambda: evaluator.best_hand(cards)
+
+
+def _lookup_best_hand():
+    evaluator = LookupHandEvaluator()
+    cards = _random_cards(7)
+    return lambda: evaluator.best_hand(cards)
+
+
+def _simulate_hands():
+    simulator = HeadlessSimulator(nb_players=6, seed=SEED)
+
+    def play() -> None:
+        if sum(1 for p in simulator.game.players if p.bankroll > 0) < 2:
+            for player in simulator.game.players:
+                player.bankroll = 1000
+        simulator.play_hand()
+    return play
+
+
+def _determine_winner(nb_players: int):
+    def setup():
+        game = Game(players=nb_players, seed=SEED)
+        game.start_new_round()
+        for _ in range(2):
+            for player in game.players:
+                player.add_card(game.deck.deal())
+        for _ in range(5):
+            game.deal_community_card()
+        return game.determine_winner
+    return setup
+
+
+def _dealt_game() -> Game:
+    game = Game(players=6, seed=SEED)
+    game.start_new_round()
+    for player in game.players:
+        player.add_card(game.deck.deal())
+        player.add_card(game.deck.deal())
+    for _ in range(3):
+        game.deal_community_card()
+    return game
+
+
+def _get_game_state():
+    return _dealt_game().get_game_state
+
+
+def _game_clone():
+    return _dealt_game().clone
+
+
+def _apply_undo():
+    game = _dealt_game()
+
+    def search_step() -> None:
+        game.apply_action('2', 40)
+        game.apply_action('4')
+        game.deal_street(1)
+        game.undo_action()
+        game.undo_action()
+        game.undo_action()
+    return search_step
+
+
+def _deck_create():
+    rng = random.Random(SEED)
+    return lambda: Deck(rng)
+
+
+def _deck_shuffle():
+    deck = Deck(seed=SEED)
+    return deck.reset
+
+
+def _calibration():
+    values = list(range(256))
+    return lambda: sorted(values, key=lambda value: -value)
+
+
+BENCHMARKS = {
+    CALIBRATION: _calibration,
+    "evaluate_hand": _evaluate_hand,
+    "best_hand": _best_hand,
+    "lookup_best_hand": _lookup_best_hand,
+    "simulate_hand": _simulate_hands,
+    **{f"determine_winner_{count}": _determine_winner(count) for count in range(2, 10)},
+    "get_game_state": _get_game_state,
+    "game_clone": _game_clone,
+    "apply_undo": _apply_undo,
+    "deck_create": _deck_create,
+    "deck_shuffle": _deck_shuffle,
+}
+
+
+def run_benchmarks(names: list = None, min_time: float = 0.05, repeat: int = 5) -> dict:
+    '''
+    Runs the selected benchmarks (all by default) and returns {name: seconds per operation}.
+    Each timing loops for about `min_time` seconds, the best of `repeat` timings is kept.
+    '''
+    results = {}
+    names = list(names) if names is not None else list(BENCHMARKS)
+    if CALIBRATION not in names:
+        names.insert(0, CALIBRATION)
+    for name in names:
+        operation = BENCHMARKS[name]()
+        timer = timeit.Timer(operation)
+        number = 1
+        while timer.timeit(number) < min_time and number < 1 << 24:
+            number *= 2
+        results[name] = min(timer.repeat(repeat, number)) / number
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    '''
+    Returns (name, baseline, result, ratio) for every benchmark slower than its baseline by more
+    than `threshold` (0.25 = 25%), relative to the calibration benchmark when both sides have it.
+    Benchmarks missing from either side are ignored.
+    '''
+    scale = 1.0
+    if results.get(CALIBRATION) and baseline.get(CALIBRATION):
+        scale = baseline[CALIBRATION] / results[CALIBRATION]
+    regressions = []
+    for name, expected in baseline.items():
+        measured = results.get(name)
+        if name == CALIBRATION or measured is None or not expected:
+            continue
+        ratio = measured * scale / expected
+        if ratio > 1 + threshold:
+            regressions.append((name, expected, measured, ratio))
+    return regressions
+
+
+def save_results(path: str, results: dict) -> None:
+    with open(path, 'w') as handle:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                  handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path) as handle:
+        return json.load(handle)["results"]
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Engine throughput benchmarks.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="Run the benchmarks and print the results")
+    run.add_argument('--save', help="Write the results to this JSON file (e.g. a new baseline)")
+    compare_parser = commands.add_parser('compare', help="Run the benchmarks and fail on regressions")
+    compare_parser.add_argument('baseline', help="Baseline JSON file")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    for command in (run, compare_parser):
+        command.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help="Benchmarks to run")
+        command.add_argument('--min-time', type=float, default=0.05)
+        command.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        baseline = load_results(args.baseline)
+        names = args.only or [name for name in BENCHMARKS if name in baseline]
+    else:
+        names = args.only
+    results = run_benchmarks(names, min_time=args.min_time, repeat=args.repeat)
+    for name, seconds in results.items():
+        print(f"{name:24} {seconds * 1e6:12.3f} us")
+
+    if args.command == 'run':
+        if args.save:
+            save_results(args.save, results)
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        # Timings are noisy on shared machines: a regression only counts if a second run confirms it
+        rerun = run_benchmarks([name for name, *_ in regressions], min_time=args.min_time, repeat=args.repeat)
+        confirmed = {name for name, *_ in compare(rerun, baseline, args.threshold)}
+        regressions = [regression for regression in regressions if regression[0] in confirmed]
+    for name, expected, measured, ratio in regressions:
+        print(f"REGRESSION {name}: {expected * 1e6:.3f} us -> {measured * 1e6:.3f} us ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+from poker_game_engine.game_engine import Game, Player
+from poker_game_engine.action_handlers import ActionHandler
+
+# Legal choices (see constants.actions_vals), shared tuples so legal_actions() never allocates
+_NO_BET = ('1', '2', '3', '5')  # Nothing to call
+_FACING_BET = ('1', '2', '4', '5')  # Can call or raise
+_SHORT = ('1', '4', '5')  # Calling takes the whole bankroll
+_CLOSED = ()
+
+# Abstract actions of search agents (see abstract_actions): fold, check or call, then one bet per pot
+# fraction (2, 3, ...), then all-in
+FOLD = 0
+CALL = 1
+
+
+class BettingRound:
+    '''
+    State machine of one betting round. The highest phase bet, the last aggressor and the number of
+    players still to act are kept as counters, so legal_actions() and apply() never scan the table.
+    The round closes as soon as every player able to act has matched the last raise, or when a single
+    player is left in the hand. All-in players are skipped.
+
+    One instance can be reused for every round of a table: call start() after the blinds (pre-flop)
+    or after the phase bets are reset (later streets).
+    '''
+    __slots__ = ('game', 'handler', 'max_bet', 'last_aggressor', 'to_act', 'live', 'actors', 'current')
+
+    def __init__(self, game: Game, handler: ActionHandler):
+        self.game = game
+        self.handler = handler
+        self.max_bet = 0
+        self.last_aggressor = None
+        self.to_act = 0
+        self.live = 0  # Players still in the hand
+        self.actors = 0  # Players still in the hand with chips behind
+        self.current = 0
+
+    def start(self, start_index: int) -> None:
+        '''
+        Opens a round where `start_index` is the first seat to speak (skipped if it cannot act).
+        '''
+        players = self.game.players
+        max_bet = live = actors = 0
+        for player in players:
+            if player.phase_bet > max_bet:
+                max_bet = player.phase_bet
+            if player.active:
+                live += 1
+                if player.bankroll > 0:
+                    actors += 1
+        self.max_bet = max_bet
+        self.last_aggressor = None
+        self.live = live
+        self.actors = actors
+        self.current = start_index
+        if actors == 1:
+            # Everyone else is all-in: the last player only acts if a bet is pending
+            self.to_act = 1
+            self._seek(start_index)
+            if players[self.current].phase_bet >= max_bet:
+                self.to_act = 0
+        else:
+            self.to_act = actors
+            if actors:
+                self._seek(start_index)
+
+    def _seek(self, index: int) -> None:
+        # Moves to the first seat from `index` on that is still in the hand with chips
+        players = self.game.players
+        nb_players = len(players)
+        player = players[index]
+        while not (player.active and player.bankroll > 0):
+            index = (index + 1) % nb_players
+            player = players[index]
+        self.current = index
+        self.game.current_player_id = index
+
+    @property
+    def closed(self) -> bool:
+        return self.to_act <= 0 or self.live <= 1
+
+    @property
+    def player(self) -> Player:
+        return self.game.players[self.current]
+
+    @property
+    def to_call(self) -> int:
+        return self.max_bet - self.player.phase_bet
+
+    def legal_actions(self) -> tuple:
+        '''
+        Returns the choices the current player may take. A bet ('2') must also raise the highest bet.
+        '''
+        if self.closed:
+            return _CLOSED
+        player = self.game.players[self.current]
+        to_call = self.max_bet - player.phase_bet
+        if to_call <= 0:
+            return _NO_BET
+        if player.bankroll > to_call:
+            return _FACING_BET
+        return _SHORT
+
+    def apply(self, choice: str, amount: int = 0) -> bool:
+        '''
+        Plays `choice` for the current player through the ActionHandler, then moves the turn on.
+        Returns False, leaving the round unchanged, when the action is not legal.
+        '''
+        if choice not in self.legal_actions():
+            return False
+        player = self.game.players[self.current]
+        max_bet = self.max_bet
+        if choice == '2' and player.phase_bet + amount <= max_bet:
+            return False  # A bet has to raise, calls go through '4'
+        if not self.handler.player_action_input(player, choice, amount, max_bet):
+            return False
+
+        if not player.active:
+            self.live -= 1
+            self.actors -= 1
+        elif player.bankroll == 0:
+            self.actors -= 1
+        if player.phase_bet > max_bet:
+            # A raise reopens the action for everyone else with chips
+            self.max_bet = player.phase_bet
+            self.last_aggressor = self.current
+            self.to_act = self.actors if player.bankroll == 0 else self.actors - 1
+        else:
+            self.to_act -= 1
+        if not self.closed:
+            self._seek((self.current + 1) % len(self.game.players))
+        return True
+
+
+def abstract_actions(betting: BettingRound, bet_sizes: tuple, big_blind: int, can_raise: bool = True) -> list:
+    '''
+    (action, choice, amount) of a small action menu for the player to act, as used by solvers and search:
+    fold (only against a bet), check or call, a bet of each fraction of the pot, all-in. A bet puts in the
+    call plus a raise of at least the last bet and the big blind; bets that round to the same amount,
+    or to the whole bankroll, are dropped. Without `can_raise`, only fold and check/call remain.
+    '''
+    player = betting.player
+    to_call = betting.to_call
+    if to_call > 0:
+        actions = [(FOLD, '1', 0), (CALL, '4', 0)]
+    else:
+        actions = [(CALL, '3', 0)]
+    if can_raise and player.bankroll > to_call:
+        game = betting.game
+        pot = game.pot
+        amounts = set()
+        for offset, fraction in enumerate(bet_sizes):
+            amount = to_call + max(int(fraction * (pot + to_call)), game.last_bet, big_blind)
+            if amount < player.bankroll and amount not in amounts:
+                amounts.add(amount)
+                actions.append((2 + offset, '2', amount))
+        actions.append((2 + len(bet_sizes), '5', 0))
+    return actions
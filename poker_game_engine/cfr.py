@@ -0,0 +1,375 @@
+import os
+import random
+import struct
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.betting import CALL, abstract_actions
+from poker_game_engine.game_engine import CARDS, HandEvaluator
+from poker_game_engine.equity_cache import NB_PREFLOP_CLASSES, preflop_class
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.lookup_evaluator import five_card_classes
+from poker_game_engine.pots import settle_pots
+from poker_game_engine.table import Table
+
+# Abstract actions of the solver: see betting.abstract_actions.
+# Information sets are packed into one integer: the action history of the hand (4 bits per action, with
+# a separator between streets), then the hand bucket of the player to act, then its position.
+_STREET_SEPARATOR = 15
+_HISTORY_BASE = 16
+_BUCKET_BASE = NB_PREFLOP_CLASSES  # Pre-flop buckets are the 169 starting-hand classes
+_SIZE_BITS = 4  # Index entries are the row offset, shifted, and the number of actions of the row
+
+# Checkpoint file:
+#   header: magic, players, raises per street, buckets, bet sizes, key bytes, rows, values,
+#           stack, small blind, big blind, iterations
+#   float64 bet sizes, keys (key bytes each, little endian, insertion order), uint64 index entries,
+#   float64 cumulative regrets, float64 strategy sums
+_MAGIC = b'CFR1'
+_HEADER = struct.Struct('<4sBBHBBIIqqqQ')
+
+
+@lru_cache(maxsize=1)
+def _strength_distribution() -> tuple:
+    '''
+    Every distinct five-card strength (7462 of them), sorted, with the cumulative number of the
+    2,598,960 five-card hands that are at most that strong.
+    '''
+    evaluator = HandEvaluator()
+    frequencies = Counter()
+    for codes, count in five_card_classes():
+        frequencies[evaluator.hand_strength([CARDS[code] for code in codes])] += count
+    strengths = sorted(frequencies)
+    cumulative = []
+    total = 0
+    for strength in strengths:
+        total += frequencies[strength]
+        cumulative.append(total)
+    return strengths, cumulative
+
+
+def strength_bucket(strength: int, nb_buckets: int) -> int:
+    '''
+    Bucket (0..nb_buckets - 1) of a packed hand strength (HandEvaluator.best_hand), by its percentile
+    among all five-card hands, so that buckets hold hands of similar value rather than equal categories.
+    '''
+    strengths, cumulative = _strength_distribution()
+    index = bisect_right(strengths, strength) - 1
+    if index < 0:
+        return 0
+    return min(cumulative[index] * nb_buckets // cumulative[-1], nb_buckets - 1)
+
+
+def info_set_key(history: int, bucket: int, position: int, nb_players: int) -> int:
+    '''
+    Packs an information set: `history` holds the abstract actions of the hand so far, oldest first,
+    as base-16 digits with _STREET_SEPARATOR between streets (0 for an empty history); `position`
+    counts seats from the dealer.
+    '''
+    return (history * _BUCKET_BASE + bucket) * nb_players + position
+
+
+class _UndoableHandler(ActionHandler):
+    # Plays the decisions of the solver's betting round through Game.apply_action, onto the undo stack
+    def player_action_input(self, player, choice: str, amount_bet=0, max_bet: int = None) -> bool:
+        return self.game.apply_action(choice, amount_bet, player, max_bet)
+
+
+class CFRSolver:
+    '''
+    External-sampling Monte Carlo CFR over the engine's own rules: every iteration deals a hand on a
+    Table (Game, ActionHandler and BettingRound), then walks its betting tree once per player, trying
+    every abstract action of that player and sampling the others from the current strategy. Decisions
+    and streets go on the Game undo stack (apply_action, deal_street) and branches are rewound with
+    undo_action, only the BettingRound counters are saved here, so the tree is walked on a single table
+    without copies.
+
+    Hands are bucketed by starting-hand class pre-flop and by HandEvaluator strength percentile on
+    later streets (see strength_bucket). Regrets and strategy sums live in two flat float64 arrays,
+    one row of consecutive entries per information set; `index` maps packed keys to row offsets and sizes.
+    Every hand starts with `stack` chips per player; the button moves every iteration.
+    '''
+    def __init__(self, nb_players: int = 2, stack: int = 200, small_blind: int = 1, big_blind: int = 2,
+                 bet_sizes: tuple = (0.5, 1.0), max_raises: int = 2, nb_buckets: int = 8, seed: int = None):
+        if len(bet_sizes) > _STREET_SEPARATOR - 3:
+            raise ValueError("Too many bet sizes")
+        if not 1 <= nb_buckets <= _BUCKET_BASE:
+            raise ValueError(f"nb_buckets must be between 1 and {_BUCKET_BASE}")
+        self.nb_players = nb_players
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.bet_sizes = tuple(bet_sizes)
+        self.max_raises = max_raises
+        self.nb_buckets = nb_buckets
+        self.all_in = 2 + len(self.bet_sizes)  # Index of the all-in action
+        self.rng = random.Random(seed)
+        self.table = Table(nb_players, seed=self.rng.getrandbits(64), small_blind=small_blind,
+                           big_blind=big_blind, starting_bankroll=stack)
+        self.table.betting.handler = _UndoableHandler(self.table.game, NullGameLogger(self.table.game))
+        self.index = {}  # Information set key -> row offset << _SIZE_BITS | row size
+        self.regrets = array('d')
+        self.strategy_sums = array('d')
+        self.iterations = 0
+        self._buckets = {}
+
+    @property
+    def config(self) -> tuple:
+        # Arguments rebuilding an equivalent solver (the seed aside), for worker processes
+        return (self.nb_players, self.stack, self.small_blind, self.big_blind, self.bet_sizes, self.max_raises,
+                self.nb_buckets)
+
+    def _row(self, key: int, size: int) -> int:
+        # Offset of the row of an information set, added on first visit
+        entry = self.index.get(key)
+        if entry is None:
+            offset = len(self.regrets)
+            self.index[key] = offset << _SIZE_BITS | size
+            self.regrets.extend([0.0] * size)
+            self.strategy_sums.extend([0.0] * size)
+            return offset
+        return entry >> _SIZE_BITS
+
+    def _save(self) -> tuple:
+        # Undo stack depth and what the Game does not hold: the BettingRound counters and the street
+        table = self.table
+        betting = table.betting
+        return (len(table.game.action_stack), betting.max_bet, betting.last_aggressor, betting.to_act,
+                betting.live, betting.actors, betting.current, table.street)
+
+    def _restore(self, state: tuple) -> None:
+        table = self.table
+        game = table.game
+        betting = table.betting
+        depth, betting.max_bet, betting.last_aggressor, betting.to_act, betting.live, betting.actors, \
+            betting.current, table.street = state
+        while len(game.action_stack) > depth:
+            game.undo_action()
+
+    def _settle(self) -> list:
+        # Chip changes of the hand over. Settling is not an action: an empty street records every player
+        # first, so that undo_action gives the chips back
+        table = self.table
+        game = table.game
+        game.deal_street(0)
+        settle_pots(game)
+        rewards = [player.bankroll - before for player, before in zip(game.players, table.hand_bankrolls)]
+        game.undo_action()
+        return rewards
+
+    def legal_actions(self, raises: int) -> list:
+        '''
+        (action, choice, amount) of the abstract actions open to the player to act (see
+        betting.abstract_actions), after `raises` raises on this street.
+        '''
+        table = self.table
+        return abstract_actions(table.betting, self.bet_sizes, table.big_blind, raises < self.max_raises)
+
+    def _bucket(self, player, street: int) -> int:
+        bucket = self._buckets.get((player.player_id, street))
+        if bucket is None:
+            if street == 0:
+                bucket = preflop_class((player.hand[0].code, player.hand[1].code))
+            else:
+                game = self.table.game
+                bucket = strength_bucket(game.evaluator.best_hand(player.hand + game.community_cards), self.nb_buckets)
+            self._buckets[(player.player_id, street)] = bucket
+        return bucket
+
+    def _key(self, history: int, player, street: int) -> int:
+        position = (player.player_id - self.table.game.dealer_index) % self.nb_players
+        return info_set_key(history, self._bucket(player, street), position, self.nb_players)
+
+    def _strategy(self, offset: int, size: int) -> list:
+        # Regret matching: play in proportion to the positive regrets, uniformly when there are none
+        regrets = self.regrets
+        positive = [regret if regret > 0.0 else 0.0 for regret in regrets[offset:offset + size]]
+        total = sum(positive)
+        if total > 0.0:
+            return [regret / total for regret in positive]
+        return [1.0 / size] * size
+
+    def _play(self, choice: str, amount: int, history: int, action: int, raises: int) -> tuple:
+        # Applies an action, deals the closed streets. Returns (rewards or None, history, raises)
+        table = self.table
+        street = table.street
+        table.act(choice, amount)
+        if table.deal_streets():
+            return self._settle(), history, raises
+        history = history * _HISTORY_BASE + action
+        if action > CALL:
+            raises += 1
+        if table.street != street:
+            history = history * _HISTORY_BASE + _STREET_SEPARATOR
+            raises = 0
+        return None, history, raises
+
+    def _traverse(self, traverser: int, history: int, raises: int) -> float:
+        table = self.table
+        player = table.betting.player
+        actions = self.legal_actions(raises)
+        size = len(actions)
+        offset = self._row(self._key(history, player, table.street), size)
+        strategy = self._strategy(offset, size)
+
+        if player.player_id != traverser:
+            strategy_sums = self.strategy_sums
+            for index, probability in enumerate(strategy):
+                strategy_sums[offset + index] += probability
+            threshold = self.rng.random()
+            index = 0
+            while index < size - 1 and threshold >= strategy[index]:
+                threshold -= strategy[index]
+                index += 1
+            action, choice, amount = actions[index]
+            state = self._save()
+            rewards, child_history, child_raises = self._play(choice, amount, history, action, raises)
+            value = rewards[traverser] if rewards is not None else self._traverse(traverser, child_history, child_raises)
+            self._restore(state)
+            return value
+
+        values = []
+        for action, choice, amount in actions:
+            state = self._save()
+            rewards, child_history, child_raises = self._play(choice, amount, history, action, raises)
+            values.append(rewards[traverser] if rewards is not None
+                          else self._traverse(traverser, child_history, child_raises))
+            self._restore(state)
+        node_value = sum(probability * value for probability, value in zip(strategy, values))
+        regrets = self.regrets
+        for index, value in enumerate(values):
+            regrets[offset + index] += value - node_value
+        return node_value
+
+    def iterate(self) -> None:
+        '''
+        Runs one iteration: deals a hand, then walks it once for every player.
+        '''
+        table = self.table
+        game = table.game
+        table.abort_hand()  # The previous iteration's hand is left at its root
+        for player in game.players:
+            player.bankroll = self.stack
+        game.dealer_index = self.iterations % self.nb_players
+        self._buckets = {}
+        rewards = [0] * self.nb_players
+        table.start(rewards)
+        root = self._save()
+        for traverser in range(self.nb_players):
+            self._traverse(traverser, 0, 0)
+            self._restore(root)
+        self.iterations += 1
+
+    def train(self, iterations: int, workers: int = 1, sync_every: int = 1000) -> None:
+        '''
+        Runs `iterations` iterations. With several workers, each round of `sync_every` iterations is
+        split between worker processes that start from the current tables; the regret and strategy
+        sums they accumulate are then added back here.
+        '''
+        if workers <= 1:
+            for _ in range(iterations):
+                self.iterate()
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while iterations > 0:
+                round_size = min(iterations, sync_every)
+                iterations -= round_size
+                shares = [round_size // workers + (1 if worker < round_size % workers else 0) for worker in range(workers)]
+                tasks = [(self.config, self.iterations + sum(shares[:worker]), share, self.rng.getrandbits(64),
+                          self.index, self.regrets, self.strategy_sums)
+                         for worker, share in enumerate(shares) if share]
+                base_size = len(self.regrets)
+                base_regrets = self.regrets[:]
+                base_sums = self.strategy_sums[:]
+                for new_rows, regrets, strategy_sums in executor.map(_train_worker, tasks):
+                    self._merge(base_size, base_regrets, base_sums, new_rows, regrets, strategy_sums)
+                self.iterations += round_size
+
+    def _merge(self, base_size: int, base_regrets: array, base_sums: array, new_rows: list, regrets: array,
+               strategy_sums: array) -> None:
+        # Rows known before the round keep their offsets in the worker, their changes are added directly
+        own_regrets = self.regrets
+        own_sums = self.strategy_sums
+        for offset in range(base_size):
+            own_regrets[offset] += regrets[offset] - base_regrets[offset]
+            own_sums[offset] += strategy_sums[offset] - base_sums[offset]
+        for key, offset, size in new_rows:
+            row = self._row(key, size)
+            for index in range(size):
+                own_regrets[row + index] += regrets[offset + index]
+                own_sums[row + index] += strategy_sums[offset + index]
+
+    def average_strategy(self, key: int) -> list:
+        '''
+        Probabilities of the actions of an information set (in legal_actions order), averaged over
+        training. This is the strategy that converges, the current one only drives the sampling.
+        '''
+        entry = self.index[key]
+        offset, size = entry >> _SIZE_BITS, entry & ((1 << _SIZE_BITS) - 1)
+        sums = self.strategy_sums[offset:offset + size]
+        total = sum(sums)
+        if total > 0.0:
+            return [value / total for value in sums]
+        return [1.0 / size] * size
+
+    def save(self, path: str) -> None:
+        '''
+        Writes a checkpoint: the solver settings, the iteration count and both tables.
+        '''
+        keys = list(self.index)
+        key_bytes = max(((key.bit_length() + 7) // 8 for key in keys), default=1) or 1
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as handle:
+            handle.write(_HEADER.pack(_MAGIC, self.nb_players, self.max_raises, self.nb_buckets, len(self.bet_sizes),
+                                      key_bytes, len(keys), len(self.regrets), self.stack, self.small_blind,
+                                      self.big_blind, self.iterations))
+            handle.write(struct.pack(f'<{len(self.bet_sizes)}d', *self.bet_sizes))
+            handle.write(b''.join(key.to_bytes(key_bytes, 'little') for key in keys))
+            handle.write(array('Q', self.index.values()).tobytes())
+            handle.write(self.regrets.tobytes())
+            handle.write(self.strategy_sums.tobytes())
+        os.replace(temporary, path)  # A crash while writing keeps the previous checkpoint
+
+    @classmethod
+    def load(cls, path: str, seed: int = None) -> 'CFRSolver':
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        (magic, nb_players, max_raises, nb_buckets, nb_sizes, key_bytes, nb_keys, nb_values, stack, small_blind,
+         big_blind, iterations) = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a CFR checkpoint")
+        offset = _HEADER.size
+        bet_sizes = struct.unpack_from(f'<{nb_sizes}d', data, offset)
+        offset += 8 * nb_sizes
+        solver = cls(nb_players, stack, small_blind, big_blind, bet_sizes, max_raises, nb_buckets, seed)
+        keys = [int.from_bytes(data[start:start + key_bytes], 'little')
+                for start in range(offset, offset + nb_keys * key_bytes, key_bytes)]
+        offset += nb_keys * key_bytes
+        entries = array('Q')
+        entries.frombytes(data[offset:offset + 8 * nb_keys])
+        offset += 8 * nb_keys
+        solver.index = dict(zip(keys, entries))
+        solver.regrets.frombytes(data[offset:offset + 8 * nb_values])
+        offset += 8 * nb_values
+        solver.strategy_sums.frombytes(data[offset:offset + 8 * nb_values])
+        solver.iterations = iterations
+        return solver
+
+
+def _train_worker(task: tuple) -> tuple:
+    # Runs iterations from a copy of the tables, returns the rows it added and both tables
+    config, first_iteration, iterations, seed, index, regrets, strategy_sums = task
+    solver = CFRSolver(*config, seed=seed)
+    solver.index = dict(index)
+    solver.regrets = regrets
+    solver.strategy_sums = strategy_sums
+    solver.iterations = first_iteration
+    base_size = len(regrets)
+    solver.train(iterations)
+    mask = (1 << _SIZE_BITS) - 1
+    new_rows = [(key, entry >> _SIZE_BITS, entry & mask) for key, entry in solver.index.items()
+                if entry >> _SIZE_BITS >= base_size]
+    return new_rows, solver.regrets, solver.strategy_sums
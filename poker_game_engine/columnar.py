@@ -0,0 +1,218 @@
+import ast
+import os
+import sys
+import zipfile
+from array import array
+from poker_game_engine.constants import phase_index
+from poker_game_engine.game_engine import Game, Player
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, columns are read back as array.array
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Without pyarrow, chunks are written as .npz
+    pa = None
+
+# Columns as (name, array typecode). One action row per accepted decision (blinds are not decisions),
+# one hand row per player dealt in: chip results and showdown flags.
+ACTION_COLUMNS = (
+    ("hand_id", 'q'),
+    ("street", 'b'),  # Index in constants.game_phases
+    ("player_id", 'h'),
+    ("action", 'b'),  # Choice, see constants.actions_vals
+    ("amount", 'q'),  # Amount given with the decision (bets)
+    ("phase_bet", 'q'),  # Player's bet on the street after the action
+    ("pot", 'q'),  # Pot after the action
+    ("is_raise", 'b'),  # The action raised the highest bet
+)
+HAND_COLUMNS = (
+    ("hand_id", 'q'),
+    ("player_id", 'h'),
+    ("big_blind", 'q'),
+    ("net", 'q'),  # Bankroll change over the hand
+    ("showdown", 'b'),  # Still in the hand at showdown
+    ("won", 'b'),  # Won chips
+)
+FORMATS = ('npz', 'parquet')
+
+_NPY_TYPES = {'b': '|i1', 'h': '<i2', 'i': '<i4', 'q': '<i8', 'd': '<f8'}
+_ARRAY_TYPES = {descr: typecode for typecode, descr in _NPY_TYPES.items()}
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _write_npz(path: str, columns: dict) -> None:
+    # The .npz layout (a zip of .npy files) written from array.array columns, NumPy is not needed
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+        for name, column in columns.items():
+            header = f"{{'descr': '{_NPY_TYPES[column.typecode]}', 'fortran_order': False, 'shape': ({len(column)},), }}"
+            header = header.ljust(64 * -(-(len(header) + 11) // 64) - 11) + '\n'
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            archive.writestr(name + '.npy', _NPY_MAGIC + len(header).to_bytes(2, 'little') + header.encode('latin1')
+                             + column.tobytes())
+
+
+def _read_npz(path: str) -> dict:
+    columns = {}
+    with zipfile.ZipFile(path) as archive:
+        for entry in archive.namelist():
+            data = archive.read(entry)
+            header_size = int.from_bytes(data[8:10], 'little')
+            header = ast.literal_eval(data[10:10 + header_size].decode('latin1'))
+            column = array(_ARRAY_TYPES[header['descr']])
+            column.frombytes(data[10 + header_size:])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns[entry[:-4]] = column
+    return columns
+
+
+def _write_parquet(path: str, columns: dict) -> None:
+    types = {'b': pa.int8(), 'h': pa.int16(), 'i': pa.int32(), 'q': pa.int64(), 'd': pa.float64()}
+    arrays = [pa.Array.from_buffers(types[column.typecode], len(column), [None, pa.py_buffer(column)])
+              for column in columns.values()]
+    pq.write_table(pa.table(arrays, names=list(columns)), path)
+
+
+def read_columns(path: str) -> dict:
+    '''
+    Loads one chunk file: {column name: NumPy array}, or array.array when NumPy is not installed.
+    '''
+    if path.endswith('.parquet'):
+        if pa is None:
+            raise ImportError("Reading parquet chunks needs pyarrow")
+        table = pq.read_table(path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    if np is not None:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    return _read_npz(path)
+
+
+def iter_chunks(directory: str, prefix: str = 'hands'):
+    '''
+    Yields (actions, hands) column dicts, chunk by chunk in write order. A chunk always holds whole
+    hands, so the two tables of a chunk describe the same hands.
+    '''
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith(prefix + '-') and '.hands.' in name)
+    for name in names:
+        stem, extension = name.split('.hands.')
+        yield (read_columns(os.path.join(directory, f"{stem}.actions.{extension}")),
+               read_columns(os.path.join(directory, name)))
+
+
+def _resume_point(directory: str, prefix: str) -> tuple:
+    # (last hand id, next chunk index) of the chunks already exported to `directory` under `prefix`
+    last = None
+    for name in os.listdir(directory):
+        if not name.startswith(prefix + '-') or '.hands.' not in name:
+            continue
+        index = name[len(prefix) + 1:].split('.', 1)[0]
+        if index.isdigit() and (last is None or int(index) > last[0]):
+            last = (int(index), name)
+    if last is None:
+        return 0, 0
+    hand_ids = read_columns(os.path.join(directory, last[1]))["hand_id"]
+    return (int(max(hand_ids)) if len(hand_ids) else 0), last[0] + 1
+
+
+class ColumnarExporter:
+    '''
+    Streams simulated hands to chunked columnar files: an actions table (ACTION_COLUMNS) and a hands
+    table (HAND_COLUMNS), buffered in typed arrays and written once `chunk_rows` action rows are
+    pending, at the end of a hand, so memory stays bounded whatever the number of hands. Exporting to
+    a directory that already holds chunks of `prefix` adds new chunks after them, with hand ids following
+    theirs.
+    Chunks are Parquet files when pyarrow is installed, .npz otherwise (readable by numpy.load).
+
+    It has the recorder interface of HandHistoryWriter: pass it to HeadlessSimulator(history=...),
+    or set it as an ActionHandler's `recorder` and call start_hand/end_hand around each hand.
+    '''
+    def __init__(self, directory: str, prefix: str = 'hands', chunk_rows: int = 1 << 16, format: str = None):
+        if format is None:
+            format = 'parquet' if pa is not None else 'npz'
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+        if format == 'parquet' and pa is None:
+            raise ImportError("The parquet format needs pyarrow")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.chunk_rows = chunk_rows
+        self.format = format
+        self.hand_id, self.chunks = _resume_point(directory, prefix)
+        self.actions = {name: array(typecode) for name, typecode in ACTION_COLUMNS}
+        self.hands = {name: array(typecode) for name, typecode in HAND_COLUMNS}
+        self._game = None
+
+    def start_hand(self, game: Game, small_blind: int, big_blind: int) -> None:
+        '''
+        Call it after Game.start_new_round, before the blinds.
+        '''
+        self.hand_id += 1
+        self._game = game
+        self._big_blind = big_blind
+        self._bankrolls = [player.bankroll for player in game.players]
+        self._dealt = [player.active for player in game.players]
+
+    def record_action(self, player: Player, choice: str, amount: int = 0) -> None:
+        game = self._game
+        phase_bet = player.phase_bet
+        columns = self.actions
+        columns["hand_id"].append(self.hand_id)
+        columns["street"].append(phase_index[game.phase])
+        columns["player_id"].append(player.player_id)
+        columns["action"].append(int(choice))
+        columns["amount"].append(amount)
+        columns["phase_bet"].append(phase_bet)
+        columns["pot"].append(game.pot)
+        columns["is_raise"].append(choice in '25' and all(phase_bet > other.phase_bet
+                                                          for other in game.players if other is not player))
+
+    def end_hand(self, winners: list, pot: int) -> None:
+        players = self._game.players
+        showdown = sum(1 for player in players if player.active) > 1
+        winner_ids = {player.player_id for player in winners}
+        columns = self.hands
+        for player, before, dealt in zip(players, self._bankrolls, self._dealt):
+            if not dealt:
+                continue
+            columns["hand_id"].append(self.hand_id)
+            columns["player_id"].append(player.player_id)
+            columns["big_blind"].append(self._big_blind)
+            columns["net"].append(player.bankroll - before)
+            columns["showdown"].append(showdown and player.active)
+            columns["won"].append(player.player_id in winner_ids)
+        if len(self.actions["hand_id"]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        '''
+        Writes the pending rows as a new chunk. Call it between hands.
+        '''
+        if not self.hands["hand_id"]:
+            return
+        write = _write_parquet if self.format == 'parquet' else _write_npz
+        stem = os.path.join(self.directory, f"{self.prefix}-{self.chunks:06d}")
+        write(f"{stem}.actions.{self.format}", self.actions)
+        write(f"{stem}.hands.{self.format}", self.hands)
+        self.chunks += 1
+        for column in self.actions.values():
+            del column[:]
+        for column in self.hands.values():
+            del column[:]
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'ColumnarExporter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
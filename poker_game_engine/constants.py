@@ -1,7 +1,8 @@
 actions_vals={'1': 'Fold',
          '2': 'Bet',
          '3': 'Check',
-         '4': 'Call'}
+         '4': 'Call',
+         '5': 'All-in'}
 
 rank_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
 
@@ -19,4 +20,7 @@ hand_rankings = {
         }
 
 card_suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-card_values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
\ No newline at end of file
+card_values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+game_phases = ['Pre-flop', 'Flop', 'Turn', 'River']
+phase_index = {phase: index for index, phase in enumerate(game_phases)}
+street_cards = (3, 1, 1)  # Community cards dealt when entering Flop, Turn and River
@@ -0,0 +1,278 @@
+import multiprocessing
+import random
+from poker_game_engine.lookup_evaluator import get_tables
+from poker_game_engine.observation import ObservationEncoder, ACTION_CHOICES, action_mask
+from poker_game_engine.table import Table
+
+try:
+    import numpy as np
+    from multiprocessing import shared_memory
+except ImportError:  # NumPy is optional, buffers are plain lists and shared memory mode is unavailable
+    np = None
+
+MODES = ('sync', 'subprocess', 'shared_memory')
+
+
+def _zeros(shape: tuple, dtype: str):
+    if np is not None:
+        return np.zeros(shape, dtype=dtype)
+    value = False if dtype == 'bool' else 0
+    if len(shape) == 1:
+        return [value] * shape[0]
+    return [[value] * shape[1] for _ in range(shape[0])]
+
+
+class _Shard:
+    '''
+    A contiguous range of tables with their output buffers. Used in process, or inside a worker.
+    '''
+    def __init__(self, seeds: list, nb_players: int, small_blind: int, big_blind: int, starting_bankroll: int,
+                 buffers: dict = None):
+        self.tables = [Table(nb_players, seed, small_blind, big_blind, starting_bankroll) for seed in seeds]
+        self.encoder = ObservationEncoder(nb_players)
+        count = len(seeds)
+        if buffers is None:
+            buffers = {
+                "obs": _zeros((count, self.encoder.obs_dim), 'float32'),
+                "action_mask": _zeros((count, len(ACTION_CHOICES)), 'bool'),
+                "rewards": _zeros((count, nb_players), 'float32'),
+                "dones": _zeros((count,), 'bool'),
+                "current_player": _zeros((count,), 'int64'),
+            }
+        self.buffers = buffers
+
+    def _observe(self, row: int, table: Table) -> None:
+        buffers = self.buffers
+        game = table.game
+        player = table.betting.player
+        self.encoder.encode(game, player, buffers["obs"][row])
+        action_mask(game, player, table.betting.max_bet, buffers["action_mask"][row])
+        buffers["current_player"][row] = player.player_id
+
+    def reset(self) -> dict:
+        buffers = self.buffers
+        for row, table in enumerate(self.tables):
+            rewards = buffers["rewards"][row]
+            table.start(rewards)
+            for seat in range(len(rewards)):
+                rewards[seat] = 0
+            buffers["dones"][row] = False
+            self._observe(row, table)
+        return buffers
+
+    @staticmethod
+    def _step_table(table: Table, action: int, amount: int, rewards) -> bool:
+        # Illegal actions become a check, a call or a fold, bets without an amount the minimum raise,
+        # all-in when the bankroll is shorter, so that every bet allowed by action_mask goes through
+        choice = ACTION_CHOICES[action] if 0 <= action < len(ACTION_CHOICES) else None
+        if choice == '2' and amount <= 0:
+            betting = table.betting
+            amount = min(betting.to_call + max(table.game.last_bet, table.big_blind), betting.player.bankroll)
+        if choice is None or not table.act(choice, amount):
+            table.default_action()
+        return table.advance(rewards)
+
+    def step(self, actions, amounts) -> dict:
+        buffers = self.buffers
+        all_rewards = buffers["rewards"]
+        dones = buffers["dones"]
+        for row, table in enumerate(self.tables):
+            rewards = all_rewards[row]
+            for seat in range(len(rewards)):
+                rewards[seat] = 0
+            dones[row] = self._step_table(table, int(actions[row]), int(amounts[row]) if amounts is not None else 0,
+                                          rewards)
+            self._observe(row, table)
+        return buffers
+
+
+_SHARED_FIELDS = (("obs", 'float32'), ("action_mask", 'bool'), ("rewards", 'float32'), ("dones", 'bool'),
+                  ("current_player", 'int64'), ("actions", 'int64'), ("amounts", 'int64'))
+
+
+def _shared_layout(nb_tables: int, nb_players: int, obs_dim: int) -> tuple:
+    # Offsets of every array inside one shared memory block, 8-byte aligned
+    shapes = {"obs": (nb_tables, obs_dim), "action_mask": (nb_tables, len(ACTION_CHOICES)),
+              "rewards": (nb_tables, nb_players), "dones": (nb_tables,), "current_player": (nb_tables,),
+              "actions": (nb_tables,), "amounts": (nb_tables,)}
+    layout = []
+    offset = 0
+    for name, dtype in _SHARED_FIELDS:
+        shape = shapes[name]
+        layout.append((name, dtype, shape, offset))
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset += -(-size // 8) * 8
+    return layout, offset
+
+
+def _shared_views(buffer, layout: list) -> dict:
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in layout}
+
+
+def _worker(conn, seeds: list, shard_args: tuple, shared: tuple = None) -> None:
+    # Serves ('reset',), ('step', actions, amounts) and ('close',) for one shard of tables
+    block = None
+    buffers = None
+    if shared is not None:
+        name, layout, start, stop = shared
+        block = shared_memory.SharedMemory(name=name)
+        views = _shared_views(block.buf, layout)
+        buffers = {key: view[start:stop] for key, view in views.items()}
+    shard = _Shard(seeds, *shard_args, buffers=buffers)
+    try:
+        while True:
+            command = conn.recv()
+            if command[0] == 'reset':
+                result = shard.reset()
+            elif command[0] == 'step':
+                if shared is not None:
+                    result = shard.step(buffers["actions"], buffers["amounts"])
+                else:
+                    result = shard.step(command[1], command[2])
+            else:
+                break
+            conn.send(None if shared is not None else result)
+    finally:
+        if block is not None:
+            del buffers, views
+            shard.buffers = None
+            block.close()
+        conn.close()
+
+
+class VectorPokerEnv:
+    '''
+    Gym-style vector environment over `nb_tables` self-play tables. Each step takes one action per
+    table, for the player whose turn it is, and returns (obs, rewards, dones, infos):
+
+        obs      (nb_tables, obs_dim)     ObservationEncoder rows, seen from the next player to act
+        rewards  (nb_tables, nb_players)  chips won or lost by every seat in hands that ended this step
+        dones    (nb_tables,)             the hand ended; the table already dealt the next one
+        infos    {"action_mask": (nb_tables, len(ACTION_CHOICES)), "current_player": (nb_tables,)}
+
+    Actions index ACTION_CHOICES. Bets use `amounts` when given, the minimum raise otherwise, and
+    illegal actions are replaced by a check, a call or a fold. When fewer than two players have chips
+    left, every seat is given `starting_bankroll` again.
+
+    Modes:
+        'sync'           tables are stepped in this process
+        'subprocess'     tables are split across `workers` processes, results come back through pipes
+        'shared_memory'  same, but all arrays live in shared memory and only commands go through pipes
+                         (requires NumPy)
+
+    Table seeds are drawn from `seed` up front, so every mode produces the same trajectories.
+    The returned arrays are reused by the next step, copy them to keep them.
+    '''
+    def __init__(self, nb_tables: int, nb_players: int = 2, mode: str = 'sync', workers: int = None,
+                 seed: int = None, small_blind: int = 10, big_blind: int = 20, starting_bankroll: int = 1000):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        if mode == 'shared_memory' and np is None:
+            raise ImportError("NumPy is required for mode='shared_memory'")
+        self.nb_tables = nb_tables
+        self.nb_players = nb_players
+        self.mode = mode
+        self.obs_dim = ObservationEncoder(nb_players).obs_dim
+        rng = random.Random(seed)
+        seeds = [rng.getrandbits(64) for _ in range(nb_tables)]
+        shard_args = (nb_players, small_blind, big_blind, starting_bankroll)
+        self._block = None
+        self._workers = []
+
+        if mode == 'sync':
+            self._shard = _Shard(seeds, *shard_args)
+            self._buffers = self._shard.buffers
+            return
+
+        get_tables()  # Built once here, forked workers inherit the lookup tables
+        workers = min(workers or multiprocessing.cpu_count(), nb_tables)
+        bounds = [nb_tables * index // workers for index in range(workers + 1)]
+        if mode == 'shared_memory':
+            layout, size = _shared_layout(nb_tables, nb_players, self.obs_dim)
+            self._block = shared_memory.SharedMemory(create=True, size=size)
+            self._buffers = _shared_views(self._block.buf, layout)
+        else:
+            self._buffers = {key: _zeros(shape, dtype) for key, shape, dtype in (
+                ("obs", (nb_tables, self.obs_dim), 'float32'),
+                ("action_mask", (nb_tables, len(ACTION_CHOICES)), 'bool'),
+                ("rewards", (nb_tables, nb_players), 'float32'),
+                ("dones", (nb_tables,), 'bool'),
+                ("current_player", (nb_tables,), 'int64'))}
+        for start, stop in zip(bounds, bounds[1:]):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            shared = (self._block.name, layout, start, stop) if self._block is not None else None
+            process = multiprocessing.Process(target=_worker, args=(child_conn, seeds[start:stop], shard_args, shared),
+                                              daemon=True)
+            process.start()
+            child_conn.close()
+            self._workers.append((process, parent_conn, start, stop))
+
+    def _result(self) -> tuple:
+        buffers = self._buffers
+        infos = {"action_mask": buffers["action_mask"], "current_player": buffers["current_player"]}
+        return buffers["obs"], buffers["rewards"], buffers["dones"], infos
+
+    def _gather(self) -> None:
+        for _, conn, start, stop in self._workers:
+            result = conn.recv()
+            if result is not None:
+                for key, values in result.items():
+                    self._buffers[key][start:stop] = values
+
+    def reset(self) -> tuple:
+        '''
+        Deals a hand at every table and returns (obs, infos).
+        '''
+        if self.mode == 'sync':
+            self._shard.reset()
+        else:
+            for _, conn, _, _ in self._workers:
+                conn.send(('reset',))
+            self._gather()
+        obs, _, _, infos = self._result()
+        return obs, infos
+
+    def step(self, actions, amounts=None) -> tuple:
+        '''
+        Applies one action per table and returns (obs, rewards, dones, infos).
+        '''
+        if len(actions) != self.nb_tables:
+            raise ValueError(f"Expected {self.nb_tables} actions, got {len(actions)}")
+        if self.mode == 'sync':
+            self._shard.step(actions, amounts)
+        elif self.mode == 'shared_memory':
+            self._buffers["actions"][:] = actions
+            self._buffers["amounts"][:] = amounts if amounts is not None else 0
+            for _, conn, _, _ in self._workers:
+                conn.send(('step',))
+            self._gather()
+        else:
+            for _, conn, start, stop in self._workers:
+                conn.send(('step', actions[start:stop], amounts[start:stop] if amounts is not None else None))
+            self._gather()
+        return self._result()
+
+    def close(self) -> None:
+        for process, conn, _, _ in self._workers:
+            try:
+                conn.send(('close',))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+            process.join()
+        self._workers = []
+        if self._block is not None:
+            self._buffers = None
+            try:
+                self._block.close()
+            except BufferError:
+                pass  # Arrays returned by step() are still referenced, the mapping goes away with them
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> 'VectorPokerEnv':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
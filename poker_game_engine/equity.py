@@ -0,0 +1,185 @@
+import random
+from itertools import combinations
+from typing import NamedTuple
+from poker_game_engine.game_engine import Deck, Game, Player, cards_to_mask
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+
+# Samples drawn per Monte Carlo task, each task gets its own seed so results do not depend on the worker count
+BATCH_SIZE = 2000
+
+
+class EquityResult(NamedTuple):
+    equity: float  # Expected share of the pot, ties split it
+    win: float  # Probability of winning alone
+    tie: float  # Probability of splitting the pot
+    samples: int
+    std_error: float
+    ci_low: float
+    ci_high: float
+    exact: bool
+
+
+def _remaining_codes(hand: list, community_cards: list, dead_cards: list) -> list:
+    known = list(hand) + list(community_cards) + list(dead_cards)
+    if bin(cards_to_mask(known)).count('1') != len(known):
+        raise ValueError("The same card appears twice in the hand, board or dead cards")
+    deck = Deck()
+    deck.remove_cards(known)
+    return sorted(card.code for card in deck.cards)
+
+
+def _showdown_share(evaluator: LookupHandEvaluator, hero: list, board: list, opponent_cards: list) -> float:
+    # Pot share of the hero against opponents whose hole cards are consecutive pairs in opponent_cards
+    hero_strength = evaluator.evaluate_codes(hero + board)
+    tied = 1
+    for index in range(0, len(opponent_cards), 2):
+        strength = evaluator.evaluate_codes(opponent_cards[index:index + 2] + board)
+        if strength > hero_strength:
+            return 0.0
+        if strength == hero_strength:
+            tied += 1
+    return 1.0 / tied
+
+
+def _opponent_deals(remaining: list, opponents: int):
+    # Every ordered assignment of two hole cards to each opponent
+    if opponents == 0:
+        yield []
+        return
+    for first, second in combinations(remaining, 2):
+        rest = [code for code in remaining if code != first and code != second]
+        for others in _opponent_deals(rest, opponents - 1):
+            yield [first, second] + others
+
+
+def count_outcomes(remaining: int, board_missing: int, opponents: int) -> int:
+    '''
+    Number of (board, opponent hands) outcomes an exact enumeration has to visit.
+    '''
+    total = 1
+    for _ in range(board_missing):
+        total *= remaining
+        remaining -= 1
+    for step in range(board_missing):
+        total //= step + 1
+    for _ in range(opponents):
+        total *= remaining * (remaining - 1) // 2
+        remaining -= 2
+    return total
+
+
+def _enumerate(hero: list, board: list, opponents: int, remaining: list) -> tuple:
+    evaluator = LookupHandEvaluator()
+    count, total, wins, ties = 0, 0.0, 0, 0
+    for board_rest in combinations(remaining, 5 - len(board)):
+        full_board = board + list(board_rest)
+        left = [code for code in remaining if code not in board_rest]
+        for opponent_cards in _opponent_deals(left, opponents):
+            share = _showdown_share(evaluator, hero, full_board, opponent_cards)
+            count += 1
+            total += share
+            if share == 1.0:
+                wins += 1
+            elif share:
+                ties += 1
+    return count, total, wins, ties
+
+
+def _simulate(hero: list, board: list, opponents: int, remaining: list, samples: int, seed: int) -> tuple:
+    '''
+    Runs one Monte Carlo batch, returns (samples, sum of shares, sum of squared shares, wins, ties).
+    '''
+    evaluator = LookupHandEvaluator()
+    rng = random.Random(seed)
+    board_missing = 5 - len(board)
+    drawn = board_missing + 2 * opponents
+    total, total_squared, wins, ties = 0.0, 0.0, 0, 0
+    for _ in range(samples):
+        cards = rng.sample(remaining, drawn)
+        share = _showdown_share(evaluator, hero, board + cards[:board_missing], cards[board_missing:])
+        total += share
+        total_squared += share * share
+        if share == 1.0:
+            wins += 1
+        elif share:
+            ties += 1
+    return samples, total, total_squared, wins, ties
+
+
+def calculate_equity(hand: list, community_cards: list = (), opponents: int = 1, dead_cards: list = (),
+                     samples: int = 100000, tolerance: float = None, confidence: float = 0.95,
+                     seed: int = None, workers: int = 1, exact_limit: int = 200000) -> EquityResult:
+    '''
+    Computes the equity of a two-card hand against `opponents` random hands, given the known community
+    cards and any dead cards.
+    The outcomes are enumerated exactly when there are at most `exact_limit` of them, otherwise up to
+    `samples` seeded Monte Carlo deals are run, split across `workers` processes. With a `tolerance`,
+    sampling stops as soon as the confidence interval half-width falls below it.
+    '''
+    hand, community_cards = list(hand), list(community_cards)
+    if len(hand) != 2:
+        raise ValueError("Equity needs exactly two hole cards")
+    if len(community_cards) > 5:
+        raise ValueError("There are at most five community cards")
+    if opponents < 1:
+        raise ValueError("Equity needs at least one opponent")
+
+    remaining = _remaining_codes(hand, community_cards, dead_cards)
+    board_missing = 5 - len(community_cards)
+    if board_missing + 2 * opponents > len(remaining):
+        raise ValueError("Not enough cards left in the deck for this many opponents")
+
+    hero = [card.code for card in hand]
+    board = [card.code for card in community_cards]
+
+    if count_outcomes(len(remaining), board_missing, opponents) <= exact_limit:
+        count, total, wins, ties = _enumerate(hero, board, opponents, remaining)
+        equity = total / count
+        return EquityResult(equity, wins / count, ties / count, count, 0.0, equity, equity, True)
+
+    from statistics import NormalDist  # Slow to import, only needed for sampled equities
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    seeds = random.Random(seed)
+    batches = -(-samples // BATCH_SIZE)
+    count, total, total_squared, wins, ties = 0, 0.0, 0.0, 0, 0
+    executor = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while batches > 0:
+            round_size = min(batches, workers)
+            batches -= round_size
+            tasks = [(hero, board, opponents, remaining,
+                      min(BATCH_SIZE, samples - count - i * BATCH_SIZE), seeds.getrandbits(64))
+                     for i in range(round_size)]
+            if executor is None:
+                results = [_simulate(*task) for task in tasks]
+            else:
+                results = list(executor.map(_simulate, *zip(*tasks)))
+            for batch in results:
+                count += batch[0]
+                total += batch[1]
+                total_squared += batch[2]
+                wins += batch[3]
+                ties += batch[4]
+            variance = max(total_squared / count - (total / count) ** 2, 0.0)
+            std_error = (variance / count) ** 0.5
+            if tolerance is not None and z * std_error <= tolerance:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    equity = total / count
+    half_width = z * std_error
+    return EquityResult(equity, wins / count, ties / count, count, std_error,
+                        max(equity - half_width, 0.0), min(equity + half_width, 1.0), False)
+
+
+def player_equity(game: Game, player: Player, **kwargs) -> EquityResult:
+    '''
+    Equity of a player's hand against the other active players of the game, on the current board.
+    '''
+    opponents = sum(1 for p in game.players if p.active and p is not player)
+    return calculate_equity(player.hand, game.community_cards, opponents=opponents, **kwargs)
@@ -0,0 +1,259 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import combinations
+from poker_game_engine.constants import card_values
+from poker_game_engine.game_engine import CARDS
+
+# Equity table file, read through mmap:
+#   header: magic, max opponents of the preflop table, opponents per flop entry, flop entries
+#   float32 preflop equities, [opponents - 1][preflop class]
+#   uint32 flop keys (canonical_key of hand + flop), sorted
+#   float32 flop equities, [entry][opponents - 1]
+_MAGIC = b'PEQ1'
+_HEADER = struct.Struct('<4sHHI')
+
+NB_PREFLOP_CLASSES = 169
+_RANK_NAMES = [value if value != '10' else 'T' for value in card_values]
+
+
+def preflop_class(hand: tuple) -> int:
+    '''
+    Index (0..168) of the starting-hand class of two card codes, on the usual 13x13 grid:
+    pairs on the diagonal, suited hands above it (row = high rank), offsuit hands below.
+    '''
+    first, second = hand
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def preflop_class_name(index: int) -> str:
+    row, column = divmod(index, 13)
+    if row == column:
+        return _RANK_NAMES[row] * 2
+    if row > column:
+        return f"{_RANK_NAMES[row]}{_RANK_NAMES[column]}s"
+    return f"{_RANK_NAMES[column]}{_RANK_NAMES[row]}o"
+
+
+def preflop_class_hand(index: int) -> tuple:
+    # A representative pair of card codes of the class
+    row, column = divmod(index, 13)
+    if row == column:
+        return (row * 4, row * 4 + 1)
+    if row > column:
+        return (row * 4, column * 4)
+    return (column * 4, row * 4 + 1)
+
+
+def canonical_cards(hand: tuple, board: tuple = ()) -> tuple:
+    '''
+    Suit-normalized (hand, board) card codes: suits are relabelled by the ranks they hold in the hand,
+    then on the board, so that hands equal up to a permutation of suits get the same cards.
+    Suits holding the same ranks are interchangeable, so any order among them gives the same result.
+    '''
+    hole_masks = [0, 0, 0, 0]
+    board_masks = [0, 0, 0, 0]
+    for code in hand:
+        hole_masks[code & 3] |= 1 << (code >> 2)
+    for code in board:
+        board_masks[code & 3] |= 1 << (code >> 2)
+    order = sorted(range(4), key=lambda suit: (hole_masks[suit], board_masks[suit]), reverse=True)
+    relabel = [0, 0, 0, 0]
+    for new_suit, suit in enumerate(order):
+        relabel[suit] = new_suit
+    return (tuple(sorted(((code & ~3) | relabel[code & 3] for code in hand), reverse=True)),
+            tuple(sorted(((code & ~3) | relabel[code & 3] for code in board), reverse=True)))
+
+
+def canonical_key(hand: tuple, board: tuple = ()) -> int:
+    '''
+    canonical_cards packed into one integer, 6 bits per card (hand first). Fits 32 bits up to the flop.
+    '''
+    hand, board = canonical_cards(hand, board)
+    key = 0
+    for code in hand + board:
+        key = (key << 6) | code
+    return key
+
+
+def canonical_flops(classes: list) -> list:
+    '''
+    One representative (hand, flop) per canonical flop of each preflop class, sorted by canonical key.
+    '''
+    found = {}
+    for index in classes:
+        hand = preflop_class_hand(index)
+        remaining = [code for code in range(52) if code not in hand]
+        for flop in combinations(remaining, 3):
+            key = canonical_key(hand, flop)
+            if key not in found:
+                found[key] = canonical_cards(hand, flop)
+    return [found[key] for key in sorted(found)]
+
+
+def _equity(hand: tuple, board: tuple, opponents: int, samples: int, seed: int, workers: int = 1) -> float:
+    from poker_game_engine.equity import calculate_equity  # Only needed when entries are computed
+    return calculate_equity([CARDS[code] for code in hand], [CARDS[code] for code in board], opponents=opponents,
+                            samples=samples, seed=seed, workers=workers).equity
+
+
+def precompute(path: str, max_opponents: int = 8, preflop_samples: int = 20000, flop_classes: list = (),
+               flops: list = (), flop_opponents: int = 1, flop_samples: int = 2000, seed: int = 0,
+               workers: int = 1) -> int:
+    '''
+    Writes an equity table file: preflop equities of the 169 classes against 1..max_opponents
+    opponents (2-9 players by default), plus flop equities against 1..flop_opponents opponents for every
+    canonical flop of `flop_classes` and for the (hand, flop) pairs in `flops`.
+    Equities come from calculate_equity, with the same seed for every entry. Returns the flop entries.
+    '''
+    preflop = []
+    for opponents in range(1, max_opponents + 1):
+        for index in range(NB_PREFLOP_CLASSES):
+            preflop.append(_equity(preflop_class_hand(index), (), opponents, preflop_samples, seed, workers))
+
+    entries = {canonical_key(hand, board): canonical_cards(hand, board) for hand, board in canonical_flops(flop_classes)}
+    for hand, board in flops:
+        entries[canonical_key(hand, board)] = canonical_cards(hand, board)
+    keys = sorted(entries)
+    flop_equities = []
+    for key in keys:
+        hand, board = entries[key]
+        for opponents in range(1, flop_opponents + 1):
+            flop_equities.append(_equity(hand, board, opponents, flop_samples, seed, workers))
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(_HEADER.pack(_MAGIC, max_opponents, flop_opponents, len(keys)))
+        handle.write(struct.pack(f'<{len(preflop)}f', *preflop))
+        handle.write(struct.pack(f'<{len(keys)}I', *keys))
+        handle.write(struct.pack(f'<{len(flop_equities)}f', *flop_equities))
+    os.replace(temporary, path)  # Readers never see a partial file
+    return len(keys)
+
+
+class EquityCache:
+    '''
+    Runtime equity lookups. Preflop and flop queries are answered from a precomputed table file
+    (see precompute), memory-mapped on first use; anything else (turn, river, or missing entries)
+    is computed with calculate_equity. Results are kept in an LRU cache of `cache_size` entries keyed
+    on the suit-normalized cards (canonical_cards), so queries equal up to a permutation of suits skip
+    all of the above. lookup() is that cache, it expects normalized card codes. In front of it, a second
+    LRU keyed on the query as given answers repeated identical queries without normalizing them.
+    '''
+    def __init__(self, path: str = None, cache_size: int = 1 << 16, samples: int = 20000, seed: int = 0):
+        self.path = path
+        self.samples = samples
+        self.seed = seed
+        self._loaded = False
+        self._file = None
+        self._map = None
+        self._preflop = None
+        self._flop_keys = None
+        self._flop_equities = None
+        self.lookup = lru_cache(maxsize=cache_size)(self._compute)
+        self._queries = lru_cache(maxsize=cache_size)(self._normalized)
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.path is None or not os.path.exists(self.path):
+            return
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, max_opponents, flop_opponents, nb_flops = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not an equity table file")
+        view = memoryview(self._map)
+        offset = _HEADER.size
+        size = max_opponents * NB_PREFLOP_CLASSES * 4
+        self._max_opponents = max_opponents
+        self._preflop = view[offset:offset + size].cast('f')
+        offset += size
+        self._flop_keys = view[offset:offset + nb_flops * 4].cast('I')
+        offset += nb_flops * 4
+        self._flop_opponents = flop_opponents
+        self._flop_equities = view[offset:offset + nb_flops * flop_opponents * 4].cast('f')
+
+    def close(self) -> None:
+        self._queries.cache_clear()
+        self.lookup.cache_clear()
+        for name in ('_preflop', '_flop_keys', '_flop_equities'):
+            view = getattr(self, name)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+        self._loaded = False
+
+    def __enter__(self) -> 'EquityCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def equity(self, hand: list, board: list = (), opponents: int = 1) -> float:
+        '''
+        Equity of two hole cards (Card objects or codes) against `opponents` random hands.
+        '''
+        return self._queries(tuple(hand), tuple(board), opponents)
+
+    def _normalized(self, hand: tuple, board: tuple, opponents: int) -> float:
+        hand, board = canonical_cards(tuple(card if isinstance(card, int) else card.code for card in hand),
+                                      tuple(card if isinstance(card, int) else card.code for card in board))
+        return self.lookup(hand, board, opponents)
+
+    def _table_equity(self, hand: tuple, board: tuple, opponents: int) -> float:
+        if not self._loaded:
+            self._load()
+        if not board:
+            if self._preflop is not None and opponents <= self._max_opponents:
+                return self._preflop[(opponents - 1) * NB_PREFLOP_CLASSES + preflop_class(hand)]
+        elif len(board) == 3 and self._flop_keys is not None and opponents <= self._flop_opponents:
+            key = canonical_key(hand, board)
+            keys = self._flop_keys
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                return self._flop_equities[index * self._flop_opponents + opponents - 1]
+        return None
+
+    def _compute(self, hand: tuple, board: tuple, opponents: int) -> float:
+        equity = self._table_equity(hand, board, opponents)
+        if equity is None:
+            equity = _equity(hand, board, opponents, self.samples, self.seed)
+        return equity
+
+
+def main(argv: list = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Precompute preflop and flop equity tables.")
+    parser.add_argument('path', help="Output file")
+    parser.add_argument('--max-opponents', type=int, default=8)
+    parser.add_argument('--preflop-samples', type=int, default=20000)
+    parser.add_argument('--flop-classes', default='', help="Comma separated classes, e.g. AA,AKs,72o, or 'all'")
+    parser.add_argument('--flop-opponents', type=int, default=1)
+    parser.add_argument('--flop-samples', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    names = {preflop_class_name(index): index for index in range(NB_PREFLOP_CLASSES)}
+    if args.flop_classes == 'all':
+        classes = list(range(NB_PREFLOP_CLASSES))
+    else:
+        classes = [names[name] for name in args.flop_classes.split(',') if name]
+    entries = precompute(args.path, max_opponents=args.max_opponents, preflop_samples=args.preflop_samples,
+                         flop_classes=classes, flop_opponents=args.flop_opponents, flop_samples=args.flop_samples,
+                         seed=args.seed, workers=args.workers)
+    print(f"Wrote {args.path}: {NB_PREFLOP_CLASSES} preflop classes x {args.max_opponents} opponents, "
+          f"{entries} flops")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,106 @@
-from random import shuffle
+import random
 from itertools import combinations
 from collections import Counter
 from poker_game_engine.constants import rank_values, hand_rankings, card_suits, card_values
+from poker_game_engine.lookup_evaluator import pack_strength, strength_category, strength_rank
+
+_CARD_CODES = {(suit, value): rank_index * 4 + suit_index
+               for rank_index, value in enumerate(card_values) for suit_index, suit in enumerate(card_suits)}
 
 class Card:
     '''
     Represents a single playing card, identified by suit and value.
+    Cards are interned: the 52 instances are built once and shared, each one carrying its integer
+    code (rank_index * 4 + suit_index, 0..51), its rank (2..14) and its bits for bitmask hands.
     '''
-    def __init__(self, suit: str, value: str):
-        self.suit = suit
-        self.value = value
+    __slots__ = ('code', 'suit', 'value', 'rank', 'suit_index', 'rank_bit', 'mask', 'name')
+
+    def __new__(cls, suit: str, value: str):
+        try:
+            return CARDS[_CARD_CODES[(suit, value)]]
+        except KeyError:
+            raise ValueError(f"Unknown card: {value} of {suit}") from None
+
+    @classmethod
+    def _create(cls, code: int) -> 'Card':
+        card = object.__new__(cls)
+        card.code = code
+        card.suit_index = code & 3
+        card.suit = card_suits[card.suit_index]
+        card.value = card_values[code >> 2]
+        card.rank = rank_values[card.value]
+        card.rank_bit = 1 << (code >> 2)
+        card.mask = 1 << code
+        card.name = f"{card.value} of {card.suit}"
+        return card
+
+    @staticmethod
+    def from_code(code: int) -> 'Card':
+        return CARDS[code]
+
+    def __reduce__(self):
+        # Unpickling and deep copies resolve to the shared instance
+        return (Card.from_code, (self.code,))
 
     def __repr__(self) -> str:
-        return f"{self.value} of {self.suit}"
+        return self.name
+
+CARDS = tuple(Card._create(code) for code in range(52))
+
+def cards_to_mask(cards: list) -> int:
+    '''
+    Returns the 52-bit mask of a list of cards, one bit per card code.
+    '''
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
 
 class Deck:
     '''
     Represents a deck of playing cards. Provides methods to create a deck and deal cards.
+    Each deck shuffles with its own random.Random (given, or created from `seed`) and reuses a single
+    card list across resets, so seeded games replay bit for bit.
     '''
     suits = card_suits
     values = card_values
 
-    def __init__(self):
-        self.cards = [Card(suit, value) for suit in Deck.suits for value in Deck.values]
-        shuffle(self.cards)
+    def __init__(self, rng: random.Random = None, seed: int = None, order: list = None):
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.cards = list(CARDS)
+        self.reset(order)
+
+    def reset(self, order: list = None) -> None:
+        '''
+        Puts the 52 cards back and shuffles them in place (Fisher-Yates).
+        With `order`, those cards (Card or card codes) are dealt first and in that order, for replays.
+        '''
+        cards = self.cards
+        if order and len(order) == 52:
+            # Full replay order: no shuffle needed
+            cards[:] = reversed(order) if isinstance(order[0], Card) else map(CARDS.__getitem__, reversed(order))
+            return
+        cards[:] = CARDS
+        self.rng.shuffle(cards)
+        if order:
+            order = [card if isinstance(card, Card) else CARDS[card] for card in order]
+            fixed = cards_to_mask(order)
+            # deal() pops from the end, the fixed order goes last in reverse
+            cards[:] = [card for card in cards if not card.mask & fixed]
+            cards.extend(reversed(order))
+
+    def deal_order(self) -> list:
+        '''
+        Returns the cards left in the deck, in the order they will be dealt.
+        '''
+        return self.cards[::-1]
+
+    def remove_cards(self, cards: list) -> None:
+        '''
+        Removes known cards (hole cards, board, burnt cards) from the deck so they cannot be dealt.
+        '''
+        dead = cards_to_mask(cards)
+        self.cards[:] = [card for card in self.cards if not card.mask & dead]
 
     def deal(self) -> Card:
         if self.cards:
@@ -35,6 +112,8 @@ class Player:
     '''
     Represents a player in the game, managing their cards, bankroll, and game actions like betting and folding.
     '''
+    __slots__ = ('player_id', 'bankroll', 'hand', 'active', 'phase_bet', 'total_game_bet', 'best_hand', 'ai_flag')
+
     def __init__(self, player_id: int, bankroll: int):
         self.player_id = player_id
         self.bankroll = bankroll
@@ -59,19 +138,42 @@ class Player:
             return True 
         return False
 
+    @property
+    def is_all_in(self) -> bool:
+        # Still in the hand but without chips left to act with
+        return self.active and self.bankroll == 0
+
     def reset_round_bet(self):
         self.phase_bet=0
 
+    def copy(self) -> 'Player':
+        # Cards are shared, they are immutable
+        player = Player.__new__(Player)
+        player.player_id = self.player_id
+        player.bankroll = self.bankroll
+        player.hand = self.hand[:]
+        player.active = self.active
+        player.phase_bet = self.phase_bet
+        player.total_game_bet = self.total_game_bet
+        player.best_hand = self.best_hand
+        player.ai_flag = self.ai_flag
+        return player
+
     def add_card(self, card: Card) -> None:
         self.hand.append(card)
 
+    @property
+    def hand_mask(self) -> int:
+        return cards_to_mask(self.hand)
+
 class Game:
     '''
     Manages the entire game environment, including deck, players, and community cards.
     Orchestrates the flow of the game through different stages.
     '''
-    def __init__(self, players: int):
-        self.deck = Deck()
+    def __init__(self, players: int, evaluator=None, rng: random.Random = None, seed: int = None):
+        self.rng = rng if rng is not None else random.Random(seed)  # Shuffles every deck of this game
+        self.deck = Deck(self.rng)
         self.players = [Player(pid, 1000) for pid in range(players)]
         self.dealer_index= 0
         self.community_cards = []
@@ -79,15 +181,144 @@ class Game:
         self.current_player_id = 0  # Track whose turn it is
         self.phase = "Pre-flop"
         self.last_bet = 0
-        self.evaluator = HandEvaluator()
+        # Any evaluator exposing best_hand() and hand_key(), e.g. HandEvaluator or LookupHandEvaluator
+        self.evaluator = evaluator if evaluator is not None else HandEvaluator()
+        self.action_stack = []  # Undo records of apply_action and deal_street, see undo_action
+
+    def clone(self, rng: random.Random = None) -> 'Game':
+        '''
+        Copy for lookahead: players, bets, board and deck order are copied, while cards and the evaluator
+        (and its tables) are shared. The clone shuffles with `rng`, or with a copy of this game's RNG,
+        and starts with an empty action stack.
+        '''
+        game = Game.__new__(Game)
+        if rng is None:
+            # setstate() sets the whole state, skip the urandom seeding of __init__
+            rng = random.Random.__new__(type(self.rng))
+            rng.setstate(self.rng.getstate())
+        game.rng = rng
+        deck = game.deck = Deck.__new__(Deck)
+        deck.rng = rng
+        deck.cards = self.deck.cards[:]
+        game.players = [player.copy() for player in self.players]
+        game.dealer_index = self.dealer_index
+        game.community_cards = self.community_cards[:]
+        game.pot = self.pot
+        game.current_player_id = self.current_player_id
+        game.phase = self.phase
+        game.last_bet = self.last_bet
+        game.evaluator = self.evaluator
+        game.action_stack = []
+        return game
+
+    @property
+    def community_mask(self) -> int:
+        return cards_to_mask(self.community_cards)
 
     def get_max_phase_bet(self) -> int:
-        phase_bets = [p.phase_bet for p in self.players]
-        return max(phase_bets)
+        return max(p.phase_bet for p in self.players)
     
     def next_turn(self) -> None:
         self.current_player_id = (self.current_player_id + 1) % len(self.players)
 
+    def fold(self, player: Player) -> bool:
+        player.fold()
+        self.next_turn()
+        return True
+
+    def check(self, player: Player, max_bet: int = None) -> bool:
+        # Only when no bet above the player's own is pending
+        if max_bet is None:
+            max_bet = self.get_max_phase_bet()
+        if player.phase_bet < max_bet:
+            return False
+        self.next_turn()
+        return True
+
+    def bet(self, player: Player, amount: int) -> bool:
+        # A bet puts in at least the last bet, and no more than the bankroll
+        if amount >= self.last_bet and player.bet(amount):
+            self.pot += amount
+            self.last_bet = amount
+            self.next_turn()
+            return True
+        return False
+
+    def call(self, player: Player, max_bet: int = None) -> bool:
+        # Matches the highest phase bet, all-in for the whole bankroll when it is short
+        if max_bet is None:
+            max_bet = self.get_max_phase_bet()
+        call_amount = min(max(max_bet - player.phase_bet, 0), player.bankroll)
+        if player.bet(call_amount):
+            self.pot += call_amount
+            self.next_turn()
+            return True
+        return False
+
+    def all_in(self, player: Player) -> bool:
+        # Counts as a raise when it exceeds the last bet
+        amount = player.bankroll
+        if amount == 0:
+            return False
+        player.bet(amount)
+        self.pot += amount
+        if amount > self.last_bet:
+            self.last_bet = amount
+        self.next_turn()
+        return True
+
+    def apply_action(self, choice: str, amount: int = 0, player: Player = None, max_bet: int = None) -> bool:
+        '''
+        Plays a decision (see constants.actions_vals) of `player`, the current player by default, with
+        the same rules as ActionHandler but without logging, and pushes an undo record.
+        Returns False, changing nothing, when the action is not possible.
+        '''
+        if player is None:
+            player = self.players[self.current_player_id]
+        record = (((player, player.bankroll, player.phase_bet, player.total_game_bet, player.active),),
+                  self.pot, self.last_bet, self.current_player_id, self.phase, len(self.community_cards))
+        if choice == '1':
+            done = self.fold(player)
+        elif choice == '2':
+            done = self.bet(player, amount)
+        elif choice == '3':
+            done = self.check(player, max_bet)
+        elif choice == '4':
+            done = self.call(player, max_bet)
+        elif choice == '5':
+            done = self.all_in(player)
+        else:
+            done = False
+        if done:
+            self.action_stack.append(record)
+        return done
+
+    def deal_street(self, nb_cards: int) -> None:
+        '''
+        Moves to the next street: phase bets are reset and `nb_cards` community cards dealt, undoably.
+        '''
+        record = (tuple((p, p.bankroll, p.phase_bet, p.total_game_bet, p.active) for p in self.players),
+                  self.pot, self.last_bet, self.current_player_id, self.phase, len(self.community_cards))
+        self.reset_players_phase_bets()
+        for _ in range(nb_cards):
+            self.deal_community_card()
+        self.action_stack.append(record)
+
+    def undo_action(self) -> None:
+        '''
+        Reverts the last apply_action or deal_street. Dealt cards go back on top of the deck.
+        '''
+        players, self.pot, self.last_bet, self.current_player_id, self.phase, nb_community = self.action_stack.pop()
+        for player, bankroll, phase_bet, total_game_bet, active in players:
+            player.bankroll = bankroll
+            player.phase_bet = phase_bet
+            player.total_game_bet = total_game_bet
+            player.active = active
+        community = self.community_cards
+        cards = self.deck.cards
+        while len(community) > nb_community:
+            cards.append(community.pop())
+
     def deal_community_card(self) -> None:
         card = self.deck.deal()
         if card:
@@ -103,30 +334,40 @@ class Game:
         # Move the dealer button to the next active player
         self.dealer_index = (self.dealer_index + 1) % len(self.players)
 
-    def start_new_round(self) -> None:
-        self.deck = Deck()  # Reset deck
+    def start_new_round(self, deck_order: list = None) -> None:
+        self.deck.reset(deck_order)  # Reshuffle in place, or deal deck_order first for replays
         self.community_cards = []
         for player in self.players:
             player.hand = []
             player.active = True if player.bankroll > 0 else False
+            player.phase_bet = 0
+            player.total_game_bet = 0
+        self.pot = 0
+        self.last_bet = 0
         self.phase = "Pre-flop"
+        self.action_stack = []
     
     def reset_players_phase_bets(self) -> None:
+        # Folded players are reset too, their bets must not count towards the next phase
         for p in self.players:
-            if p.active:
-                p.reset_round_bet()
+            p.reset_round_bet()
+        self.last_bet = 0
+
+    def award_pot(self, player: Player) -> None:
+        player.bankroll += self.pot
+        self.pot = 0
 
     def get_game_state(self) -> dict:
         players_info = [{
             "player_id": player.player_id,
             "bankroll": player.bankroll,
-            "hand": [str(card) for card in player.hand],
+            "hand": [card.name for card in player.hand],
             "active": player.active,
             "round_bet": player.phase_bet,
             "ai_flag": player.ai_flag,
         } for player in self.players]
 
-        community_cards = [str(card) for card in self.community_cards]
+        community_cards = [card.name for card in self.community_cards]
 
         game_state = {
             "players": players_info,
@@ -157,10 +398,12 @@ class Game:
             if card:
                 player.add_card(card)
     
-    def determine_winner(self) -> Player:
+    def determine_winner(self) -> dict:
+        # {player: best hand} of every active player holding the best hand, several on a split pot
         best_hands = {player: self.evaluator.best_hand(player.hand + self.community_cards) for player in self.players if player.active}
-        winning_player = max(best_hands.items(), key=lambda x: (x[1][0], x[1][1]))[0]
-        return {winning_player: best_hands[winning_player]}
+        hand_key = self.evaluator.hand_key
+        best = max(hand_key(hand) for hand in best_hands.values())
+        return {player: hand for player, hand in best_hands.items() if hand_key(hand) == best}
 
 class HandEvaluator:
     def __init__(self):
@@ -168,40 +411,56 @@ class HandEvaluator:
         self.rank_values = rank_values
         self.hand_rankings = hand_rankings
 
-    def evaluate_hand(self, cards: list) -> tuple:
-        values = sorted(self.rank_values[card.value] for card in cards)
-        suits = [card.suit for card in cards]
-        value_counts = Counter(values)
-        is_flush = len(set(suits)) == 1
-        is_straight = len(set(values)) == 5 and (values[-1] - values[0] == 4)
-        high_card = values[-1]
-
-        if is_flush and is_straight:
-            if high_card == 14 and min(values) == 10:  # Check for Royal Flush (A-K-Q-J-10)
-                return (9, high_card, "Royal Flush")
-            return (8, high_card, "Straight Flush")
-        rank, most_common = value_counts.most_common(1)[0]
+    def hand_strength(self, cards: list) -> int:
+        '''
+        Packed strength of five cards (see lookup_evaluator.pack_strength): the category, then every
+        tiebreak rank (pairs before kickers, trips before the pair of a full house), so that comparing
+        two hands is a single int comparison.
+        '''
+        ranks = sorted([card.rank for card in cards], reverse=True)
+        counts = Counter(ranks)
+        if len(counts) == 5:
+            first_suit = cards[0].suit_index
+            is_flush = all(card.suit_index == first_suit for card in cards)
+            high_card = ranks[0]
+            is_straight = high_card - ranks[4] == 4
+            if ranks == [14, 5, 4, 3, 2]:  # Ace-low straight (wheel), the 5 is the high card
+                is_straight = True
+                high_card = 5
+            if is_straight:
+                if is_flush:
+                    return pack_strength(9 if high_card == 14 else 8, [high_card])
+                return pack_strength(4, [high_card])
+            return pack_strength(5 if is_flush else 0, ranks)
+
+        # Paired hands cannot be flushes or straights. Ranks ordered by count, then by rank
+        groups = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+        most_common = groups[0][1]
+        second = groups[1][1]
         if most_common == 4:
-            return (7, rank, "Four of a Kind")
+            category = 7
         elif most_common == 3:
-            if 2 in value_counts.values():
-                return (6, rank, "Full House")
-            else:
-                return (3, rank, "Three of a Kind")
-        elif most_common == 2:
-            pairs = [rank for rank, count in value_counts.items() if count == 2]
-            if len(pairs) > 1:
-                return (2, max(pairs), "Two Pair")
-            else:
-                return (1, pairs[0], "One Pair")
-        elif is_flush:
-            return (5, high_card, "Flush")
-        elif is_straight:
-            return (4, high_card, "Straight")
+            category = 6 if second == 2 else 3
         else:
-            return (0, high_card, "High Card")
+            category = 2 if second == 2 else 1
+        return pack_strength(category, [rank for rank, _ in groups])
+
+    def describe(self, strength: int) -> tuple:
+        '''
+        Converts a strength to (category, primary rank, name).
+        '''
+        category = strength_category(strength)
+        return (category, strength_rank(strength), self.hand_rankings[category])
+
+    def evaluate_hand(self, cards: list) -> tuple:
+        return self.describe(self.hand_strength(cards))
 
+    def best_hand(self, cards: list) -> int:
+        # Scans all 5-card combinations of the cards and returns the best packed strength
+        hand_strength = self.hand_strength
+        return max(hand_strength(comb) for comb in combinations(cards, 5))
 
-    def best_hand(self, cards: list) -> tuple:
-        # Generates all 5-card combinations from 7 cards and returns the best ranked hand
-        return max((self.evaluate_hand(comb) for comb in combinations(cards, 5)), key=lambda x: (x[0], x[1]))
\ No newline at end of file
+    @staticmethod
+    def hand_key(hand: int) -> int:
+        # Comparison key of a hand returned by best_hand, strengths compare directly
+        return hand
\ No newline at end of file
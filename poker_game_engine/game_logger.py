@@ -1,64 +1,219 @@
 import logging
-from poker_game_engine.game_engine import Game
+from poker_game_engine.game_engine import Game, Player
+from poker_game_engine.metrics import Metrics, current_metrics
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Structured fields attached to every record, e.g. for JsonFormatter or filters
+RECORD_FIELDS = ("table_id", "hand_id", "player_id", "action", "amount")
+
+
+class JsonFormatter(logging.Formatter):
+    '''
+    Formats records as one JSON object per line, with the structured per-action fields.
+    '''
+    def format(self, record: logging.LogRecord) -> str:
+        import json
+        entry = {"time": record.created, "level": record.levelname, "message": record.getMessage()}
+        for field in RECORD_FIELDS:
+            entry[field] = getattr(record, field, None)
+        return json.dumps(entry)
+
+
+def _deferred_queue_handler(queue) -> logging.Handler:
+    # The stock QueueHandler formats the message in the calling thread. Records are handed over as is,
+    # so formatting happens in the listener thread (arguments must not be mutated afterwards).
+    # logging.handlers pulls in socket, pickle and more: it is only imported by asynchronous loggers.
+    from logging.handlers import QueueHandler
+    handler = QueueHandler(queue)
+    handler.prepare = lambda record: record
+    return handler
+
 
 class GameLogger:
     '''
     Provides functionality to log important game events and performance metrics.
     This includes player actions, game state changes, and statistical data relevant to evaluating strategies and outcomes.
+
+    Each GameLogger owns a standalone logger, so creating one never configures the root logger.
+    With `asynchronous=True`, records go through a queue to a listener thread that writes them in
+    batches of `batch_size`, and the game loop never waits on disk. Messages are formatted lazily,
+    and nothing at all is computed when no handler is enabled. `enabled` covers the INFO messages of
+    the hot path, `warnings_enabled` the warnings, so a logger at level WARNING still reports them.
     '''
-    def __init__(self, game: Game, log_to_console: bool = False, log_to_file: bool = True):
+    def __init__(self, game: Game, log_to_console: bool = False, log_to_file: bool = True,
+                 asynchronous: bool = False, table_id: int = None, log_file: str = 'game_logs.log',
+                 batch_size: int = 64, json_records: bool = False, level: int = logging.INFO):
         self.game = game
+        self.table_id = table_id
+        self.hand_id = 0
+        self.listener = None
+        self.logger = logging.Logger(f"poker_game_engine.table.{table_id}", level)
 
         # Configure logging handlers based on the specified arguments
+        formatter = JsonFormatter() if json_records else logging.Formatter(LOG_FORMAT)
         handlers = []
         if log_to_console:
             console_handler = logging.StreamHandler()
-            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            console_handler.setFormatter(formatter)
             handlers.append(console_handler)
-        
+
         if log_to_file:
-            file_handler = logging.FileHandler('game_logs.log')
-            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(formatter)
             handlers.append(file_handler)
-        
-        # Setting up the root logger with the handlers
-        logging.basicConfig(level=logging.INFO, handlers=handlers)
-
-    @staticmethod
-    def log_event(message: str) -> None:
-        logging.info(message+"\n")
-
-    @staticmethod
-    def log_info(message: str) -> None:
-        logging.info(message)
-        
-    @staticmethod
-    def log_warning(message: str) -> None:
-        logging.warning(message)
-    
+
+        if asynchronous and handlers:
+            from logging.handlers import QueueListener, MemoryHandler
+            from queue import SimpleQueue
+            queue = SimpleQueue()
+            batched = [MemoryHandler(batch_size, flushLevel=logging.ERROR, target=handler) for handler in handlers]
+            self.listener = QueueListener(queue, *batched)
+            self.listener.start()
+            self._sinks = handlers + batched
+            handlers = [_deferred_queue_handler(queue)]
+        else:
+            self._sinks = handlers
+
+        for handler in handlers:
+            self.logger.addHandler(handler)
+        self.enabled = bool(handlers) and self.logger.isEnabledFor(logging.INFO)
+        self.warnings_enabled = bool(handlers) and self.logger.isEnabledFor(logging.WARNING)
+
+    def close(self) -> None:
+        '''
+        Stops the listener thread (if any), flushes pending batches and closes the handlers.
+        '''
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        for handler in reversed(self._sinks):
+            handler.close()
+        self.logger.handlers.clear()
+        self.enabled = False
+        self.warnings_enabled = False
+
+    def __enter__(self) -> 'GameLogger':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _extra(self, player_id: int = None, action: str = None, amount: int = None) -> dict:
+        return {"table_id": self.table_id, "hand_id": self.hand_id,
+                "player_id": player_id, "action": action, "amount": amount}
+
+    def new_hand(self) -> None:
+        self.hand_id += 1
+
+    def log_event(self, message: str) -> None:
+        if self.enabled:
+            self.logger.info("%s\n", message, extra=self._extra())
+
+    def log_info(self, message: str) -> None:
+        if self.enabled:
+            self.logger.info(message, extra=self._extra())
+
+    def log_warning(self, message: str) -> None:
+        if self.warnings_enabled:
+            self.logger.warning(message, extra=self._extra())
+
     def get_current_player_id(self) -> int:
         return self.game.current_player_id
 
     def log_phase(self) -> None:
-        logging.info(f" --- Game phase: {self.game.phase} --- ")
+        if self.enabled:
+            self.logger.info(" --- Game phase: %s --- ", self.game.phase, extra=self._extra())
 
-    def log_player_action(self, action: str, amount: int = 0) -> None:
-        current_player_id = self.get_current_player_id()
+    def log_player_action(self, action: str, amount: int = 0, player: Player = None) -> None:
+        if not self.enabled:
+            return
+        player_id = player.player_id if player is not None else self.get_current_player_id()
+        extra = self._extra(player_id, action, amount)
         if "bet" in action.lower():
-            logging.info(f"Player {current_player_id} performed action: {action} with amount: {amount}")
-        if "fold" in action.lower():
-            logging.info(f"Player {current_player_id} performed action: {action}")
-        if "check" in action.lower():
-            logging.info(f"Player {current_player_id} performed action: {action}")
+            self.logger.info("Player %s performed action: %s with amount: %s", player_id, action, amount, extra=extra)
+        else:
+            self.logger.info("Player %s performed action: %s", player_id, action, extra=extra)
+
+    def log_game_state(self) -> None:
+        if not self.enabled:
+            return
+        game = self.game
+        active_players = sum(1 for p in game.players if p.active)
+        self.logger.info("Current pot: %s, Active Players: %s, Community Cards: %s",
+                         game.pot, active_players, _CardList(game.community_cards), extra=self._extra())
+
+    def log_community_cards(self) -> None:
+        if self.enabled:
+            self.logger.info("\nCommunity cards: %s\n", _CardList(self.game.community_cards, brackets=True),
+                             extra=self._extra())
+
+    def log_performance_metrics(self, metrics: Metrics = None) -> None:
+        '''
+        Logs a snapshot of `metrics`, by default the Metrics window currently open (nothing if none is).
+        '''
+        if not self.enabled:
+            return
+        if metrics is None:
+            metrics = current_metrics()
+            if metrics is None:
+                return
+        snapshot = metrics.snapshot()
+        self.logger.info("Performance: %.1f hands/s, %s showdowns, %.2f evaluator calls per showdown, "
+                         "action latency p50 %.1fus p99 %.1fus", snapshot["hands_per_second"], snapshot["showdowns"],
+                         snapshot["evaluator_calls_per_showdown"], snapshot["action_latency_p50"] * 1e6,
+                         snapshot["action_latency_p99"] * 1e6, extra=self._extra())
+
+
+class _CardList:
+    # Copies the cards (cheap, they are shared instances) and builds the string only if the record is formatted
+    __slots__ = ('cards', 'brackets')
+
+    def __init__(self, cards: list, brackets: bool = False):
+        self.cards = tuple(cards)
+        self.brackets = brackets
+
+    def __str__(self) -> str:
+        text = ', '.join(card.name for card in self.cards)
+        return f"[{text}]" if self.brackets else text
+
+
+class NullGameLogger(GameLogger):
+    '''
+    Logger that drops every message without formatting it.
+    Used by headless simulations so that the hand loop measures engine cost, not I/O.
+    '''
+    def __init__(self, game: Game = None):
+        self.game = game
+        self.table_id = None
+        self.hand_id = 0
+        self.listener = None
+        self.enabled = False
+        self.warnings_enabled = False
+        self._sinks = []
+
+    def close(self) -> None:
+        pass
+
+    def log_event(self, message: str) -> None:
+        pass
+
+    def log_info(self, message: str) -> None:
+        pass
+
+    def log_warning(self, message: str) -> None:
+        pass
+
+    def log_phase(self) -> None:
+        pass
+
+    def log_player_action(self, action: str, amount: int = 0, player: Player = None) -> None:
+        pass
 
     def log_game_state(self) -> None:
-        active_players = len([p for p in self.game.players if p.active])
-        community_cards = ', '.join(str(card) for card in self.game.community_cards)
-        logging.info(f"Current pot: {self.game.pot}, Active Players: {active_players}, Community Cards: {community_cards}")
+        pass
 
     def log_community_cards(self) -> None:
-        community_cards = self.game.community_cards
-        logging.info(f"\nCommunity cards: {community_cards}\n")
+        pass
 
-    def log_performance_metrics(self) -> None:
-        pass  # Implement as needed
+    def log_performance_metrics(self, metrics: Metrics = None) -> None:
+        pass
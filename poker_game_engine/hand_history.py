@@ -0,0 +1,247 @@
+import mmap
+import struct
+from typing import NamedTuple
+from poker_game_engine.constants import phase_index, street_cards
+from poker_game_engine.game_engine import Game, Player
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.pots import settle_pots
+
+# A history file is a sequence of length-prefixed hand records, appended as hands finish:
+#   u32 payload length
+#   header: hand_id, table_id, players, dealer_index, small_blind, big_blind, winners, actions, pot
+#   52 bytes: card codes in deal order
+#   one int64 starting bankroll per player
+#   one byte per winner id
+#   one 7-byte record per decision: player_id, choice, phase index, amount
+_LENGTH = struct.Struct('<I')
+_HEADER = struct.Struct('<QIBBIIBHq')
+_BANKROLL = struct.Struct('<q')
+_ACTION = struct.Struct('<BBBI')
+
+_CHOICES = ('0', '1', '2', '3', '4', '5')
+
+
+class HandRecord(NamedTuple):
+    hand_id: int
+    table_id: int
+    dealer_index: int
+    small_blind: int
+    big_blind: int
+    pot: int
+    deck: bytes  # Card codes in deal order
+    bankrolls: tuple  # Before the blinds
+    winners: tuple
+    actions: list  # (player_id, choice, phase index, amount)
+
+
+def _resume_point(path: str) -> tuple:
+    # (hand_id of the last complete record, offset after it) of an existing history file
+    try:
+        history = open(path, 'rb')
+    except FileNotFoundError:
+        return 0, 0
+    with history:
+        size = history.seek(0, 2)
+        if not size:
+            return 0, 0
+        with mmap.mmap(history.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            hand_id = offset = 0
+            while offset + _LENGTH.size <= size:
+                (length,) = _LENGTH.unpack_from(data, offset)
+                end = offset + _LENGTH.size + length
+                if end > size:
+                    break
+                hand_id = _HEADER.unpack_from(data, offset + _LENGTH.size)[0]
+                offset = end
+    return hand_id, offset
+
+
+class HandHistoryWriter:
+    '''
+    Streams hand records to an append-only file. Hands are encoded as they end and written in
+    batches of `flush_every` hands. Appending to an existing file resumes the hand ids after its last
+    record, and drops a truncated last record (e.g. after a crash) so that new records stay readable.
+    Plug it into an ActionHandler as its `recorder`, or pass it to HeadlessSimulator(history=...),
+    which also calls start_hand/end_hand.
+    '''
+    def __init__(self, path: str, table_id: int = 0, flush_every: int = 256):
+        self.table_id = table_id
+        self.flush_every = flush_every
+        self.hand_id, end = _resume_point(path)
+        self._file = open(path, 'ab')
+        if self._file.tell() > end:
+            self._file.truncate(end)
+        self._buffer = bytearray()
+        self._pending = 0
+        self._game = None
+        self._actions = bytearray()
+        self._nb_actions = 0
+
+    def start_hand(self, game: Game, small_blind: int, big_blind: int) -> None:
+        '''
+        Captures the deck order and bankrolls. Call it after Game.start_new_round, before the blinds.
+        '''
+        self.hand_id += 1
+        self._game = game
+        self._deck = bytes(card.code for card in reversed(game.deck.cards))
+        self._bankrolls = [player.bankroll for player in game.players]
+        self._dealer_index = game.dealer_index
+        self._blinds = (small_blind, big_blind)
+        self._actions = bytearray()
+        self._nb_actions = 0
+
+    def record_action(self, player: Player, choice: str, amount: int = 0) -> None:
+        if self._game is None:
+            raise RuntimeError("start_hand() not called")
+        self._actions += _ACTION.pack(player.player_id, int(choice), phase_index[self._game.phase], amount)
+        self._nb_actions += 1
+
+    def end_hand(self, winners: list, pot: int) -> None:
+        if self._game is None:
+            raise RuntimeError("start_hand() not called")
+        bankrolls = self._bankrolls
+        payload = b''.join([
+            _HEADER.pack(self.hand_id, self.table_id, len(bankrolls), self._dealer_index, self._blinds[0],
+                         self._blinds[1], len(winners), self._nb_actions, pot),
+            self._deck,
+            struct.pack(f'<{len(bankrolls)}q', *bankrolls),
+            bytes(player.player_id for player in winners),
+            self._actions,
+        ])
+        self._buffer += _LENGTH.pack(len(payload))
+        self._buffer += payload
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'HandHistoryWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class HandHistoryReader:
+    '''
+    Iterates over the hand records of a history file through a memory map.
+    A truncated last record (e.g. after a crash) is ignored.
+    '''
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __iter__(self):
+        data = self._data
+        size = len(data)
+        offset = 0
+        while offset + _LENGTH.size <= size:
+            (length,) = _LENGTH.unpack_from(data, offset)
+            start = offset + _LENGTH.size
+            offset = start + length
+            if offset > size:
+                return
+            yield _decode(data, start)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> 'HandHistoryReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _decode(data, offset: int) -> HandRecord:
+    (hand_id, table_id, nb_players, dealer_index, small_blind, big_blind,
+     nb_winners, nb_actions, pot) = _HEADER.unpack_from(data, offset)
+    offset += _HEADER.size
+    deck = bytes(data[offset:offset + 52])
+    offset += 52
+    bankrolls = struct.unpack_from(f'<{nb_players}q', data, offset)
+    offset += nb_players * _BANKROLL.size
+    winners = tuple(data[offset:offset + nb_winners])
+    offset += nb_winners
+    actions = list(_ACTION.iter_unpack(data[offset:offset + nb_actions * _ACTION.size]))
+    return HandRecord(hand_id, table_id, dealer_index, small_blind, big_blind, pot, deck, bankrolls, winners, actions)
+
+
+class HandReplayer:
+    '''
+    Re-drives a Game from hand records: same deck, bankrolls, blinds and decisions, dealing the
+    streets as the recorded phases advance, then settles the pots. With `verify`, the players who won
+    chips are checked against the recorded winners.
+    '''
+    def __init__(self, evaluator=None, verify: bool = True):
+        self.evaluator = evaluator if evaluator is not None else LookupHandEvaluator()
+        self.verify = verify
+        self._tables = {}  # Number of players -> (game, action handler), reused across hands
+
+    def _table(self, nb_players: int) -> tuple:
+        table = self._tables.get(nb_players)
+        if table is None:
+            game = Game(players=nb_players, evaluator=self.evaluator)
+            table = (game, ActionHandler(game=game, logger=NullGameLogger(game)))
+            self._tables[nb_players] = table
+        return table
+
+    def replay(self, record: HandRecord) -> Game:
+        game, handler = self._table(len(record.bankrolls))
+        players = game.players
+        for player, bankroll in zip(players, record.bankrolls):
+            player.bankroll = bankroll
+        game.dealer_index = record.dealer_index
+        game.start_new_round(deck_order=record.deck)
+
+        handler.post_blind(game.get_small_blind_player(), record.small_blind)
+        handler.post_blind(game.get_big_blind_player(), record.big_blind)
+        for player in players:
+            if player.active:
+                handler.handle_deal_card(player)
+                handler.handle_deal_card(player)
+
+        phase = 0
+        for player_id, choice, action_phase, amount in record.actions:
+            while phase < action_phase:
+                handler.deal_community_cards(street_cards[phase])
+                game.reset_players_phase_bets()
+                phase += 1
+            game.current_player_id = player_id
+            if not handler.player_action_input(players[player_id], _CHOICES[choice], amount):
+                raise ValueError(f"Hand {record.hand_id}: recorded action of player {player_id} was rejected")
+
+        if sum(1 for player in players if player.active) > 1:
+            while phase < len(street_cards):
+                handler.deal_community_cards(street_cards[phase])
+                phase += 1
+        winners = tuple(sorted(player.player_id for player in settle_pots(game)))
+        if self.verify and winners != record.winners:
+            raise ValueError(f"Hand {record.hand_id}: replay winners {winners} != recorded {record.winners}")
+        return game
+
+    def replay_file(self, path: str) -> int:
+        '''
+        Replays every hand of a history file, returns the number of hands replayed.
+        '''
+        count = 0
+        with HandHistoryReader(path) as reader:
+            for record in reader:
+                self.replay(record)
+                count += 1
+        return count
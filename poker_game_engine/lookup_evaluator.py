@@ -0,0 +1,206 @@
+from collections import Counter
+from itertools import combinations_with_replacement
+from math import comb
+from poker_game_engine.constants import hand_rankings
+
+# A hand strength is one integer: the category (see hand_rankings) in the top bits,
+# followed by up to five 4-bit rank values (2..14) used as tiebreaks, most significant first.
+CATEGORY_SHIFT = 20
+
+_RANK_WEIGHTS = [5 ** index for index in range(13)]  # base-5 digit per rank, counts are 0..4
+# Per card code (rank_index * 4 + suit_index) lookups
+_CODE_WEIGHTS = [_RANK_WEIGHTS[code >> 2] for code in range(52)]
+_CODE_RANK_BITS = [1 << (code >> 2) for code in range(52)]
+
+_tables = None
+
+
+def pack_strength(category: int, ranks: list) -> int:
+    '''
+    Packs a hand category and its tiebreak rank values into a single comparable integer.
+    '''
+    strength = category
+    for position in range(5):
+        strength = (strength << 4) | (ranks[position] if position < len(ranks) else 0)
+    return strength
+
+
+def strength_category(strength: int) -> int:
+    return strength >> CATEGORY_SHIFT
+
+
+def strength_rank(strength: int) -> int:
+    # Primary rank of the hand (pair rank, trips rank, straight high card...)
+    return (strength >> 16) & 0xF
+
+
+def five_card_classes():
+    '''
+    Yields (card codes, count) covering all 2,598,960 five-card hands: one representative hand per rank
+    multiset and flush status, weighted by its number of suit assignments (distinct ranks have 4 flush
+    and 1020 other assignments, each rank of a pair or more C(4, count) of them).
+    '''
+    for ranks in combinations_with_replacement(range(13), 5):
+        counts = Counter(ranks)
+        if max(counts.values()) > 4:
+            continue
+        if len(counts) == 5:
+            variants = (((0, 0, 0, 0, 0), 4), ((0, 0, 0, 0, 1), 1020))
+        else:
+            weight = 1
+            suits = []
+            for rank in sorted(counts):
+                weight *= comb(4, counts[rank])
+                suits += range(counts[rank])
+            variants = ((suits, weight),)
+        for suits, weight in variants:
+            yield [rank * 4 + suit for rank, suit in zip(sorted(ranks), suits)], weight
+
+
+def _straight_high(mask: int) -> int:
+    # Returns the rank index of the highest straight contained in a 13-bit rank mask, or -1
+    for high in range(12, 3, -1):
+        window = 0b11111 << (high - 4)
+        if mask & window == window:
+            return high
+    wheel = (1 << 12) | 0b1111  # A-2-3-4-5
+    if mask & wheel == wheel:
+        return 3
+    return -1
+
+
+def _flush_strength(mask: int) -> int:
+    high = _straight_high(mask)
+    if high == 12:
+        return pack_strength(9, [14])
+    if high >= 0:
+        return pack_strength(8, [high + 2])
+    ranks = [index + 2 for index in range(12, -1, -1) if mask >> index & 1]
+    return pack_strength(5, ranks[:5])
+
+
+def _rank_strength(counts: list) -> int:
+    # Best five-card hand that can be made from rank counts alone (no flush possible)
+    descending = [index for index in range(12, -1, -1) if counts[index]]
+    quads = [index for index in descending if counts[index] >= 4]
+    trips = [index for index in descending if counts[index] == 3]
+    pairs = [index for index in descending if counts[index] == 2]
+
+    if quads:
+        quad = quads[0]
+        kicker = next(index for index in descending if index != quad)
+        return pack_strength(7, [quad + 2, kicker + 2])
+    if trips and (len(trips) > 1 or pairs):
+        trip = trips[0]
+        pair = max(index for index in trips[1:] + pairs)
+        return pack_strength(6, [trip + 2, pair + 2])
+
+    mask = 0
+    for index in descending:
+        mask |= 1 << index
+    high = _straight_high(mask)
+    if high >= 0:
+        return pack_strength(4, [high + 2])
+
+    if trips:
+        kickers = [index + 2 for index in descending if index != trips[0]]
+        return pack_strength(3, [trips[0] + 2] + kickers[:2])
+    if len(pairs) > 1:
+        kicker = next(index for index in descending if index not in pairs[:2])
+        return pack_strength(2, [pairs[0] + 2, pairs[1] + 2, kicker + 2])
+    if pairs:
+        kickers = [index + 2 for index in descending if index != pairs[0]]
+        return pack_strength(1, [pairs[0] + 2] + kickers[:3])
+    return pack_strength(0, [index + 2 for index in descending[:5]])
+
+
+def _rank_count_vectors(remaining: int, index: int, counts: list):
+    # Yields every rank-count vector (max 4 of a rank) holding exactly `remaining` more cards
+    if index == 13:
+        if remaining == 0:
+            yield counts
+        return
+    for count in range(min(4, remaining) + 1):
+        counts[index] = count
+        yield from _rank_count_vectors(remaining - count, index + 1, counts)
+    counts[index] = 0
+
+
+def _build_tables() -> tuple:
+    flush_table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count('1') >= 5:
+            flush_table[mask] = _flush_strength(mask)
+
+    rank_table = {}
+    for size in (5, 6, 7):
+        for counts in _rank_count_vectors(size, 0, [0] * 13):
+            key = sum(count * weight for count, weight in zip(counts, _RANK_WEIGHTS))
+            rank_table[key] = _rank_strength(counts)
+    return flush_table, rank_table
+
+
+def get_tables() -> tuple:
+    '''
+    Returns the (flush_table, rank_table) pair, building it on first use.
+    flush_table is indexed by a 13-bit rank mask of one suit, rank_table by the base-5 rank-count key.
+    '''
+    global _tables
+    if _tables is None:
+        _tables = _build_tables()
+    return _tables
+
+
+class LookupHandEvaluator:
+    '''
+    Scores 5 to 7 cards in a single pass using precomputed flush and rank-count tables,
+    instead of evaluating every five-card combination.
+    The returned strength is an integer: a higher value always means a better hand.
+    '''
+    def __init__(self):
+        self.hand_rankings = hand_rankings
+        self.flush_table, self.rank_table = get_tables()
+
+    def evaluate(self, cards: list) -> int:
+        flush_table = self.flush_table
+        suit_masks = [0, 0, 0, 0]
+        key = 0
+        for card in cards:
+            suit_masks[card.suit_index] |= card.rank_bit
+            key += _CODE_WEIGHTS[card.code]
+        for mask in suit_masks:
+            # Five suited cards out of seven rule out quads and full houses, so the flush is the best hand
+            strength = flush_table[mask]
+            if strength:
+                return strength
+        return self.rank_table[key]
+
+    def evaluate_codes(self, codes: list) -> int:
+        '''
+        Same as evaluate, for cards given as integer codes (Card.code).
+        '''
+        flush_table = self.flush_table
+        suit_masks = [0, 0, 0, 0]
+        key = 0
+        for code in codes:
+            suit_masks[code & 3] |= _CODE_RANK_BITS[code]
+            key += _CODE_WEIGHTS[code]
+        for mask in suit_masks:
+            strength = flush_table[mask]
+            if strength:
+                return strength
+        return self.rank_table[key]
+
+    def best_hand(self, cards: list) -> int:
+        return self.evaluate(cards)
+
+    @staticmethod
+    def hand_key(strength: int) -> int:
+        return strength
+
+    def describe(self, strength: int) -> tuple:
+        '''
+        Converts a strength back to the (category, rank, name) tuple returned by HandEvaluator.
+        '''
+        category = strength_category(strength)
+        return (category, strength_rank(strength), self.hand_rankings[category])
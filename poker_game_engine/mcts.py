@@ -0,0 +1,269 @@
+import math
+import random
+import time
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.betting import BettingRound, abstract_actions
+from poker_game_engine.constants import phase_index, street_cards
+from poker_game_engine.cfr import strength_bucket
+from poker_game_engine.game_engine import Game, Player
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.pots import settle_pots
+
+
+def rebuild_round(betting: BettingRound, seat: int, big_blind: int) -> None:
+    '''
+    Opens `betting` on its game at the decision of `seat`, from what the game holds: the players who
+    face a bet are still to act and, while nobody has raised (pre-flop bets up to the big blind, or no
+    bet on later streets), so are the players who speak after `seat` on this street.
+    '''
+    game = betting.game
+    betting.start(seat)
+    if betting.actors <= 1:
+        return
+    players = game.players
+    nb_players = len(players)
+    max_bet = betting.max_bet
+    preflop = not game.community_cards
+    first = (game.dealer_index + (3 if preflop else 1)) % nb_players
+    unraised = max_bet <= (big_blind if preflop else 0)
+    position = (seat - first) % nb_players
+    to_act = 0
+    for index, player in enumerate(players):
+        if not (player.active and player.bankroll > 0):
+            continue
+        if index == seat or player.phase_bet < max_bet or (unraised and (index - first) % nb_players > position):
+            to_act += 1
+    betting.to_act = to_act
+
+
+def hand_bucket(hand: list, board: list, evaluator, nb_buckets: int) -> int:
+    '''
+    Coarse strength class (0..nb_buckets - 1) of hole cards: by high card, pair and suitedness pre-flop,
+    by strength percentile of the best hand on later streets (see cfr.strength_bucket).
+    '''
+    if board:
+        return strength_bucket(evaluator.best_hand(hand + board), nb_buckets)
+    high, low = sorted((card.rank for card in hand), reverse=True)
+    score = high + low + (high == low) * 12 + (hand[0].suit_index == hand[1].suit_index) * 2  # 5..42
+    return min((score - 5) * nb_buckets // 38, nb_buckets - 1)
+
+
+class _Node:
+    # Statistics of one action history: {(choice, amount): [visits, total reward of the acting seat, child]}.
+    # Decisions of the other seats are split by their hand bucket (infosets), since they know their cards.
+    __slots__ = ('visits', 'children', 'infosets')
+
+    def __init__(self):
+        self.visits = 0
+        self.children = {}
+        self.infosets = None
+
+    def infoset(self, bucket: int) -> '_Node':
+        if self.infosets is None:
+            self.infosets = {}
+        node = self.infosets.get(bucket)
+        if node is None:
+            node = self.infosets[bucket] = _Node()
+        return node
+
+
+class _Search:
+    '''
+    Information set MCTS from the point of view of `seat`: every iteration plays a copy of the root
+    game where the hidden cards (opponents' hole cards and the deck) are dealt at random, walks the tree
+    of action histories with UCB1, each seat maximizing its own result, and finishes the hand with
+    check/call rollouts. Opponent decisions are learnt per hand bucket, so that they call strong hands
+    and fold weak ones. Rewards are chip changes divided by the chips in play.
+    '''
+    def __init__(self, game: Game, seat: int, big_blind: int, bet_sizes: tuple, exploration: float, seed: int,
+                 nb_buckets: int = 5):
+        self.root = game
+        self.seat = seat
+        self.big_blind = big_blind
+        self.bet_sizes = bet_sizes
+        self.exploration = exploration
+        self.nb_buckets = nb_buckets
+        self.rng = random.Random(seed)
+        self.evaluator = LookupHandEvaluator()
+        self.handler = ActionHandler(game, NullGameLogger(game))
+        self.betting = BettingRound(game, self.handler)
+        self.tree = _Node()
+        self.bankrolls = [player.bankroll for player in game.players]
+        self.scale = float(sum(self.bankrolls) + game.pot) or 1.0
+        rebuild_round(self.betting, seat, big_blind)
+        self.root_round = (self.betting.max_bet, self.betting.to_act, self.betting.live, self.betting.actors)
+
+    def _determinize(self) -> Game:
+        # A copy of the root where everything the searching seat cannot see is dealt again
+        game = self.root.clone(self.rng)
+        game.evaluator = self.evaluator
+        hidden = game.deck.cards
+        others = [player for player in game.players if player.player_id != self.seat and player.hand]
+        for player in others:
+            hidden.extend(player.hand)
+        self.rng.shuffle(hidden)
+        for player in others:
+            player.hand = [hidden.pop(), hidden.pop()]
+        return game
+
+    def _open_round(self, game: Game) -> BettingRound:
+        betting = self.betting
+        self.handler.game = game
+        betting.game = game
+        betting.max_bet, betting.to_act, betting.live, betting.actors = self.root_round
+        betting.last_aggressor = None
+        betting.current = self.seat
+        return betting
+
+    def _next_street(self, game: Game, betting: BettingRound) -> bool:
+        # Deals the streets whose betting is closed, True once the hand is over
+        while betting.closed:
+            if betting.live <= 1 or len(game.community_cards) == 5:
+                return True
+            self.handler.deal_community_cards(street_cards[phase_index[game.phase]])
+            game.reset_players_phase_bets()
+            betting.start((game.dealer_index + 1) % len(game.players))
+        return False
+
+    def iterate(self) -> None:
+        game = self._determinize()
+        betting = self._open_round(game)
+        node = self.tree
+        path = []
+        buckets = {}
+        over = False
+        while node is not None and not over:
+            seat = betting.current
+            if seat != self.seat:
+                key = (seat, len(game.community_cards))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = hand_bucket(game.players[seat].hand, game.community_cards,
+                                                        self.evaluator, self.nb_buckets)
+                node = node.infoset(bucket)
+            actions = abstract_actions(betting, self.bet_sizes, self.big_blind)
+            children = node.children
+            untried = [(choice, amount) for _, choice, amount in actions if (choice, amount) not in children]
+            if untried:
+                action = untried[self.rng.randrange(len(untried))]
+                children[action] = [0, 0.0, None]
+                child = None
+            else:
+                log_visits = math.log(node.visits)
+                exploration = self.exploration
+                best = -math.inf
+                for _, choice, amount in actions:
+                    visits, total, _ = children[(choice, amount)]
+                    score = total / visits + exploration * math.sqrt(log_visits / visits)
+                    if score > best:
+                        best, action = score, (choice, amount)
+                entry = children[action]
+                if entry[2] is None:
+                    entry[2] = _Node()
+                child = entry[2]
+            path.append((node, action, seat))
+            betting.apply(*action)
+            over = self._next_street(game, betting)
+            node = child
+
+        # Rollout: everybody checks or calls down
+        while not over:
+            if not betting.apply('3'):
+                betting.apply('4')
+            over = self._next_street(game, betting)
+
+        settle_pots(game)
+        scale = self.scale
+        rewards = [(player.bankroll - before) / scale for player, before in zip(game.players, self.bankrolls)]
+        for node, action, seat in path:
+            node.visits += 1
+            entry = node.children[action]
+            entry[0] += 1
+            entry[1] += rewards[seat]
+
+    def run(self, iterations: int = None, time_limit: float = None) -> dict:
+        '''
+        Iterates until `iterations` or `time_limit` seconds are reached, whichever comes first.
+        Returns {(choice, amount): (visits, total reward)} of the root actions.
+        '''
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        count = 0
+        while (iterations is None or count < iterations) and (deadline is None or time.perf_counter() < deadline):
+            self.iterate()
+            count += 1
+        return {action: (visits, total) for action, (visits, total, _) in self.tree.children.items()}
+
+
+def _search(task: tuple) -> dict:
+    # Runs one root-parallel search in a worker process
+    game, seat, big_blind, bet_sizes, exploration, seed, nb_buckets, iterations, time_limit = task
+    return _Search(game, seat, big_blind, bet_sizes, exploration, seed, nb_buckets).run(iterations, time_limit)
+
+
+class MCTSAgent:
+    '''
+    Agent (game, player) -> (choice, amount), like the simulator's agents and get_player_input, that
+    searches every decision with information set MCTS (see _Search) over abstract actions
+    (betting.abstract_actions with `bet_sizes`). The budget per decision is `iterations` and/or
+    `time_limit` seconds. With `workers` > 1, independent searches run in worker processes (root
+    parallelization) and their root statistics are summed: each worker gets the whole budget when
+    limited by time, a share of it when limited by iterations. The most visited action is played.
+
+    `big_blind` tells pre-flop limps from raises when the betting round is rebuilt from the game,
+    `nb_buckets` is the number of hand classes the opponents' decisions are learnt for.
+    The statistics of the last decision are kept in `last_stats`. Call close() to stop the workers.
+    '''
+    def __init__(self, iterations: int = 1000, time_limit: float = None, workers: int = 1, big_blind: int = 20,
+                 bet_sizes: tuple = (0.5, 1.0), exploration: float = 0.7, nb_buckets: int = 5, seed: int = None):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration or a time budget")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.big_blind = big_blind
+        self.bet_sizes = tuple(bet_sizes)
+        self.exploration = exploration
+        self.nb_buckets = nb_buckets
+        self.rng = random.Random(seed)
+        self.last_stats = {}
+        self._executor = None
+
+    def __call__(self, game: Game, player: Player) -> tuple:
+        seat = game.players.index(player)
+        root = game.clone(random.Random(self.rng.getrandbits(64)))
+        if self.workers <= 1:
+            stats = _Search(root, seat, self.big_blind, self.bet_sizes, self.exploration, self.rng.getrandbits(64),
+                            self.nb_buckets).run(self.iterations, self.time_limit)
+        else:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            root.evaluator = None  # Workers use their own, the tables are not sent over
+            tasks = []
+            for worker in range(self.workers):
+                share = None
+                if self.iterations is not None:
+                    share = self.iterations // self.workers + (1 if worker < self.iterations % self.workers else 0)
+                tasks.append((root, seat, self.big_blind, self.bet_sizes, self.exploration, self.rng.getrandbits(64),
+                              self.nb_buckets, share, self.time_limit))
+            stats = {}
+            for result in self._executor.map(_search, tasks):
+                for action, (visits, total) in result.items():
+                    merged = stats.get(action, (0, 0.0))
+                    stats[action] = (merged[0] + visits, merged[1] + total)
+        self.last_stats = stats
+        if not stats:
+            return ('3', 0) if player.phase_bet >= game.get_max_phase_bet() else ('4', 0)
+        return max(stats, key=lambda action: stats[action][0])
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'MCTSAgent':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,173 @@
+import functools
+import importlib
+import time
+from collections import deque
+
+# Hot paths timed while a Metrics window is open: (module, class, method, timer name).
+# They are wrapped on enable() and restored on disable(), so nothing is measured, and nothing is paid,
+# outside of a window.
+TIMED_METHODS = (
+    ("poker_game_engine.game_engine", "HandEvaluator", "best_hand", "best_hand"),
+    ("poker_game_engine.lookup_evaluator", "LookupHandEvaluator", "best_hand", "best_hand"),
+    ("poker_game_engine.game_engine", "Deck", "__init__", "deck_init"),
+    ("poker_game_engine.game_engine", "Deck", "reset", "deck_reset"),
+    ("poker_game_engine.game_engine", "Game", "get_game_state", "get_game_state"),
+    ("poker_game_engine.action_handlers", "ActionHandler", "player_action_input", "action"),
+    ("poker_game_engine.betting", "BettingRound", "apply", "betting_apply"),
+    ("poker_game_engine.simulator", "HeadlessSimulator", "play_betting_round", "betting_round"),
+    ("poker_game_engine.simulator", "HeadlessSimulator", "play_hand", "hand"),
+    ("poker_game_engine.table", "Table", "_finish", "table_hand"),
+)
+_EVALUATOR_TIMER = "best_hand"
+_LATENCY_TIMER = "action"
+
+_active = None
+
+
+def current_metrics() -> 'Metrics':
+    '''
+    The Metrics window currently open, or None.
+    '''
+    return _active
+
+
+class Metrics:
+    '''
+    Timers and counters for the engine hot paths (see TIMED_METHODS), collected only between enable()
+    and disable(), or inside a `with Metrics() as metrics:` block. One window can be open at a time.
+
+    snapshot() reports hands per second, showdowns, evaluator calls per showdown, p50/p99 action latency
+    (over the last `max_samples` actions) and every timer; to_json() and to_prometheus() export it.
+    '''
+    def __init__(self, max_samples: int = 100000):
+        self.max_samples = max_samples
+        self._originals = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.timers = {}  # name -> [calls, total nanoseconds]
+        self.counters = {"hands": 0, "showdowns": 0}
+        self.latencies = deque(maxlen=self.max_samples)  # Action durations in nanoseconds
+        self.started = time.perf_counter()
+        self.stopped = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = [0, 0]
+        timer[0] += 1
+        timer[1] += elapsed_ns
+        if name == _LATENCY_TIMER:
+            self.latencies.append(elapsed_ns)
+
+    def _wrap(self, name: str, function):
+        record = self.record
+        clock = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+
+        if name == "hand":
+            @functools.wraps(function)
+            def timed_hand(*args, **kwargs):
+                result = timed(*args, **kwargs)
+                self.counters["hands"] += 1
+                self.counters["showdowns"] += bool(result["showdown"])
+                return result
+            return timed_hand
+        if name == "table_hand":
+            @functools.wraps(function)
+            def timed_table_hand(table, *args, **kwargs):
+                self.counters["hands"] += 1
+                self.counters["showdowns"] += table.betting.live > 1
+                return timed(table, *args, **kwargs)
+            return timed_table_hand
+        return timed
+
+    def enable(self) -> 'Metrics':
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another Metrics window is already open")
+        for module_name, class_name, method_name, timer_name in TIMED_METHODS:
+            owner = getattr(importlib.import_module(module_name), class_name)
+            original = owner.__dict__[method_name]
+            self._originals.append((owner, method_name, original))
+            setattr(owner, method_name, self._wrap(timer_name, original))
+        _active = self
+        self.started = time.perf_counter()
+        self.stopped = None
+        return self
+
+    def disable(self) -> None:
+        global _active
+        for owner, method_name, original in reversed(self._originals):
+            setattr(owner, method_name, original)
+        self._originals = []
+        if _active is self:
+            _active = None
+            self.stopped = time.perf_counter()
+
+    def __enter__(self) -> 'Metrics':
+        return self.enable()
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def _percentile(self, samples: list, quantile: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[int(quantile * (len(samples) - 1))] / 1e9
+
+    def snapshot(self) -> dict:
+        elapsed = (self.stopped if self.stopped is not None else time.perf_counter()) - self.started
+        hands = self.counters["hands"]
+        showdowns = self.counters["showdowns"]
+        evaluator_calls = self.timers.get(_EVALUATOR_TIMER, (0, 0))[0]
+        latencies = sorted(self.latencies)
+        return {
+            "elapsed": elapsed,
+            "hands": hands,
+            "hands_per_second": hands / elapsed if elapsed else 0.0,
+            "showdowns": showdowns,
+            "evaluator_calls": evaluator_calls,
+            "evaluator_calls_per_showdown": evaluator_calls / showdowns if showdowns else 0.0,
+            "action_latency_p50": self._percentile(latencies, 0.5),
+            "action_latency_p99": self._percentile(latencies, 0.99),
+            "counters": dict(self.counters),
+            "timers": {name: {"calls": calls, "total_seconds": total / 1e9,
+                              "mean_seconds": total / calls / 1e9 if calls else 0.0}
+                       for name, (calls, total) in self.timers.items()},
+        }
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix: str = 'poker_engine') -> str:
+        '''
+        Snapshot in the Prometheus text exposition format.
+        '''
+        snapshot = self.snapshot()
+        lines = []
+        for name, kind in (("hands", "counter"), ("showdowns", "counter"), ("evaluator_calls", "counter"),
+                           ("hands_per_second", "gauge"), ("evaluator_calls_per_showdown", "gauge")):
+            metric = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {snapshot[name]}")
+        lines.append(f"# TYPE {prefix}_action_latency_seconds summary")
+        for quantile in ("0.5", "0.99"):
+            value = snapshot["action_latency_p50" if quantile == "0.5" else "action_latency_p99"]
+            lines.append(f'{prefix}_action_latency_seconds{{quantile="{quantile}"}} {value}')
+        for metric, field in (("timer_calls_total", "calls"), ("timer_seconds_total", "total_seconds")):
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, timer in snapshot["timers"].items():
+                lines.append(f'{prefix}_{metric}{{name="{name}"}} {timer[field]}')
+        return "\n".join(lines) + "\n"
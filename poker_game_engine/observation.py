@@ -0,0 +1,132 @@
+from poker_game_engine.constants import actions_vals, game_phases, phase_index
+from poker_game_engine.game_engine import Game, Player
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, plain lists are filled instead
+    np = None
+
+# Order of the entries of an action mask: '1' Fold, '2' Bet, '3' Check, '4' Call, '5' All-in
+ACTION_CHOICES = tuple(actions_vals)
+
+
+def action_mask(game: Game, player: Player = None, max_bet: int = None, out=None):
+    '''
+    Legal-action mask of `player` (default: the current player), following the ActionHandler rules,
+    with one entry per ACTION_CHOICES. `max_bet` (e.g. BettingRound.max_bet) avoids a scan of the table.
+    Written into `out` when given, a bool array (or a list without NumPy) otherwise.
+    '''
+    if player is None:
+        player = game.players[game.current_player_id]
+    if max_bet is None:
+        max_bet = game.get_max_phase_bet()
+    if out is None:
+        out = np.zeros(len(ACTION_CHOICES), dtype=bool) if np is not None else [False] * len(ACTION_CHOICES)
+    to_call = max_bet - player.phase_bet
+    bankroll = player.bankroll
+    can_act = player.active and bankroll > 0
+    out[0] = can_act
+    # A bet has to raise the highest bet and be at least the last bet
+    out[1] = can_act and bankroll > to_call and bankroll >= game.last_bet
+    out[2] = can_act and to_call <= 0
+    out[3] = can_act and to_call > 0
+    out[4] = can_act
+    return out
+
+
+class ObservationEncoder:
+    '''
+    Encodes a table, seen from one player, into a fixed-size vector for learning agents:
+
+        hole cards      52  one-hot by Card.code
+        board           52  one-hot by Card.code
+        bankrolls       n   \\
+        phase bets      n    > per seat, starting with the observer and going left
+        in hand         n   /
+        pot, to call    2
+        phase           4   one-hot over constants.game_phases
+        position        n   one-hot, seats to the left of the dealer
+
+    Chip amounts are divided by the total chips at the table. Cards are read from their codes, no
+    card names are parsed. encode() reuses a preallocated buffer, copy it to keep the observation.
+    '''
+    def __init__(self, nb_players: int, dtype: str = 'float32'):
+        self.nb_players = nb_players
+        self.dtype = dtype
+        self.obs_dim = 104 + 4 * nb_players + 2 + len(game_phases)
+        self._buffer = self._allocate(None)
+
+    def _allocate(self, rows: int = None):
+        if np is None:
+            if rows is None:
+                return [0.0] * self.obs_dim
+            return [[0.0] * self.obs_dim for _ in range(rows)]
+        shape = self.obs_dim if rows is None else (rows, self.obs_dim)
+        return np.zeros(shape, dtype=self.dtype)
+
+    def encode(self, game: Game, player: Player = None, out=None):
+        '''
+        Writes the observation of `player` (default: the current player) into `out`, or into the
+        encoder's own buffer, and returns it.
+        '''
+        if out is None:
+            out = self._buffer
+        if np is None:
+            out[:] = [0.0] * self.obs_dim
+        else:
+            out.fill(0)
+        players = game.players
+        nb_players = self.nb_players
+        if player is None:
+            player = players[game.current_player_id]
+
+        for card in player.hand:
+            out[card.code] = 1.0
+        for card in game.community_cards:
+            out[52 + card.code] = 1.0
+
+        total = game.pot
+        for other in players:
+            total += other.bankroll
+        scale = 1.0 / total if total else 0.0
+        seat = player.player_id
+        max_bet = 0
+        for offset in range(nb_players):
+            other = players[(seat + offset) % nb_players]
+            out[104 + offset] = other.bankroll * scale
+            out[104 + nb_players + offset] = other.phase_bet * scale
+            out[104 + 2 * nb_players + offset] = 1.0 if other.active else 0.0
+            if other.phase_bet > max_bet:
+                max_bet = other.phase_bet
+
+        index = 104 + 3 * nb_players
+        out[index] = game.pot * scale
+        out[index + 1] = max(max_bet - player.phase_bet, 0) * scale
+        index += 2
+        out[index + phase_index[game.phase]] = 1.0
+        index += len(game_phases)
+        out[index + (seat - game.dealer_index - 1) % nb_players] = 1.0
+        return out
+
+    def encode_batch(self, games: list, players: list = None, out=None):
+        '''
+        Fills an (N_tables, obs_dim) array, one row per game, from the current players unless `players` is given.
+        '''
+        if out is None:
+            out = self._allocate(len(games))
+        for row, game in enumerate(games):
+            self.encode(game, players[row] if players is not None else None, out[row])
+        return out
+
+    def action_mask_batch(self, games: list, players: list = None, out=None):
+        '''
+        Fills an (N_tables, len(ACTION_CHOICES)) mask, one row per game.
+        '''
+        if out is None:
+            if np is not None:
+                out = np.zeros((len(games), len(ACTION_CHOICES)), dtype=bool)
+            else:
+                out = [[False] * len(ACTION_CHOICES) for _ in games]
+        for row, game in enumerate(games):
+            action_mask(game, players[row] if players is not None else None, out=out[row])
+        return out
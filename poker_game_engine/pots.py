@@ -0,0 +1,85 @@
+from poker_game_engine.game_engine import Game
+
+
+def build_pots(players: list) -> list:
+    '''
+    Splits the chips put in during the hand (total_game_bet) into the main pot and side pots, in one
+    pass over the players sorted by contribution.
+    Returns (amount, eligible_players, contributors) tuples, main pot first: eligible players are the
+    active ones who covered the pot's level, contributors every player who put chips into it.
+    '''
+    ordered = sorted((p for p in players if p.total_game_bet > 0), key=lambda p: p.total_game_bet)
+    count = len(ordered)
+    pots = []
+    previous_level = 0
+    for index, player in enumerate(ordered):
+        level = player.total_game_bet
+        if level == previous_level:
+            continue
+        amount = (level - previous_level) * (count - index)
+        # Every player from this index on put in at least `level`
+        contributors = ordered[index:]
+        eligible = [p for p in contributors if p.active]
+        if pots and eligible and pots[-1][1] == eligible:
+            # Only folded players dropped out since the previous level, same pot
+            pots[-1] = (pots[-1][0] + amount, eligible, pots[-1][2])
+        else:
+            pots.append((amount, eligible, contributors))
+        previous_level = level
+    return pots
+
+
+def return_uncalled_bet(game: Game) -> int:
+    '''
+    Gives the part of the largest contribution that nobody matched back to its owner.
+    Returns the amount refunded.
+    '''
+    highest = second = 0
+    top_player = None
+    for player in game.players:
+        contribution = player.total_game_bet
+        if contribution > highest:
+            highest, second, top_player = contribution, highest, player
+        elif contribution > second:
+            second = contribution
+    refund = highest - second
+    if refund:
+        top_player.total_game_bet -= refund
+        top_player.bankroll += refund
+        game.pot -= refund
+    return refund
+
+
+def settle_pots(game: Game) -> dict:
+    '''
+    Returns the uncalled bet, then pays every pot to the best eligible hand(s), splitting ties evenly
+    (odd chips go to the winners closest to the left of the dealer), and credits the bankrolls.
+    A pot nobody active can claim goes back to its contributors.
+    Returns {player: chips won}, refunds excluded.
+    '''
+    return_uncalled_bet(game)
+    players = game.players
+    active = [p for p in players if p.active]
+    evaluator = game.evaluator
+    if len(active) > 1:
+        keys = {p: evaluator.hand_key(evaluator.best_hand(p.hand + game.community_cards)) for p in active}
+    else:
+        keys = {p: 0 for p in active}
+
+    nb_players = len(players)
+    seat_order = {p: (p.player_id - game.dealer_index - 1) % nb_players for p in players}
+    payouts = {}
+    for amount, eligible, contributors in build_pots(players):
+        if eligible:
+            best = max(keys[p] for p in eligible)
+            winners = [p for p in eligible if keys[p] == best]
+        else:
+            winners = contributors
+        winners.sort(key=seat_order.__getitem__)
+        share, odd_chips = divmod(amount, len(winners))
+        for position, winner in enumerate(winners):
+            won = share + (1 if position < odd_chips else 0)
+            winner.bankroll += won
+            payouts[winner] = payouts.get(winner, 0) + won
+    game.pot = 0
+    return payouts
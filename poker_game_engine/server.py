@@ -0,0 +1,281 @@
+import asyncio
+import itertools
+import json
+from poker_game_engine.state_tracker import StateTracker
+from poker_game_engine.table import Table
+
+# Messages are JSON objects. Clients send:
+#   {"op": "subscribe", "table_id": ...}      then receive a full state and every update of the table
+#   {"op": "unsubscribe", "table_id": ...}
+#   {"op": "action", "table_id": ..., "player_id": ..., "choice": "1".."5", "amount": 0}
+# and receive:
+#   {"type": "state", "table_id": ..., "seq": ..., "full": true, "state": {...}}     (Game.get_game_state)
+#   {"type": "state", "table_id": ..., "seq": ..., "full": false, "changes": {...}} (StateTracker.get_changes)
+#   {"type": "closed", "table_id": ...}
+#   {"type": "error", "message": ...}
+
+
+class TableActor:
+    '''
+    Runs one table inside the event loop. Decisions arrive through an action queue (submit()); the
+    actor only takes the one of the player to act and plays a check, or a fold, for a player who has
+    not answered within `action_timeout` seconds. After every decision, the state change is pushed to
+    each subscriber queue: a StateTracker diff, or the full state when `diffs` is False. A subscriber
+    that falls `queue_size` updates behind is resynchronised with a full state.
+
+    Create actors from inside the running event loop.
+    '''
+    def __init__(self, table_id: int, nb_players: int = 6, seed: int = None, small_blind: int = 10,
+                 big_blind: int = 20, starting_bankroll: int = 1000, action_timeout: float = 30.0,
+                 max_hands: int = None, diffs: bool = True, queue_size: int = 256):
+        self.table_id = table_id
+        self.table = Table(nb_players, seed=seed, small_blind=small_blind, big_blind=big_blind,
+                           starting_bankroll=starting_bankroll, rebuy=False)
+        self.tracker = StateTracker(self.table.game)
+        self.action_timeout = action_timeout
+        self.max_hands = max_hands
+        self.diffs = diffs
+        self.queue_size = queue_size
+        self.actions = asyncio.Queue()
+        self.subscribers = []
+        self.timeouts = 0
+        self.closed = False
+        self._sent_seq = 0
+
+    def submit(self, player_id: int, choice: str, amount: int = 0) -> None:
+        self.actions.put_nowait((player_id, choice, amount))
+
+    def subscribe(self) -> asyncio.Queue:
+        '''
+        Returns a queue receiving the state messages of this table, starting with the full state.
+        A None item means that the table closed.
+        '''
+        queue = asyncio.Queue(self.queue_size)
+        queue.put_nowait(self._message(self.tracker.snapshot()))
+        if self.closed:
+            queue.put_nowait(None)
+        else:
+            self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self.subscribers:
+            self.subscribers.remove(queue)
+
+    def _message(self, update: dict) -> dict:
+        return {"type": "state", "table_id": self.table_id, **update}
+
+    def _publish(self) -> None:
+        tracker = self.tracker
+        update = tracker.get_changes(self._sent_seq) if self.diffs else tracker.snapshot()
+        if update["seq"] == self._sent_seq:
+            return
+        self._sent_seq = update["seq"]
+        message = self._message(update)  # Shared by every subscriber
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind for diffs to be useful, start over from the full state
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._message(tracker.snapshot()))
+
+    async def _next_decision(self, player_id: int) -> tuple:
+        # Waits for a legal decision of `player_id`, None once the timeout expired
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.action_timeout
+        table = self.table
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                sender, choice, amount = await asyncio.wait_for(self.actions.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            # Out-of-turn and illegal actions are dropped
+            if sender == player_id and table.act(choice, amount):
+                return choice, amount
+
+    async def run(self) -> None:
+        '''
+        Plays hands until `max_hands` is reached or fewer than two players have chips, then closes.
+        '''
+        table = self.table
+        rewards = [0] * len(table.game.players)
+        try:
+            if table.start(rewards):
+                self._publish()
+                while True:
+                    if await self._next_decision(table.player.player_id) is None:
+                        self.timeouts += 1
+                        table.act('3' if '3' in table.betting.legal_actions() else '1')
+                    last_hand = self.max_hands is not None and table.hands + 1 >= self.max_hands
+                    ended = table.advance(rewards, deal_next=not last_hand)
+                    self._publish()
+                    if ended and (last_hand or table.finished):
+                        break
+        finally:
+            self.closed = True
+            for queue in self.subscribers:
+                try:
+                    queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+            self.subscribers = []
+
+
+class TableServer:
+    '''
+    Hosts any number of TableActors in one event loop and relays the JSON messages described at the
+    top of this module, over TCP (one JSON object per line, see serve_tcp) or in process (LocalClient).
+    '''
+    def __init__(self):
+        self.tables = {}
+        self._tasks = {}
+        self._ids = itertools.count()
+        self._servers = []
+
+    def add_table(self, table_id: int = None, **kwargs) -> TableActor:
+        '''
+        Creates a table (TableActor arguments) and starts playing it.
+        '''
+        if table_id is None:
+            table_id = next(self._ids)
+            while table_id in self.tables:
+                table_id = next(self._ids)
+        if table_id in self.tables:
+            raise ValueError(f"Table {table_id} already exists")
+        actor = TableActor(table_id, **kwargs)
+        self.tables[table_id] = actor
+        self._tasks[table_id] = asyncio.ensure_future(actor.run())
+        return actor
+
+    async def wait_closed(self) -> None:
+        '''
+        Waits until every table has finished playing.
+        '''
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values())
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def serve_tcp(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        '''
+        Accepts clients speaking newline-delimited JSON. Port 0 picks a free port, read it from
+        server.sockets[0].getsockname().
+        '''
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = _Session(self)
+
+        async def send() -> None:
+            while True:
+                message = await session.outbox.get()
+                writer.write(json.dumps(message).encode() + b'\n')
+                await writer.drain()
+
+        sender = asyncio.ensure_future(send())
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    session._error("Invalid JSON")
+                    continue
+                session.handle(message)
+        finally:
+            session.close()
+            sender.cancel()
+            writer.close()
+
+    def connect_local(self) -> 'LocalClient':
+        return LocalClient(self)
+
+
+class _Session:
+    # One connected client: its outgoing messages and the tables it follows
+    def __init__(self, server: TableServer):
+        self.server = server
+        self.outbox = asyncio.Queue()
+        self.forwarders = {}  # table_id -> (queue, task)
+
+    def _error(self, text: str) -> None:
+        self.outbox.put_nowait({"type": "error", "message": text})
+
+    def handle(self, message) -> None:
+        # Malformed messages get an error reply, the connection stays open
+        if not isinstance(message, dict):
+            self._error("Messages must be JSON objects")
+            return
+        op = message.get("op")
+        table_id = message.get("table_id")
+        actor = self.server.tables.get(table_id) if isinstance(table_id, (int, str)) else None
+        if actor is None:
+            self._error(f"Unknown table {table_id!r}")
+        elif op == "subscribe":
+            if actor.table_id not in self.forwarders:
+                queue = actor.subscribe()
+                self.forwarders[actor.table_id] = (queue, asyncio.ensure_future(self._forward(actor.table_id, queue)))
+        elif op == "unsubscribe":
+            forwarder = self.forwarders.pop(actor.table_id, None)
+            if forwarder is not None:
+                actor.unsubscribe(forwarder[0])
+                forwarder[1].cancel()
+        elif op == "action":
+            try:
+                amount = int(message.get("amount", 0))
+            except (TypeError, ValueError):
+                self._error(f"Invalid amount {message.get('amount')!r}")
+                return
+            actor.submit(message.get("player_id"), str(message.get("choice")), amount)
+        else:
+            self._error(f"Unknown op {op!r}")
+
+    async def _forward(self, table_id: int, queue: asyncio.Queue) -> None:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            self.outbox.put_nowait(message)
+        self.forwarders.pop(table_id, None)
+        self.outbox.put_nowait({"type": "closed", "table_id": table_id})
+
+    def close(self) -> None:
+        for table_id, (queue, task) in self.forwarders.items():
+            actor = self.server.tables.get(table_id)
+            if actor is not None:
+                actor.unsubscribe(queue)
+            task.cancel()
+        self.forwarders = {}
+
+
+class LocalClient:
+    '''
+    In-process stand-in for a network client: same messages as the TCP transport, passed through a
+    JSON round trip so that tests see exactly what a remote client would.
+    '''
+    def __init__(self, server: TableServer):
+        self._session = _Session(server)
+
+    def send(self, message: dict) -> None:
+        self._session.handle(json.loads(json.dumps(message)))
+
+    async def receive(self, timeout: float = None) -> dict:
+        message = await asyncio.wait_for(self._session.outbox.get(), timeout)
+        return json.loads(json.dumps(message))
+
+    def close(self) -> None:
+        self._session.close()
@@ -1,10 +1,15 @@
-from poker_game_engine.game_engine import Game
+import random
+import time
+from poker_game_engine.game_engine import Game, Player
 from poker_game_engine.action_handlers import ActionHandler
-from poker_game_engine.game_logger import GameLogger
+from poker_game_engine.betting import BettingRound
+from poker_game_engine.game_logger import GameLogger, NullGameLogger
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.pots import settle_pots
 
 def get_player_input(player,game_last_bet):
     amount=0
-    choice = input("Enter your choice 1: Fold, 2: Bet, 3: Check, 4: Call ")
+    choice = input("Enter your choice 1: Fold, 2: Bet, 3: Check, 4: Call, 5: All-in ")
     if choice=="2":
         amount = int(input("Enter bet amount: "))
     elif choice == "4":
@@ -12,28 +17,19 @@ def get_player_input(player,game_last_bet):
     return (choice,amount)
    
             
-def handle_betting_round(game, logger, action_handler, nb_players, current_index):
-    new_bet_made = True 
-    
-    while new_bet_made:
-        new_bet_made = False  # Assume no new bets at the start of each pass
-        for _ in range(nb_players):  # Loop through all players
-            player = game.players[current_index]
-            if player.active and (player.phase_bet <= game.last_bet or player.phase_bet == 0):
-                logger.log_info(f"Player {player.player_id}'s turn. Bankroll: {player.bankroll}, Bet to Call: {game.get_max_phase_bet()}")
-                valid_action = False
-                while not valid_action:
-                    choice, amount = get_player_input(player, game.last_bet)
-                    valid_action = action_handler.player_action_input(player, choice, amount)
-                    if valid_action and choice == '2' and player.phase_bet > game.last_bet:
-                        new_bet_made = True  # A new bet or raise has been made
-                        game.last_bet = player.phase_bet  # Update the last highest bet to this new amount
-                        # last_aggressor_index = current_index  # Update the last aggressor
-            current_index = (current_index + 1) % nb_players
-
-        if new_bet_made:
-            # Ensure that the cycle continues until it reaches the player right after the last aggressor
-            new_bet_made = True
+def handle_betting_round(game, logger, action_handler, nb_players, current_index, ai_agent=None):
+    # Players with ai_flag set are played by ai_agent (e.g. mcts.MCTSAgent) when one is given
+    betting = BettingRound(game, action_handler)
+    betting.start(current_index)
+    while not betting.closed:
+        player = betting.player
+        logger.log_info(f"Player {player.player_id}'s turn. Bankroll: {player.bankroll}, Bet to Call: {betting.max_bet}")
+        if ai_agent is not None and player.ai_flag:
+            choice, amount = ai_agent(game, player)
+        else:
+            choice, amount = get_player_input(player, game.last_bet)
+        if not betting.apply(choice, amount):
+            logger.log_warning("Action not allowed. Please choose again.")
 
 
 
@@ -125,6 +121,165 @@ def run_game_simulation():
         game.move_dealer()
 
 
+# Headless simulation ------------------------------------------------------
+# An agent is any callable (game, player) -> (choice, amount), with the same choices as get_player_input:
+# '1': Fold, '2': Bet (amount = chips put in, must raise the current bet), '3': Check, '4': Call
+# (all-in when the bankroll is short), '5': All-in.
+
+def passive_agent(game: Game, player: Player) -> tuple:
+    '''
+    Checks when possible and calls otherwise.
+    '''
+    if player.phase_bet >= game.get_max_phase_bet():
+        return ('3', 0)
+    return ('4', 0)
+
+
+class RandomAgent:
+    '''
+    Seeded agent picking random legal-looking actions, used to drive throughput runs.
+    '''
+    def __init__(self, seed: int = None, fold_rate: float = 0.1, raise_rate: float = 0.15, max_raise: int = 3):
+        self.rng = random.Random(seed)
+        self.fold_rate = fold_rate
+        self.raise_rate = raise_rate
+        self.max_raise = max_raise  # In big blinds
+
+    def __call__(self, game: Game, player: Player) -> tuple:
+        to_call = game.get_max_phase_bet() - player.phase_bet
+        draw = self.rng.random()
+        if draw < self.raise_rate:
+            raise_by = max(game.last_bet, 1) * self.rng.randint(1, self.max_raise)
+            if to_call + raise_by <= player.bankroll:
+                return ('2', to_call + raise_by)
+        if to_call == 0:
+            return ('3', 0)
+        if draw < self.raise_rate + self.fold_rate:
+            return ('1', 0)
+        return ('4', 0)
+
+
+class HeadlessSimulator:
+    '''
+    Plays full hands (blinds, four betting rounds, showdown) without any user input:
+    every decision comes from the agent of the acting seat. Logging is off unless a logger is given.
+    '''
+    def __init__(self, nb_players: int = 4, agents: list = None, seed: int = None, small_blind: int = 10,
+                 big_blind: int = 20, logger: GameLogger = None, evaluator=None, history=None):
+        self.rng = random.Random(seed)
+        self.game = Game(players=nb_players,
+                         evaluator=evaluator if evaluator is not None else LookupHandEvaluator(),
+                         rng=self.rng)
+        self.logger = logger if logger is not None else NullGameLogger(self.game)
+        self.action_handler = ActionHandler(game=self.game,
+                                            logger=self.logger)
+        self.history = history  # Optional HandHistoryWriter recording every hand
+        self.action_handler.recorder = history
+        self.betting = BettingRound(self.game, self.action_handler)
+        if agents is None:
+            agents = [RandomAgent(seed=self.rng.getrandbits(64)) for _ in range(nb_players)]
+        if len(agents) != nb_players:
+            raise ValueError("One agent per player is required")
+        self.agents = agents
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+
+    def _active_count(self) -> int:
+        return sum(1 for p in self.game.players if p.active)
+
+    def _fallback_action(self) -> None:
+        # Invalid decisions turn into a check, a call, or a fold when the call cannot be paid
+        betting = self.betting
+        if not (betting.apply('3') or betting.apply('4')):
+            betting.apply('1')
+
+    def play_betting_round(self, start_index: int) -> None:
+        '''
+        Asks each player who can act for a decision, starting at start_index, until the action closes.
+        '''
+        betting = self.betting
+        agents = self.agents
+        betting.start(start_index)
+        while not betting.closed:
+            choice, amount = agents[betting.current](self.game, betting.player)
+            if not betting.apply(choice, amount):
+                self._fallback_action()
+
+    def play_hand(self) -> dict:
+        '''
+        Plays one full hand, settles the main and side pots and moves the dealer.
+        Returns the players who won chips, the pot and whether it went to showdown.
+        '''
+        game = self.game
+        handler = self.action_handler
+        nb_players = len(game.players)
+        game.start_new_round()
+        self.logger.new_hand()
+        if self.history is not None:
+            self.history.start_hand(game, self.small_blind, self.big_blind)
+
+        handler.post_blind(game.get_small_blind_player(), self.small_blind)
+        handler.post_blind(game.get_big_blind_player(), self.big_blind)
+        for player in game.players:
+            if player.active:
+                handler.handle_deal_card(player)
+                handler.handle_deal_card(player)
+
+        start_index = (game.dealer_index + 3) % nb_players
+        for cards_to_deal in (0, 3, 1, 1):
+            if cards_to_deal:
+                handler.deal_community_cards(cards_to_deal)
+                game.reset_players_phase_bets()
+                start_index = (game.dealer_index + 1) % nb_players
+                self.logger.log_phase()
+            self.play_betting_round(start_index)
+            if self._active_count() == 1:
+                break
+
+        pot = game.pot
+        showdown = self._active_count() > 1
+        self.logger.log_game_state()
+        winners = sorted(settle_pots(game), key=lambda p: p.player_id)
+        if self.history is not None:
+            self.history.end_hand(winners, pot)
+        game.move_dealer()
+        return {"winners": [winner.player_id for winner in winners], "pot": pot, "showdown": showdown}
+
+    def run(self, hands: int) -> dict:
+        '''
+        Plays up to `hands` hands, stopping early when fewer than two players have chips left.
+        Returns aggregate statistics of the run.
+        '''
+        players = self.game.players
+        start_bankrolls = [p.bankroll for p in players]
+        wins = [0] * len(players)
+        hands_played = showdowns = total_pot = 0
+        start = time.perf_counter()
+        for _ in range(hands):
+            if sum(1 for p in players if p.bankroll > 0) < 2:
+                break
+            result = self.play_hand()
+            hands_played += 1
+            showdowns += result["showdown"]
+            total_pot += result["pot"]
+            for player_id in result["winners"]:
+                wins[player_id] += 1
+        elapsed = time.perf_counter() - start
+        return {
+            "hands": hands_played,
+            "showdowns": showdowns,
+            "average_pot": total_pot / hands_played if hands_played else 0,
+            "wins": wins,
+            "bankroll_deltas": [p.bankroll - start for p, start in zip(players, start_bankrolls)],
+            "elapsed": elapsed,
+            "hands_per_second": hands_played / elapsed if elapsed else 0.0,
+        }
+
+
+def run_headless_simulation(nb_players: int = 4, hands: int = 1000, agents: list = None, seed: int = None,
+                            **kwargs) -> dict:
+    return HeadlessSimulator(nb_players=nb_players, agents=agents, seed=seed, **kwargs).run(hands)
 
-run_game_simulation()
 
+if __name__ == '__main__':
+    run_game_simulation()
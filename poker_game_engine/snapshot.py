@@ -0,0 +1,145 @@
+import random
+import struct
+from poker_game_engine.constants import game_phases
+from poker_game_engine.game_engine import Game, HandEvaluator, CARDS
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+
+# Snapshots hold everything needed to resume a table: deck order, RNG state, bets and every player.
+# An ActionHandler only holds references to the game and a logger, so it is rebuilt around the restored game.
+SNAPSHOT_VERSION = 1
+_MAGIC = b'PGS'
+
+_EVALUATORS = [HandEvaluator, LookupHandEvaluator]
+_EVALUATOR_NAMES = [evaluator.__name__ for evaluator in _EVALUATORS]
+
+# magic, version, players, phase, dealer_index, current_player_id, evaluator, community size, deck size,
+# has_rng, pot, last_bet
+_HEADER = struct.Struct('<3sBBBBBBBBBqq')
+# player_id, bankroll, phase_bet, total_game_bet, flags (active, ai_flag), hand size
+_PLAYER = struct.Struct('<HqqqBB')
+# Mersenne Twister state: version, 625 words, has gauss_next, gauss_next
+_RNG = struct.Struct('<B625IBd')
+
+
+def _evaluator_index(game: Game) -> int:
+    try:
+        return _EVALUATORS.index(type(game.evaluator))
+    except ValueError:
+        raise ValueError(f"Cannot snapshot a game using {type(game.evaluator).__name__}") from None
+
+
+def game_to_dict(game: Game, include_rng: bool = True) -> dict:
+    '''
+    Lossless snapshot made of plain ints, strings, booleans and lists, ready for json/orjson.
+    Cards are stored as their integer codes, the deck in its internal order.
+    '''
+    return {
+        "version": SNAPSHOT_VERSION,
+        "evaluator": _EVALUATOR_NAMES[_evaluator_index(game)],
+        "dealer_index": game.dealer_index,
+        "current_player_id": game.current_player_id,
+        "phase": game.phase,
+        "pot": game.pot,
+        "last_bet": game.last_bet,
+        "community_cards": [card.code for card in game.community_cards],
+        "deck": [card.code for card in game.deck.cards],
+        "players": [{
+            "player_id": player.player_id,
+            "bankroll": player.bankroll,
+            "hand": [card.code for card in player.hand],
+            "active": player.active,
+            "phase_bet": player.phase_bet,
+            "total_game_bet": player.total_game_bet,
+            "ai_flag": player.ai_flag,
+        } for player in game.players],
+        "rng_state": _rng_state_to_list(game.rng) if include_rng else None,
+    }
+
+
+def game_from_dict(data: dict) -> Game:
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+    evaluator = _EVALUATORS[_EVALUATOR_NAMES.index(data["evaluator"])]()
+    game = Game(players=len(data["players"]), evaluator=evaluator)
+    game.dealer_index = data["dealer_index"]
+    game.current_player_id = data["current_player_id"]
+    game.phase = data["phase"]
+    game.pot = data["pot"]
+    game.last_bet = data["last_bet"]
+    game.community_cards = [CARDS[code] for code in data["community_cards"]]
+    game.deck.cards[:] = [CARDS[code] for code in data["deck"]]
+    for player, entry in zip(game.players, data["players"]):
+        player.player_id = entry["player_id"]
+        player.bankroll = entry["bankroll"]
+        player.hand = [CARDS[code] for code in entry["hand"]]
+        player.active = entry["active"]
+        player.phase_bet = entry["phase_bet"]
+        player.total_game_bet = entry["total_game_bet"]
+        player.ai_flag = entry["ai_flag"]
+    if data.get("rng_state") is not None:
+        _rng_state_from_list(game.rng, data["rng_state"])
+    return game
+
+
+def game_to_bytes(game: Game, include_rng: bool = True) -> bytes:
+    '''
+    Compact binary snapshot: a fixed header, card codes as single bytes, one fixed-size record per
+    player and, optionally, the 2.5kB Mersenne Twister state of the game's RNG.
+    '''
+    community = bytes(card.code for card in game.community_cards)
+    deck = bytes(card.code for card in game.deck.cards)
+    parts = [_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, len(game.players), game_phases.index(game.phase),
+                          game.dealer_index, game.current_player_id, _evaluator_index(game),
+                          len(community), len(deck), include_rng, game.pot, game.last_bet),
+             community, deck]
+    for player in game.players:
+        parts.append(_PLAYER.pack(player.player_id, player.bankroll, player.phase_bet, player.total_game_bet,
+                                  player.active | (player.ai_flag << 1), len(player.hand)))
+        parts.append(bytes(card.code for card in player.hand))
+    if include_rng:
+        version, words, gauss_next = game.rng.getstate()
+        parts.append(_RNG.pack(version, *words, gauss_next is not None, gauss_next or 0.0))
+    return b''.join(parts)
+
+
+def game_from_bytes(data: bytes) -> Game:
+    (magic, version, nb_players, phase, dealer_index, current_player_id, evaluator,
+     nb_community, nb_deck, has_rng, pot, last_bet) = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("Not a supported game snapshot")
+    game = Game(players=nb_players, evaluator=_EVALUATORS[evaluator]())
+    game.phase = game_phases[phase]
+    game.dealer_index = dealer_index
+    game.current_player_id = current_player_id
+    game.pot = pot
+    game.last_bet = last_bet
+
+    offset = _HEADER.size
+    game.community_cards = [CARDS[code] for code in data[offset:offset + nb_community]]
+    offset += nb_community
+    game.deck.cards[:] = [CARDS[code] for code in data[offset:offset + nb_deck]]
+    offset += nb_deck
+    for player in game.players:
+        player_id, bankroll, phase_bet, total_game_bet, flags, nb_hand = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        player.player_id = player_id
+        player.bankroll = bankroll
+        player.phase_bet = phase_bet
+        player.total_game_bet = total_game_bet
+        player.active = bool(flags & 1)
+        player.ai_flag = bool(flags & 2)
+        player.hand = [CARDS[code] for code in data[offset:offset + nb_hand]]
+        offset += nb_hand
+    if has_rng:
+        state = _RNG.unpack_from(data, offset)
+        game.rng.setstate((state[0], state[1:626], state[627] if state[626] else None))
+    return game
+
+
+def _rng_state_to_list(rng: random.Random) -> list:
+    version, words, gauss_next = rng.getstate()
+    return [version, list(words), gauss_next]
+
+
+def _rng_state_from_list(rng: random.Random, state: list) -> None:
+    rng.setstate((state[0], tuple(state[1]), state[2]))
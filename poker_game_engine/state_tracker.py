@@ -0,0 +1,115 @@
+from collections import deque
+from poker_game_engine.game_engine import Game
+
+_GAME_FIELDS = ("pot", "current_player_id", "phase", "last_bet")
+_PLAYER_FIELDS = ("bankroll", "active", "round_bet", "ai_flag")
+
+
+class StateTracker:
+    '''
+    Versioned view of a game's state for real-time clients.
+    Each commit compares a cheap tuple capture of the game with the previous one and records only the
+    fields that changed under a new sequence number. Clients ask for the changes since the last sequence
+    number they saw, and get a full snapshot when they are too far behind (or reconnecting).
+    '''
+    def __init__(self, game: Game, history: int = 256):
+        self.game = game
+        self.seq = 0
+        self._changes = deque(maxlen=history)  # (seq, changes) pairs, oldest first
+        self._last = self._capture()
+        self._snapshot = None  # Full state cached for the current seq
+        self._merged = {}  # since -> merged changes, for the current seq
+
+    def _capture(self) -> tuple:
+        game = self.game
+        # Cards are captured as bit masks: a new hand dealt between two commits changes them even when
+        # the card counts are the same
+        players = tuple((p.bankroll, p.active, p.phase_bet, p.ai_flag, p.hand_mask) for p in game.players)
+        return (game.pot, game.current_player_id, game.phase, game.last_bet, game.community_mask, players)
+
+    def commit(self) -> int:
+        '''
+        Records what changed since the previous commit and returns the current sequence number,
+        which only moves when something changed.
+        '''
+        capture = self._capture()
+        last = self._last
+        if capture == last:
+            return self.seq
+
+        game = self.game
+        changes = {field: capture[index] for index, field in enumerate(_GAME_FIELDS) if capture[index] != last[index]}
+        if capture[4] != last[4]:
+            changes["community_cards"] = [card.name for card in game.community_cards]
+        if capture[5] != last[5]:
+            players = {}
+            for player, new, old in zip(game.players, capture[5], last[5]):
+                if new == old:
+                    continue
+                entry = {field: new[index] for index, field in enumerate(_PLAYER_FIELDS) if new[index] != old[index]}
+                if new[4] != old[4]:
+                    entry["hand"] = [card.name for card in player.hand]
+                players[player.player_id] = entry
+            changes["players"] = players
+
+        self.seq += 1
+        self._changes.append((self.seq, changes))
+        self._last = capture
+        self._snapshot = None
+        self._merged = {}
+        return self.seq
+
+    def snapshot(self) -> dict:
+        '''
+        Full state at the current sequence number, built once per sequence number.
+        '''
+        self.commit()
+        if self._snapshot is None:
+            self._snapshot = {"seq": self.seq, "full": True, "state": self.game.get_game_state()}
+        return self._snapshot
+
+    def get_changes(self, since: int) -> dict:
+        '''
+        Returns {"seq", "full": False, "changes"} holding everything that changed after `since`,
+        or a full snapshot when `since` is older than the kept history or unknown.
+        '''
+        seq = self.commit()
+        if since == seq:
+            return {"seq": seq, "full": False, "changes": {}}
+        if since > seq or since < 0 or not self._changes or since < self._changes[0][0] - 1:
+            return self.snapshot()
+        merged = self._merged.get(since)
+        if merged is None:
+            merged = {"seq": seq, "full": False, "changes": self._merge(since)}
+            self._merged[since] = merged
+        return merged
+
+    def _merge(self, since: int) -> dict:
+        merged = {}
+        for seq, changes in self._changes:
+            if seq <= since:
+                continue
+            for key, value in changes.items():
+                if key == "players":
+                    players = merged.setdefault("players", {})
+                    for player_id, entry in value.items():
+                        players.setdefault(player_id, {}).update(entry)
+                else:
+                    merged[key] = value
+        return merged
+
+
+def apply_changes(state: dict, changes: dict) -> dict:
+    '''
+    Client-side helper: applies the changes returned by StateTracker.get_changes to a state dict
+    shaped like Game.get_game_state, in place. Player ids may be strings, as JSON object keys are once
+    the changes went through a JSON transport.
+    '''
+    for key, value in changes.items():
+        if key == "players":
+            by_id = {player["player_id"]: player for player in state["players"]}
+            for player_id, entry in value.items():
+                by_id[int(player_id)].update(entry)
+        else:
+            state[key] = value
+    return state
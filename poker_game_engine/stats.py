@@ -0,0 +1,117 @@
+from poker_game_engine.columnar import iter_chunks
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the same statistics are computed with plain loops
+    np = None
+
+_VOLUNTARY = (2, 4, 5)  # Bet, call, all-in: chips put in by choice
+_PREFLOP = 0
+
+
+class PlayerStats:
+    '''
+    Accumulates per-player statistics over chunks of ColumnarExporter columns (see add()), with
+    vectorized NumPy operations when available. Every chunk must hold whole hands, as exported chunks do.
+    result() reports, per player id: hands, VPIP and PFR (share of hands with a voluntary pre-flop
+    bet, call or all-in, and with a pre-flop raise), showdowns, showdown win rate and bb/100.
+    '''
+    def __init__(self):
+        self.totals = {}  # player_id -> [hands, vpip, pfr, showdowns, showdown wins, net in big blinds]
+
+    def _accumulate(self, counters: list) -> None:
+        # counters: one sequence per entry of the totals, indexed by player id
+        for player_id in range(len(counters[0])):
+            if not counters[0][player_id]:
+                continue
+            totals = self.totals.setdefault(player_id, [0, 0, 0, 0, 0, 0.0])
+            for index, values in enumerate(counters):
+                totals[index] += values[player_id]
+
+    def add(self, actions: dict, hands: dict) -> None:
+        if np is not None:
+            self._add_vectorized(actions, hands)
+        else:
+            self._add_loops(actions, hands)
+
+    def _add_vectorized(self, actions: dict, hands: dict) -> None:
+        player_ids = np.asarray(hands["player_id"], dtype=np.int64)
+        if not len(player_ids):
+            return
+        size = int(player_ids.max()) + 1
+        action_players = np.asarray(actions["player_id"], dtype=np.int64)
+        if len(action_players):
+            size = max(size, int(action_players.max()) + 1)
+        hand_ids = np.asarray(actions["hand_id"], dtype=np.int64)
+        preflop = np.asarray(actions["street"]) == _PREFLOP
+
+        def per_hand(mask) -> np.ndarray:
+            # Number of hands where each player did something at least once
+            keys = np.unique(hand_ids[mask] * size + action_players[mask])
+            return np.bincount(keys % size, minlength=size)
+
+        showdown = np.asarray(hands["showdown"], dtype=bool)
+        won = np.asarray(hands["won"], dtype=bool)
+        net = np.asarray(hands["net"], dtype=np.float64) / np.asarray(hands["big_blind"], dtype=np.float64)
+        self._accumulate([
+            np.bincount(player_ids, minlength=size).tolist(),
+            per_hand(preflop & np.isin(np.asarray(actions["action"]), _VOLUNTARY)).tolist(),
+            per_hand(preflop & (np.asarray(actions["is_raise"]) != 0)).tolist(),
+            np.bincount(player_ids, weights=showdown, minlength=size).astype(np.int64).tolist(),
+            np.bincount(player_ids, weights=showdown & won, minlength=size).astype(np.int64).tolist(),
+            np.bincount(player_ids, weights=net, minlength=size).tolist(),
+        ])
+
+    def _add_loops(self, actions: dict, hands: dict) -> None:
+        player_ids = hands["player_id"]
+        if not len(player_ids):
+            return
+        size = max(max(player_ids), max(actions["player_id"], default=0)) + 1
+        counters = [[0] * size for _ in range(5)] + [[0.0] * size]
+        vpip = set()
+        pfr = set()
+        for hand_id, street, player_id, action, is_raise in zip(actions["hand_id"], actions["street"],
+                                                                actions["player_id"], actions["action"],
+                                                                actions["is_raise"]):
+            if street == _PREFLOP:
+                if action in _VOLUNTARY:
+                    vpip.add((hand_id, player_id))
+                if is_raise:
+                    pfr.add((hand_id, player_id))
+        for _, player_id in vpip:
+            counters[1][player_id] += 1
+        for _, player_id in pfr:
+            counters[2][player_id] += 1
+        for player_id, big_blind, net, showdown, won in zip(player_ids, hands["big_blind"], hands["net"],
+                                                            hands["showdown"], hands["won"]):
+            counters[0][player_id] += 1
+            if showdown:
+                counters[3][player_id] += 1
+                if won:
+                    counters[4][player_id] += 1
+            counters[5][player_id] += float(net) / float(big_blind)
+        self._accumulate(counters)
+
+    def result(self) -> dict:
+        stats = {}
+        for player_id, (hands, vpip, pfr, showdowns, showdown_wins, net) in sorted(self.totals.items()):
+            stats[player_id] = {
+                "hands": hands,
+                "vpip": vpip / hands,
+                "pfr": pfr / hands,
+                "showdowns": showdowns,
+                "showdown_win_rate": showdown_wins / showdowns if showdowns else 0.0,
+                "bb_per_100": 100 * net / hands,
+            }
+        return stats
+
+
+def player_stats(directory: str, prefix: str = 'hands') -> dict:
+    '''
+    Statistics of every player over all the chunks exported to `directory` (see PlayerStats).
+    Chunks are read one at a time.
+    '''
+    stats = PlayerStats()
+    for actions, hands in iter_chunks(directory, prefix):
+        stats.add(actions, hands)
+    return stats.result()
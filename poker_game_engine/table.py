@@ -0,0 +1,137 @@
+from poker_game_engine.constants import street_cards
+from poker_game_engine.game_engine import Game, Player
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.betting import BettingRound
+from poker_game_engine.game_logger import GameLogger, NullGameLogger
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.pots import settle_pots
+
+
+
+class Table:
+    '''
+    Deals hands one decision at a time, for callers that get actions from outside (learning
+    environments, network clients): start() deals a hand and plays it up to the first decision,
+    act() plays the decision of the current player, advance() deals the streets whose betting is
+    closed and settles the hand once it is over.
+
+    With `rebuy`, every seat gets `starting_bankroll` again when fewer than two players have chips;
+    otherwise the table is `finished` at that point.
+    '''
+    __slots__ = ('game', 'handler', 'betting', 'street', 'small_blind', 'big_blind', 'starting_bankroll',
+                 'rebuy', 'finished', 'hand_bankrolls', 'hands')
+
+    def __init__(self, nb_players: int, seed: int = None, small_blind: int = 10, big_blind: int = 20,
+                 starting_bankroll: int = 1000, rebuy: bool = True, logger: GameLogger = None):
+        self.game = Game(players=nb_players, evaluator=LookupHandEvaluator(), seed=seed)
+        for player in self.game.players:
+            player.bankroll = starting_bankroll
+        self.handler = ActionHandler(game=self.game,
+                                     logger=logger if logger is not None else NullGameLogger(self.game))
+        self.betting = BettingRound(self.game, self.handler)
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.starting_bankroll = starting_bankroll
+        self.rebuy = rebuy
+        self.finished = False
+        self.street = 0
+        self.hand_bankrolls = None
+        self.hands = 0
+
+    @property
+    def player(self) -> Player:
+        # Player to act
+        return self.betting.player
+
+    def start(self, rewards: list) -> bool:
+        '''
+        Deals hands until one needs a decision. Chips won or lost in hands that ended on their own
+        (e.g. blinds all-in) are added to `rewards`, one entry per seat.
+        Returns False when the table is finished. A hand still in progress is cancelled first (abort_hand).
+        '''
+        game = self.game
+        handler = self.handler
+        self.abort_hand()
+        while True:
+            players = game.players
+            if sum(1 for p in players if p.bankroll > 0) < 2:
+                if not self.rebuy:
+                    self.finished = True
+                    return False
+                # Episode over, everyone gets a fresh stack
+                for player in players:
+                    player.bankroll = self.starting_bankroll
+            self.hand_bankrolls = [p.bankroll for p in players]
+            game.start_new_round()
+            handler.post_blind(game.get_small_blind_player(), self.small_blind)
+            handler.post_blind(game.get_big_blind_player(), self.big_blind)
+            for player in players:
+                if player.active:
+                    handler.handle_deal_card(player)
+                    handler.handle_deal_card(player)
+            self.street = 0
+            self.betting.start((game.dealer_index + 3) % len(players))
+            if not self.deal_streets():
+                return True
+            self._finish(rewards)
+
+    def abort_hand(self) -> None:
+        '''
+        Cancels the hand in progress, if any: every player gets back the chips put in the pot.
+        Settled hands leave an empty pot, there is nothing to give back then.
+        '''
+        game = self.game
+        if not game.pot:
+            return
+        for player in game.players:
+            player.bankroll += player.total_game_bet
+            player.total_game_bet = 0
+            player.phase_bet = 0
+        game.pot = 0
+
+    def deal_streets(self) -> bool:
+        '''
+        Deals the next streets while their betting is already closed (with Game.deal_street, so they
+        can be undone). Returns True once the hand is over, to be settled.
+        '''
+        betting = self.betting
+        game = self.game
+        while betting.closed:
+            if betting.live <= 1 or self.street == len(street_cards):
+                return True
+            game.deal_street(street_cards[self.street])
+            self.street += 1
+            betting.start((game.dealer_index + 1) % len(game.players))
+        return False
+
+    def _finish(self, rewards: list) -> None:
+        game = self.game
+        settle_pots(game)
+        for seat, (player, before) in enumerate(zip(game.players, self.hand_bankrolls)):
+            rewards[seat] += player.bankroll - before
+        game.move_dealer()
+        self.hands += 1
+
+    def act(self, choice: str, amount: int = 0) -> bool:
+        '''
+        Plays `choice` for the current player. Returns False, changing nothing, when it is not legal.
+        '''
+        return self.betting.apply(choice, amount)
+
+    def default_action(self) -> None:
+        # Played for invalid or missing decisions: a check, a call, or a fold when nothing else works
+        betting = self.betting
+        if not (betting.apply('3') or betting.apply('4')):
+            betting.apply('1')
+
+    def advance(self, rewards: list, deal_next: bool = True) -> bool:
+        '''
+        Moves on after a decision. When the hand is over, it is settled (chip changes added to
+        `rewards`) and, with `deal_next`, the next one is dealt. Returns True when a hand ended.
+        '''
+        if not self.deal_streets():
+            return False
+        self._finish(rewards)
+        if deal_next:
+            self.start(rewards)
+        return True
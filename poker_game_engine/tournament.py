@@ -0,0 +1,129 @@
+import random
+from poker_game_engine.lookup_evaluator import get_tables
+from poker_game_engine.simulator import HeadlessSimulator, RandomAgent
+
+
+def play_table(table_id: int, player_ids: list, bankrolls: list, hands: int, seed: int,
+               small_blind: int = 10, big_blind: int = 20, agent_factory=RandomAgent) -> dict:
+    '''
+    Plays `hands` headless hands at one table and reports what changed. Runs inside pool workers,
+    so every argument must be picklable (agent_factory is called with a seed for each seat).
+    '''
+    rng = random.Random(seed)
+    agents = [agent_factory(rng.getrandbits(64)) for _ in player_ids]
+    simulator = HeadlessSimulator(nb_players=len(player_ids), agents=agents, seed=rng.getrandbits(64),
+                                  small_blind=small_blind, big_blind=big_blind)
+    for player, bankroll in zip(simulator.game.players, bankrolls):
+        player.bankroll = bankroll
+    stats = simulator.run(hands)
+    return {
+        "table_id": table_id,
+        "player_ids": list(player_ids),
+        "bankroll_deltas": stats["bankroll_deltas"],
+        "hands": stats["hands"],
+        "showdowns": stats["showdowns"],
+    }
+
+
+def balance_tables(tables: list, bankrolls: dict, table_size: int) -> list:
+    '''
+    Removes busted players (bankroll 0), breaks the tables that are no longer needed and moves players
+    so that table sizes differ by at most one. Returns the new list of tables (lists of player ids).
+    '''
+    tables = [[pid for pid in table if bankrolls[pid] > 0] for table in tables]
+    alive = sum(len(table) for table in tables)
+    needed = max(-(-alive // table_size), 1) if alive else 0
+
+    # Break the smallest tables first, their players are seated at the remaining ones
+    tables.sort(key=len, reverse=True)
+    broken = [pid for table in tables[needed:] for pid in table]
+    tables = tables[:needed]
+    tables += [[] for _ in range(needed - len(tables))]
+    for pid in broken:
+        min(tables, key=len).append(pid)
+
+    while tables:
+        largest = max(tables, key=len)
+        smallest = min(tables, key=len)
+        if len(largest) - len(smallest) <= 1:
+            break
+        smallest.append(largest.pop())
+    return tables
+
+
+class MultiTableRunner:
+    '''
+    Runs many independent tables across a process pool. Play is organised in levels: every table plays
+    `hands_per_level` hands in a worker with its own seeded RNG, results stream back to the parent as
+    tables finish, then busted players leave and the tables are rebalanced before the next level.
+    '''
+    def __init__(self, nb_players: int, table_size: int = 6, starting_bankroll: int = 1000,
+                 hands_per_level: int = 50, seed: int = None, workers: int = None,
+                 small_blind: int = 10, big_blind: int = 20, agent_factory=RandomAgent):
+        if nb_players < 2:
+            raise ValueError("A tournament needs at least two players")
+        self.rng = random.Random(seed)
+        self.table_size = table_size
+        self.hands_per_level = hands_per_level
+        self.workers = workers
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.agent_factory = agent_factory
+        self.bankrolls = {pid: starting_bankroll for pid in range(nb_players)}
+        self.tables = balance_tables([list(range(nb_players))], self.bankrolls, table_size)
+        self.level = 0
+        self.hands_played = 0
+        self.showdowns = 0
+
+    def remaining_players(self) -> list:
+        return [pid for pid, bankroll in self.bankrolls.items() if bankroll > 0]
+
+    def _level_tasks(self) -> list:
+        return [(table_id, table, [self.bankrolls[pid] for pid in table], self.hands_per_level,
+                 self.rng.getrandbits(64), self.small_blind, self.big_blind, self.agent_factory)
+                for table_id, table in enumerate(self.tables) if len(table) > 1]
+
+    def _record(self, result: dict) -> dict:
+        for pid, delta in zip(result["player_ids"], result["bankroll_deltas"]):
+            self.bankrolls[pid] += delta
+        self.hands_played += result["hands"]
+        self.showdowns += result["showdowns"]
+        result["level"] = self.level
+        return result
+
+    def run(self, max_levels: int = None):
+        '''
+        Generator yielding one result dict per table and level as soon as it is available,
+        until one player holds every chip or `max_levels` levels have been played.
+        '''
+        get_tables()  # Built once here, so forked workers inherit the evaluator tables
+        executor = None
+        if self.workers != 1:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while len(self.remaining_players()) > 1 and (max_levels is None or self.level < max_levels):
+                tasks = self._level_tasks()
+                if executor is None:
+                    for task in tasks:
+                        yield self._record(play_table(*task))
+                else:
+                    futures = [executor.submit(play_table, *task) for task in tasks]
+                    for future in as_completed(futures):
+                        yield self._record(future.result())
+                self.level += 1
+                self.tables = balance_tables(self.tables, self.bankrolls, self.table_size)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def run_to_completion(self, max_levels: int = None) -> dict:
+        for _ in self.run(max_levels):
+            pass
+        return {
+            "levels": self.level,
+            "hands": self.hands_played,
+            "showdowns": self.showdowns,
+            "remaining_players": self.remaining_players(),
+            "bankrolls": dict(self.bankrolls),
+        }
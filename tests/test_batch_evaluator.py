@@ -0,0 +1,40 @@
+import random
+import unittest
+from poker_game_engine.batch_evaluator import evaluate_batch, determine_winners_batch
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+
+
+def to_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = LookupHandEvaluator()
+        self.rng = random.Random(7)
+
+    def test_matches_lookup_evaluator(self):
+        for size in (5, 6, 7):
+            hands = [self.rng.sample(range(52), size) for _ in range(2000)]
+            expected = [self.evaluator.evaluate_codes(hand) for hand in hands]
+            self.assertEqual(to_list(evaluate_batch(hands)), expected)
+
+    def test_determine_winners_batch(self):
+        # Table 0: aces beat kings. Table 1: both players play the board straight and split
+        hole_cards = [[[48, 49], [44, 45]],
+                      [[0, 5], [1, 4]]]
+        boards = [[8, 13, 30, 38, 2],
+                  [16, 21, 26, 31, 34]]
+        strengths, winners = determine_winners_batch(hole_cards, boards)
+        self.assertEqual(to_list(winners), [[True, False], [True, True]])
+        self.assertGreater(to_list(strengths)[0][0], to_list(strengths)[0][1])
+
+    def test_inactive_players_cannot_win(self):
+        hole_cards = [[[48, 49], [44, 45]]]
+        boards = [[8, 13, 30, 38, 2]]
+        strengths, winners = determine_winners_batch(hole_cards, boards, active=[[False, True]])
+        self.assertEqual(to_list(winners), [[False, True]])
+        self.assertEqual(to_list(strengths)[0][0], -1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from poker_game_engine.benchmark import BENCHMARKS, CALIBRATION, compare, main, run_benchmarks, save_results
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        results = run_benchmarks(min_time=0.0005, repeat=1)
+        self.assertEqual(set(results), set(BENCHMARKS))
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+    def test_compare_flags_regressions_past_the_threshold(self):
+        baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+        results = {"a": 1.2, "b": 1.5}
+        self.assertEqual([name for name, *_ in compare(results, baseline, threshold=0.25)], ["b"])
+
+    def test_compare_is_relative_to_the_calibration(self):
+        # Everything twice as slow, machine included: no regression
+        baseline = {CALIBRATION: 1.0, "a": 1.0}
+        self.assertEqual(compare({CALIBRATION: 2.0, "a": 2.0}, baseline), [])
+        self.assertEqual(len(compare({CALIBRATION: 1.0, "a": 2.0}, baseline)), 1)
+
+    def test_compare_command_exit_code(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            arguments = ['--only', 'deck_shuffle', '--min-time', '0.0005', '--repeat', '1']
+            save_results(path, {"deck_shuffle": 1e-12})
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main(['compare', path] + arguments), 1)
+            self.assertIn("REGRESSION deck_shuffle", output.getvalue())
+            save_results(path, {"deck_shuffle": 1.0})
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['compare', path] + arguments), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.betting import BettingRound
+
+
+class TestBettingRound(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(players=4)
+        self.handler = ActionHandler(game=self.game, logger=NullGameLogger(self.game))
+        self.game.start_new_round()
+        self.handler.post_blind(self.game.get_small_blind_player(), 10)
+        self.handler.post_blind(self.game.get_big_blind_player(), 20)
+        self.betting = BettingRound(self.game, self.handler)
+        self.betting.start((self.game.dealer_index + 3) % 4)
+
+    def test_preflop_starts_after_the_big_blind(self):
+        self.assertEqual(self.betting.current, 3)
+        self.assertEqual(self.betting.max_bet, 20)
+        self.assertEqual(self.betting.to_call, 20)
+        self.assertEqual(self.betting.legal_actions(), ('1', '2', '4', '5'))
+
+    def test_round_closes_when_everyone_called(self):
+        betting = self.betting
+        for choice in ('4', '4', '4'):
+            self.assertTrue(betting.apply(choice))
+        # The big blind still has the option
+        self.assertFalse(betting.closed)
+        self.assertEqual(betting.current, 2)
+        self.assertEqual(betting.legal_actions(), ('1', '2', '3', '5'))
+        self.assertTrue(betting.apply('3'))
+        self.assertTrue(betting.closed)
+        self.assertEqual(betting.legal_actions(), ())
+        self.assertEqual(self.game.pot, 80)
+
+    def test_raise_reopens_the_action(self):
+        betting = self.betting
+        self.assertTrue(betting.apply('4'))  # Seat 3 calls
+        self.assertTrue(betting.apply('2', 60))  # Seat 0 raises to 60
+        self.assertEqual(betting.last_aggressor, 0)
+        self.assertEqual(betting.max_bet, 60)
+        self.assertEqual(betting.to_act, 3)
+        for _ in range(3):
+            self.assertTrue(betting.apply('4'))
+        self.assertTrue(betting.closed)
+        self.assertEqual(self.game.pot, 240)
+
+    def test_illegal_actions_leave_the_round_unchanged(self):
+        betting = self.betting
+        self.assertFalse(betting.apply('3'))  # Cannot check facing the big blind
+        self.assertFalse(betting.apply('2', 10))  # A bet has to raise
+        self.assertFalse(betting.apply('9'))
+        self.assertEqual(betting.current, 3)
+        self.assertEqual(betting.to_act, 4)
+
+    def test_folds_close_the_round(self):
+        betting = self.betting
+        for _ in range(3):
+            self.assertTrue(betting.apply('1'))
+        self.assertTrue(betting.closed)
+        self.assertEqual(betting.live, 1)
+
+    def test_all_in_players_are_skipped(self):
+        betting = self.betting
+        self.assertTrue(betting.apply('5'))  # Seat 3 all-in for 1000
+        self.assertEqual(betting.to_act, 3)
+        self.assertTrue(betting.apply('4'))  # Seat 0 calls all-in
+        self.assertTrue(betting.apply('1'))
+        self.assertTrue(betting.apply('1'))
+        self.assertTrue(betting.closed)
+        # Next street: nobody left with chips, nothing to play
+        self.game.reset_players_phase_bets()
+        betting.start(1)
+        self.assertTrue(betting.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
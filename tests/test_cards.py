@@ -0,0 +1,69 @@
+import copy
+import pickle
+import unittest
+from poker_game_engine.game_engine import Card, CARDS, Deck, Game, Player, cards_to_mask
+
+
+class TestCards(unittest.TestCase):
+
+    def test_cards_are_interned(self):
+        self.assertIs(Card('Hearts', '10'), Card('Hearts', '10'))
+        self.assertIs(copy.deepcopy(Card('Spades', 'A')), Card('Spades', 'A'))
+        self.assertIs(pickle.loads(pickle.dumps(Card('Clubs', '2'))), Card('Clubs', '2'))
+
+    def test_integer_encoding(self):
+        card = Card('Diamonds', 'K')
+        self.assertEqual(card.code, 11 * 4 + 1)
+        self.assertEqual(card.rank, 13)
+        self.assertIs(Card.from_code(card.code), card)
+        self.assertEqual(str(card), "K of Diamonds")
+        self.assertEqual([c.code for c in CARDS], list(range(52)))
+
+    def test_unknown_card(self):
+        with self.assertRaises(ValueError):
+            Card('Stars', '7')
+
+    def test_deck_deals_each_card_once(self):
+        deck = Deck()
+        dealt = [deck.deal() for _ in range(52)]
+        self.assertEqual(cards_to_mask(dealt), (1 << 52) - 1)
+        with self.assertRaises(ValueError):
+            deck.deal()
+
+    def test_seeded_decks_are_reproducible(self):
+        self.assertEqual(Deck(seed=5).deal_order(), Deck(seed=5).deal_order())
+        self.assertNotEqual(Deck(seed=5).deal_order(), Deck(seed=6).deal_order())
+
+    def test_reset_reuses_card_list(self):
+        deck = Deck(seed=1)
+        cards = deck.cards
+        for _ in range(10):
+            deck.deal()
+        deck.reset()
+        self.assertIs(deck.cards, cards)
+        self.assertEqual(len(deck.cards), 52)
+        self.assertEqual(cards_to_mask(deck.cards), (1 << 52) - 1)
+
+    def test_fixed_order(self):
+        order = [Card('Spades', 'A'), Card('Hearts', '2'), 7]
+        deck = Deck(seed=1, order=order)
+        self.assertEqual([deck.deal() for _ in range(3)], [Card('Spades', 'A'), Card('Hearts', '2'), CARDS[7]])
+        self.assertEqual(len(deck.cards), 49)
+
+    def test_game_replays_deck_order(self):
+        game = Game(players=2, seed=3)
+        game.start_new_round()
+        order = game.deck.deal_order()
+        replay = Game(players=2)
+        replay.start_new_round(deck_order=order)
+        self.assertEqual(replay.deck.deal_order(), order)
+        self.assertEqual(Game(players=2, seed=3).deck.deal_order(), Game(players=2, seed=3).deck.deal_order())
+
+    def test_hand_mask(self):
+        player = Player(0, 1000)
+        player.add_card(Card('Hearts', '2'))
+        player.add_card(Card('Spades', 'A'))
+        self.assertEqual(player.hand_mask, (1 << 0) | (1 << 51))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from poker_game_engine.betting import CALL, FOLD
+from poker_game_engine.cfr import CFRSolver, info_set_key, strength_bucket
+from poker_game_engine.equity_cache import preflop_class
+from poker_game_engine.game_engine import Card, HandEvaluator
+from poker_game_engine.snapshot import game_to_dict
+
+
+class TestCFRSolver(unittest.TestCase):
+    def test_strength_buckets_follow_hand_value(self):
+        evaluator = HandEvaluator()
+        high_card = evaluator.hand_strength([Card('Hearts', '2'), Card('Diamonds', '3'), Card('Clubs', '4'),
+                                             Card('Spades', '5'), Card('Hearts', '7')])
+        royal = evaluator.hand_strength([Card('Hearts', '10'), Card('Hearts', 'J'), Card('Hearts', 'Q'),
+                                         Card('Hearts', 'K'), Card('Hearts', 'A')])
+        self.assertEqual(strength_bucket(high_card, 10), 0)
+        self.assertEqual(strength_bucket(royal, 10), 9)
+
+    def test_walk_restores_the_table(self):
+        solver = CFRSolver(stack=40, bet_sizes=(1.0,), seed=1)
+        solver.iterate()
+        before = game_to_dict(solver.table.game)
+        for traverser in range(2):
+            solver._traverse(traverser, 0, 0)
+        self.assertEqual(game_to_dict(solver.table.game), before)
+
+    def test_rows_are_distributions(self):
+        solver = CFRSolver(stack=40, seed=2)
+        solver.train(200)
+        self.assertEqual(len(solver.regrets), len(solver.strategy_sums))
+        for key in list(solver.index)[:200]:
+            strategy = solver.average_strategy(key)
+            self.assertAlmostEqual(sum(strategy), 1.0)
+            self.assertTrue(all(probability >= 0.0 for probability in strategy))
+
+    def test_push_fold_calls_aces(self):
+        # 5 big blinds, all-in or fold: the big blind calls a shove with aces and mostly folds seven-deuce
+        solver = CFRSolver(stack=10, bet_sizes=(), max_raises=1, seed=3)
+        solver.train(4000)
+        shove = solver.all_in
+        aces = info_set_key(shove, preflop_class((48, 49)), 0, 2)
+        seven_deuce = info_set_key(shove, preflop_class((20, 1)), 0, 2)
+        self.assertGreater(solver.average_strategy(aces)[CALL], 0.8)
+        self.assertGreater(solver.average_strategy(seven_deuce)[FOLD], 0.5)
+
+    def test_checkpoint_round_trip(self):
+        solver = CFRSolver(stack=40, seed=4)
+        solver.train(100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solver.cfr')
+            solver.save(path)
+            loaded = CFRSolver.load(path)
+        self.assertEqual(loaded.config, solver.config)
+        self.assertEqual(loaded.iterations, 100)
+        self.assertEqual(loaded.index, solver.index)
+        self.assertEqual(loaded.regrets, solver.regrets)
+        self.assertEqual(loaded.strategy_sums, solver.strategy_sums)
+        loaded.train(10)
+        self.assertEqual(loaded.iterations, 110)
+
+    def test_parallel_training_merges_workers(self):
+        solver = CFRSolver(stack=40, seed=5)
+        solver.train(50)
+        known = dict(solver.index)
+        solver.train(100, workers=2, sync_every=50)
+        self.assertEqual(solver.iterations, 150)
+        for key, entry in known.items():
+            self.assertEqual(solver.index[key], entry)
+        self.assertGreater(len(solver.index), len(known))
+        visits = sum(solver.strategy_sums)
+        self.assertGreater(visits, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from array import array
+from poker_game_engine.columnar import ACTION_COLUMNS, HAND_COLUMNS, ColumnarExporter, _read_npz, _write_npz, iter_chunks, np
+from poker_game_engine.simulator import HeadlessSimulator
+
+
+class TestColumnarExporter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _export(self, hands: int, chunk_rows: int) -> tuple:
+        with ColumnarExporter(self.directory.name, chunk_rows=chunk_rows, format='npz') as exporter:
+            simulator = HeadlessSimulator(nb_players=3, seed=5, history=exporter)
+            stats = simulator.run(hands)
+        return exporter, stats
+
+    def test_chunks_hold_whole_hands(self):
+        exporter, stats = self._export(300, chunk_rows=100)
+        self.assertGreater(exporter.chunks, 1)
+        seen = set()
+        total_hands = 0
+        for actions, hands in iter_chunks(self.directory.name):
+            self.assertEqual(set(actions), {name for name, _ in ACTION_COLUMNS})
+            self.assertEqual(set(hands), {name for name, _ in HAND_COLUMNS})
+            hand_ids = set(hands["hand_id"])
+            self.assertTrue(set(actions["hand_id"]) <= hand_ids)
+            self.assertFalse(hand_ids & seen)
+            seen |= hand_ids
+            total_hands += len(hand_ids)
+        self.assertEqual(total_hands, stats["hands"])
+
+    def test_results_match_the_simulation(self):
+        _, stats = self._export(200, chunk_rows=1 << 16)
+        nets = [0, 0, 0]
+        for _, hands in iter_chunks(self.directory.name):
+            for player_id, net in zip(hands["player_id"], hands["net"]):
+                nets[player_id] += net
+        self.assertEqual(nets, stats["bankroll_deltas"])
+
+    def test_second_export_adds_chunks(self):
+        first, first_stats = self._export(50, chunk_rows=1 << 16)
+        second, second_stats = self._export(50, chunk_rows=1 << 16)
+        self.assertEqual(second.chunks, first.chunks + 1)
+        hand_ids = []
+        for _, hands in iter_chunks(self.directory.name):
+            hand_ids.extend(sorted(set(int(hand_id) for hand_id in hands["hand_id"])))
+        self.assertEqual(hand_ids, list(range(1, first_stats["hands"] + second_stats["hands"] + 1)))
+
+    def test_npz_round_trip(self):
+        path = os.path.join(self.directory.name, 'columns.npz')
+        columns = {"a": array('q', [1, -2, 1 << 40]), "b": array('b', [0, 1, 1]), "c": array('h')}
+        _write_npz(path, columns)
+        self.assertEqual(_read_npz(path), columns)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_npz_readable_by_numpy(self):
+        path = os.path.join(self.directory.name, 'columns.npz')
+        _write_npz(path, {"a": array('q', [3, 4]), "b": array('b', [1, 0])})
+        with np.load(path) as data:
+            self.assertEqual(data["a"].dtype, np.int64)
+            self.assertEqual(data["a"].tolist(), [3, 4])
+            self.assertEqual(data["b"].tolist(), [1, 0])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ColumnarExporter(self.directory.name, format='csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
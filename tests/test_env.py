@@ -0,0 +1,96 @@
+import random
+import unittest
+from poker_game_engine import env as env_module
+from poker_game_engine.env import VectorPokerEnv
+from poker_game_engine.observation import action_mask
+
+
+def to_list(values):
+    # Copies, the environment reuses its buffers
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return [list(row) if isinstance(row, list) else row for row in values]
+
+
+def rollout(env, steps, seed=0):
+    rng = random.Random(seed)
+    trajectory = []
+    obs, infos = env.reset()
+    trajectory.append(to_list(obs))
+    for _ in range(steps):
+        obs, rewards, dones, infos = env.step([rng.randrange(5) for _ in range(env.nb_tables)])
+        trajectory.append((to_list(obs), to_list(rewards), to_list(dones), to_list(infos["current_player"])))
+    return trajectory
+
+
+class TestVectorPokerEnv(unittest.TestCase):
+
+    def test_shapes_and_masks(self):
+        with VectorPokerEnv(nb_tables=4, nb_players=3, seed=1) as env:
+            obs, infos = env.reset()
+            self.assertEqual(len(obs), 4)
+            self.assertEqual(len(obs[0]), env.obs_dim)
+            for mask in to_list(infos["action_mask"]):
+                self.assertTrue(mask[0])  # Someone to act can always fold
+
+    def test_rewards_are_zero_sum_and_hands_auto_reset(self):
+        with VectorPokerEnv(nb_tables=8, nb_players=3, seed=2) as env:
+            trajectory = rollout(env, 200)
+            totals = [0] * 3
+            hands = 0
+            for _, rewards, dones, _ in trajectory[1:]:
+                hands += sum(dones)
+                for row in rewards:
+                    for seat, value in enumerate(row):
+                        totals[seat] += value
+                    self.assertEqual(sum(row), 0)
+            self.assertGreater(hands, 8)
+            self.assertNotEqual(totals, [0, 0, 0])
+
+    def test_reset_mid_hand_conserves_chips(self):
+        with VectorPokerEnv(nb_tables=2, nb_players=3, seed=4) as env:
+            env.reset()
+            env.step([1, 1])  # Bets, the hands go on
+            tables = env._shard.tables
+            self.assertTrue(all(table.game.pot > 0 for table in tables))
+            env.reset()
+            for table in tables:
+                self.assertEqual(sum(p.bankroll for p in table.game.players) + table.game.pot, 3000)
+
+    def test_default_bet_of_a_short_stack_goes_all_in(self):
+        with VectorPokerEnv(nb_tables=1, nb_players=3, seed=5) as env:
+            env.reset()
+            betting = env._shard.tables[0].betting
+            player = betting.player
+            player.bankroll = betting.to_call + 1  # Short of the minimum raise
+            self.assertTrue(action_mask(betting.game, player, betting.max_bet)[1])
+            env.step([1])
+            self.assertEqual(player.bankroll, 0)
+            self.assertEqual(player.phase_bet, betting.max_bet)
+
+    def test_subprocess_mode_matches_sync_mode(self):
+        with VectorPokerEnv(nb_tables=6, nb_players=2, seed=3) as env:
+            expected = rollout(env, 50)
+        with VectorPokerEnv(nb_tables=6, nb_players=2, seed=3, mode='subprocess', workers=2) as env:
+            self.assertEqual(rollout(env, 50), expected)
+
+    @unittest.skipIf(env_module.np is None, "NumPy is not installed")
+    def test_shared_memory_mode_matches_sync_mode(self):
+        with VectorPokerEnv(nb_tables=6, nb_players=2, seed=3) as env:
+            expected = rollout(env, 50)
+        with VectorPokerEnv(nb_tables=6, nb_players=2, seed=3, mode='shared_memory', workers=2) as env:
+            self.assertEqual(rollout(env, 50), expected)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            VectorPokerEnv(nb_tables=1, mode='threads')
+
+    def test_wrong_number_of_actions(self):
+        with VectorPokerEnv(nb_tables=2, seed=4) as env:
+            env.reset()
+            with self.assertRaises(ValueError):
+                env.step([0])
+
+
+if __name__ == '__main__':
+    unittest.main()
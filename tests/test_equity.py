@@ -0,0 +1,63 @@
+import unittest
+from poker_game_engine.game_engine import Card, Game
+from poker_game_engine.equity import calculate_equity, count_outcomes, player_equity
+
+
+class TestEquity(unittest.TestCase):
+
+    def test_exact_on_the_river(self):
+        hand = [Card('Spades', 'A'), Card('Spades', 'K')]
+        board = [Card('Spades', 'Q'), Card('Spades', 'J'), Card('Spades', '10'), Card('Hearts', '2'), Card('Clubs', '7')]
+        result = calculate_equity(hand, board, opponents=1)
+        self.assertTrue(result.exact)
+        self.assertEqual(result.equity, 1.0)
+        self.assertEqual(result.samples, count_outcomes(45, 0, 1))
+
+    def test_board_split(self):
+        hand = [Card('Hearts', '2'), Card('Diamonds', '3')]
+        board = [Card('Spades', 'A'), Card('Spades', 'K'), Card('Hearts', 'Q'), Card('Clubs', 'J'), Card('Diamonds', '10')]
+        result = calculate_equity(hand, board, opponents=1)
+        self.assertEqual(result.win, 0.0)
+        self.assertAlmostEqual(result.tie, 1.0)
+        self.assertAlmostEqual(result.equity, 0.5)
+
+    def test_monte_carlo_preflop(self):
+        hand = [Card('Hearts', 'A'), Card('Diamonds', 'A')]
+        result = calculate_equity(hand, opponents=1, samples=4000, seed=3)
+        self.assertFalse(result.exact)
+        self.assertEqual(result.samples, 4000)
+        self.assertLess(result.ci_low, result.equity)
+        self.assertGreater(result.ci_high, result.equity)
+        self.assertAlmostEqual(result.equity, 0.85, delta=0.03)
+
+    def test_seeded_results_do_not_depend_on_workers(self):
+        hand = [Card('Clubs', '9'), Card('Clubs', '8')]
+        single = calculate_equity(hand, opponents=3, samples=4000, seed=11)
+        parallel = calculate_equity(hand, opponents=3, samples=4000, seed=11, workers=2)
+        self.assertEqual(single, parallel)
+
+    def test_stops_early_on_tolerance(self):
+        hand = [Card('Hearts', 'A'), Card('Diamonds', 'A')]
+        result = calculate_equity(hand, opponents=1, samples=100000, tolerance=0.05, seed=5)
+        self.assertLess(result.samples, 100000)
+        self.assertLessEqual(result.ci_high - result.ci_low, 0.1)
+
+    def test_dead_cards_are_removed(self):
+        hand = [Card('Hearts', 'A'), Card('Diamonds', 'A')]
+        with self.assertRaises(ValueError):
+            calculate_equity(hand, [Card('Hearts', 'A')], opponents=1)
+
+    def test_player_equity(self):
+        game = Game(players=2)
+        for player in game.players:
+            game.deal_community_card()
+            player.add_card(game.deck.deal())
+            player.add_card(game.deck.deal())
+        game.deal_community_card()
+        game.deal_community_card()
+        result = player_equity(game, game.players[0])
+        self.assertTrue(result.exact)
+        self.assertGreaterEqual(result.equity, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from itertools import combinations, permutations
+from unittest import mock
+from poker_game_engine import equity_cache
+from poker_game_engine.equity_cache import (EquityCache, NB_PREFLOP_CLASSES, canonical_flops, canonical_key,
+                                            precompute, preflop_class, preflop_class_name)
+
+
+def permute_suits(codes, permutation):
+    return tuple((code & ~3) | permutation[code & 3] for code in codes)
+
+
+class TestEquityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'equity.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_preflop_classes(self):
+        classes = {preflop_class(hand) for hand in combinations(range(52), 2)}
+        self.assertEqual(classes, set(range(NB_PREFLOP_CLASSES)))
+        self.assertEqual(preflop_class_name(preflop_class((48, 44))), 'AKs')
+        self.assertEqual(preflop_class_name(preflop_class((48, 45))), 'AKo')
+        self.assertEqual(preflop_class_name(preflop_class((0, 1))), '22')
+
+    def test_canonical_key_ignores_suit_permutations(self):
+        hand, board = (48, 45), (44, 21, 2)
+        key = canonical_key(hand, board)
+        for permutation in permutations(range(4)):
+            self.assertEqual(canonical_key(permute_suits(hand, permutation), permute_suits(board, permutation)), key)
+        self.assertEqual(canonical_key(hand, (44, 21, 3)), key)  # Both suits absent from the hand
+        self.assertNotEqual(canonical_key(hand, (44, 21, 0)), key)
+
+    def test_canonical_flop_count(self):
+        # Pocket aces: 19600 flops, 1 of the 2 hole suits and 2 other suits are interchangeable
+        flops = canonical_flops([preflop_class((48, 49))])
+        self.assertLess(len(flops), 19600)
+        self.assertEqual(len({canonical_key(hand, board) for hand, board in flops}), len(flops))
+
+    def test_table_lookups(self):
+        hand, flop = (48, 49), (0, 21, 38)
+        entries = precompute(self.path, max_opponents=2, preflop_samples=200, flops=[(hand, flop)], flop_samples=200)
+        self.assertEqual(entries, 1)
+        with EquityCache(self.path, samples=200) as cache:
+            aces = cache.equity((50, 51), opponents=1)
+            self.assertGreater(aces, cache.equity((0, 5), opponents=1))
+            self.assertGreater(aces, cache.equity((50, 51), opponents=2))
+            # Same flop with the suits permuted hits the same table entry
+            self.assertEqual(cache.equity(hand, flop), cache.equity((51, 50), (3, 22, 37)))
+            hits = cache._queries.cache_info().hits
+            cache.equity(hand, flop)
+            self.assertEqual(cache._queries.cache_info().hits, hits + 1)
+
+    def test_suit_permuted_queries_share_a_cache_entry(self):
+        with EquityCache(None, samples=200) as cache:
+            hand, turn = (48, 45), (0, 21, 38, 30)
+            first = cache.equity(hand, turn)
+            second = cache.equity(permute_suits(hand, (2, 3, 0, 1)), permute_suits(turn, (2, 3, 0, 1)))
+            self.assertEqual(first, second)
+            info = cache.lookup.cache_info()
+            self.assertEqual((info.misses, info.hits), (1, 1))
+
+    def test_river_queries_are_computed_and_cached(self):
+        with EquityCache(None) as cache:
+            with mock.patch.object(equity_cache, '_equity', wraps=equity_cache._equity) as compute:
+                # Royal flush in spades
+                self.assertEqual(cache.equity((51, 47), (43, 39, 35, 0, 5)), 1.0)
+                self.assertEqual(cache.equity((51, 47), (43, 39, 35, 0, 5)), 1.0)
+            self.assertEqual(compute.call_count, 1)
+            # The repeated query is answered before normalization, the normalized cache is not reached
+            self.assertEqual(cache._queries.cache_info().hits, 1)
+            self.assertEqual(cache.lookup.cache_info().hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
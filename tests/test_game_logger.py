@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.game_logger import GameLogger, NullGameLogger
+
+
+class TestGameLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(players=3, seed=4)
+        self.game.start_new_round()
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, 'game_logs.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_actions(self, logger):
+        action_handler = ActionHandler(game=self.game,
+                                       logger=logger)
+        logger.new_hand()
+        action_handler.player_action_input(self.game.players[0], '2', 20)
+        action_handler.player_action_input(self.game.players[1], '4')
+        action_handler.player_action_input(self.game.players[2], '1')
+        action_handler.deal_community_cards(3)
+        logger.log_community_cards()
+
+    def test_asynchronous_structured_records(self):
+        logger = GameLogger(self.game, log_to_file=True, asynchronous=True, table_id=7,
+                            log_file=self.log_file, json_records=True)
+        self.play_actions(logger)
+        logger.close()
+        with open(self.log_file) as log:
+            records = [json.loads(line) for line in log]
+        actions = [(r["player_id"], r["action"], r["amount"]) for r in records if r["action"]]
+        self.assertEqual(actions, [(0, 'Bet', 20), (1, 'Call', 0), (2, 'Fold', 0)])
+        self.assertTrue(all(r["table_id"] == 7 and r["hand_id"] == 1 for r in records))
+        self.assertIn(self.game.community_cards[0].name, records[-1]["message"])
+
+    def test_synchronous_text_records(self):
+        with GameLogger(self.game, log_to_file=True, log_file=self.log_file) as logger:
+            self.play_actions(logger)
+        with open(self.log_file) as log:
+            content = log.read()
+        self.assertIn("Player 0 performed action: Bet with amount: 20", content)
+        self.assertIn("Community cards: [", content)
+
+    def test_warning_level_keeps_warnings(self):
+        with GameLogger(self.game, log_to_file=True, log_file=self.log_file, level=logging.WARNING) as logger:
+            self.assertFalse(logger.enabled)
+            self.play_actions(logger)
+            logger.log_warning("Bet failed")
+        with open(self.log_file) as log:
+            content = log.read()
+        self.assertIn("Bet failed", content)
+        self.assertNotIn("performed action", content)
+
+    def test_disabled_loggers_do_nothing(self):
+        logger = GameLogger(self.game, log_to_file=False)
+        self.assertFalse(logger.enabled)
+        self.play_actions(logger)
+        self.play_actions(NullGameLogger(self.game))
+        self.assertFalse(os.path.exists(self.log_file))
+
+if __name__ == '__main__':
+    unittest.main()
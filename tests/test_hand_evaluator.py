@@ -1,5 +1,7 @@
 import unittest
-from poker_game_engine.game_engine import Card, HandEvaluator
+from collections import Counter
+from poker_game_engine.game_engine import CARDS, Card, Game, HandEvaluator
+from poker_game_engine.lookup_evaluator import five_card_classes, pack_strength
 
 class TestHandEvaluator(unittest.TestCase):
     def setUp(self):
@@ -45,5 +47,61 @@ class TestHandEvaluator(unittest.TestCase):
         cards = [Card('Hearts', '10'), Card('Hearts', 'J'), Card('Hearts', 'Q'), Card('Hearts', 'K'), Card('Hearts', 'A')]
         self.assertEqual(self.evaluator.evaluate_hand(cards), (9, 14,"Royal Flush"))
 
+    def test_flush_kickers_break_ties(self):
+        # Same category and top card: evaluate_hand cannot tell them apart, the packed strength orders them
+        # down to the fifth card
+        threes = [Card('Hearts', 'A'), Card('Hearts', 'J'), Card('Hearts', '9'), Card('Hearts', '6'), Card('Hearts', '3')]
+        deuces = [Card('Clubs', 'A'), Card('Clubs', 'J'), Card('Clubs', '9'), Card('Clubs', '6'), Card('Clubs', '2')]
+        self.assertEqual(self.evaluator.evaluate_hand(threes), self.evaluator.evaluate_hand(deuces))
+        self.assertGreater(self.evaluator.hand_strength(threes), self.evaluator.hand_strength(deuces))
+        self.assertEqual(self.evaluator.hand_strength(threes), pack_strength(5, [14, 11, 9, 6, 3]))
+
+    def test_full_house_compares_trips_first(self):
+        nines_full = [Card('Hearts', '9'), Card('Diamonds', '9'), Card('Clubs', '9'), Card('Spades', '2'), Card('Hearts', '2')]
+        eights_full = [Card('Hearts', '8'), Card('Diamonds', '8'), Card('Clubs', '8'), Card('Spades', 'A'), Card('Hearts', 'A')]
+        self.assertGreater(self.evaluator.hand_strength(nines_full), self.evaluator.hand_strength(eights_full))
+
+    def test_second_pair_breaks_ties(self):
+        kings_up = [Card('Hearts', 'A'), Card('Diamonds', 'A'), Card('Clubs', 'K'), Card('Spades', 'K'), Card('Hearts', '2')]
+        queens_up = [Card('Clubs', 'A'), Card('Spades', 'A'), Card('Clubs', 'Q'), Card('Spades', 'Q'), Card('Hearts', 'J')]
+        self.assertGreater(self.evaluator.hand_strength(kings_up), self.evaluator.hand_strength(queens_up))
+
+    def test_wheel_is_lowest_straight(self):
+        wheel = [Card('Hearts', 'A'), Card('Diamonds', '2'), Card('Clubs', '3'), Card('Spades', '4'), Card('Hearts', '5')]
+        six_high = [Card('Hearts', '6'), Card('Diamonds', '2'), Card('Clubs', '3'), Card('Spades', '4'), Card('Hearts', '5')]
+        self.assertEqual(self.evaluator.evaluate_hand(wheel), (4, 5, "Straight"))
+        self.assertGreater(self.evaluator.hand_strength(six_high), self.evaluator.hand_strength(wheel))
+
+    def test_exhaustive_five_card_classes(self):
+        frequencies = Counter()
+        classes = {}
+        for codes, count in five_card_classes():
+            strength = self.evaluator.hand_strength([CARDS[code] for code in codes])
+            category = self.evaluator.describe(strength)[0]
+            frequencies[category] += count
+            classes[strength] = category
+
+        self.assertEqual(sum(frequencies.values()), 2598960)
+        self.assertEqual(dict(frequencies), {9: 4, 8: 36, 7: 624, 6: 3744, 5: 5108, 4: 10200, 3: 54912,
+                                             2: 123552, 1: 1098240, 0: 1302540})
+        self.assertEqual(len(classes), 7462)
+        self.assertEqual(dict(Counter(classes.values())), {9: 1, 8: 9, 7: 156, 6: 156, 5: 1277, 4: 10, 3: 858,
+                                                           2: 858, 1: 2860, 0: 1277})
+        # Categories never overlap: every strength of a category beats every strength of the one below
+        ordered = [classes[strength] for strength in sorted(classes)]
+        self.assertEqual(ordered, sorted(ordered))
+
+    def test_determine_winner_reports_split_pots(self):
+        game = Game(players=3)
+        game.players[0].hand = [Card('Hearts', '2'), Card('Diamonds', '3')]
+        game.players[1].hand = [Card('Clubs', '2'), Card('Spades', '3')]
+        game.players[2].hand = [Card('Hearts', 'A'), Card('Diamonds', '4')]
+        game.players[2].active = False
+        game.community_cards = [Card('Clubs', '10'), Card('Spades', 'J'), Card('Hearts', 'Q'),
+                                Card('Diamonds', 'K'), Card('Clubs', 'A')]
+        winners = game.determine_winner()
+        self.assertEqual(list(winners), game.players[:2])
+        self.assertEqual(set(winners.values()), {pack_strength(4, [14])})
+
 if __name__ == '__main__':
     unittest.main()
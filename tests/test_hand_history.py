@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from poker_game_engine.simulator import HeadlessSimulator
+from poker_game_engine.hand_history import HandHistoryWriter, HandHistoryReader, HandReplayer
+
+
+class TestHandHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'hands.bin')
+        with HandHistoryWriter(self.path, table_id=3, flush_every=16) as writer:
+            self.simulator = HeadlessSimulator(nb_players=4, seed=21, history=writer)
+            self.stats = self.simulator.run(100)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_every_hand(self):
+        with HandHistoryReader(self.path) as reader:
+            records = list(reader)
+        self.assertEqual(len(records), self.stats["hands"])
+        self.assertEqual([record.hand_id for record in records], list(range(1, len(records) + 1)))
+        first = records[0]
+        self.assertEqual(first.table_id, 3)
+        self.assertEqual(first.bankrolls, (1000, 1000, 1000, 1000))
+        self.assertEqual(sorted(first.deck), list(range(52)))
+        self.assertTrue(first.actions)
+
+    def test_appending_resumes_hand_ids(self):
+        with open(self.path, 'ab') as history:
+            history.write(b'\xff\x00\x00\x00partial')
+        with HandHistoryWriter(self.path, table_id=3) as writer:
+            HeadlessSimulator(nb_players=4, seed=22, history=writer).run(5)
+        with HandHistoryReader(self.path) as reader:
+            hand_ids = [record.hand_id for record in reader]
+        self.assertEqual(hand_ids, list(range(1, self.stats["hands"] + 6)))
+
+    def test_replay_reproduces_the_run(self):
+        replayer = HandReplayer(verify=True)
+        with HandHistoryReader(self.path) as reader:
+            for record in reader:
+                game = replayer.replay(record)
+        self.assertEqual([p.bankroll for p in game.players], [p.bankroll for p in self.simulator.game.players])
+
+    def test_truncated_record_is_ignored(self):
+        with open(self.path, 'ab') as history:
+            history.write(b'\xff\x00\x00\x00partial')
+        self.assertEqual(HandReplayer().replay_file(self.path), self.stats["hands"])
+
+    def test_recording_before_start_hand_raises(self):
+        player = self.simulator.game.players[0]
+        with HandHistoryWriter(self.path) as writer:
+            with self.assertRaisesRegex(RuntimeError, r"start_hand\(\) not called"):
+                writer.record_action(player, '1')
+            with self.assertRaisesRegex(RuntimeError, r"start_hand\(\) not called"):
+                writer.end_hand([player], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+from poker_game_engine.game_engine import Card, Deck, Game, HandEvaluator
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator, pack_strength
+
+
+class TestLookupHandEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = LookupHandEvaluator()
+        self.reference = HandEvaluator()
+        self.all_cards = [Card(suit, value) for suit in Deck.suits for value in Deck.values]
+
+    def test_matches_reference_on_sampled_boards(self):
+        rng = random.Random(2024)
+        for size in (5, 6, 7):
+            for _ in range(3000):
+                cards = rng.sample(self.all_cards, size)
+                self.assertEqual(self.evaluator.best_hand(cards), self.reference.best_hand(cards), cards)
+
+    def test_wheel_straight(self):
+        cards = [Card('Hearts', 'A'), Card('Diamonds', '2'), Card('Clubs', '3'), Card('Spades', '4'),
+                 Card('Hearts', '5'), Card('Hearts', 'K'), Card('Clubs', '9')]
+        self.assertEqual(self.evaluator.describe(self.evaluator.best_hand(cards)), (4, 5, "Straight"))
+
+    def test_royal_flush(self):
+        cards = [Card('Spades', '10'), Card('Spades', 'J'), Card('Spades', 'Q'), Card('Spades', 'K'),
+                 Card('Spades', 'A'), Card('Hearts', '2'), Card('Clubs', '2')]
+        self.assertEqual(self.evaluator.describe(self.evaluator.best_hand(cards)), (9, 14, "Royal Flush"))
+
+    def test_kickers_break_ties(self):
+        board = [Card('Hearts', '7'), Card('Diamonds', '7'), Card('Clubs', '2'), Card('Spades', '9'), Card('Hearts', '4')]
+        ace_kicker = self.evaluator.best_hand(board + [Card('Clubs', 'A'), Card('Clubs', '3')])
+        king_kicker = self.evaluator.best_hand(board + [Card('Spades', 'K'), Card('Spades', '3')])
+        self.assertGreater(ace_kicker, king_kicker)
+        self.assertEqual(ace_kicker, pack_strength(1, [7, 14, 9, 4]))
+
+    def test_selectable_from_determine_winner(self):
+        game = Game(players=2, evaluator=self.evaluator)
+        game.players[0].hand = [Card('Hearts', 'A'), Card('Diamonds', 'A')]
+        game.players[1].hand = [Card('Hearts', 'K'), Card('Diamonds', 'K')]
+        game.community_cards = [Card('Clubs', '2'), Card('Spades', '7'), Card('Hearts', '9'),
+                                Card('Diamonds', 'J'), Card('Clubs', '4')]
+        winner = game.determine_winner()
+        self.assertEqual(list(winner), [game.players[0]])
+
+if __name__ == '__main__':
+    unittest.main()
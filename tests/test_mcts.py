@@ -0,0 +1,102 @@
+import unittest
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.betting import BettingRound
+from poker_game_engine.game_engine import Card, Game
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.mcts import MCTSAgent, rebuild_round
+from poker_game_engine.simulator import HeadlessSimulator, handle_betting_round, passive_agent
+
+
+def _heads_up(hero_hand: list, shove: bool) -> Game:
+    # Dealer (big blind, seat 0) holds hero_hand; the small blind limps, or shoves 1000
+    game = Game(players=2, seed=7)
+    game.start_new_round()
+    handler = ActionHandler(game, NullGameLogger(game))
+    handler.post_blind(game.get_small_blind_player(), 10)
+    handler.post_blind(game.get_big_blind_player(), 20)
+    hero, villain = game.players
+    hero.hand = list(hero_hand)
+    game.deck.remove_cards(hero.hand)
+    villain.hand = [game.deck.deal(), game.deck.deal()]
+    if shove:
+        game.all_in(villain)
+    else:
+        game.call(villain)
+    game.current_player_id = 0
+    return game
+
+
+class TestRebuildRound(unittest.TestCase):
+    def _round(self, game: Game, seat: int) -> BettingRound:
+        betting = BettingRound(game, ActionHandler(game, NullGameLogger(game)))
+        rebuild_round(betting, seat, 20)
+        return betting
+
+    def test_big_blind_option_after_a_limp(self):
+        betting = self._round(_heads_up([Card('Hearts', '2'), Card('Clubs', '7')], shove=False), 0)
+        self.assertEqual(betting.to_act, 1)
+        self.assertTrue(betting.apply('3'))
+        self.assertTrue(betting.closed)
+
+    def test_small_blind_opens_preflop(self):
+        game = Game(players=2, seed=1)
+        game.start_new_round()
+        handler = ActionHandler(game, NullGameLogger(game))
+        handler.post_blind(game.get_small_blind_player(), 10)
+        handler.post_blind(game.get_big_blind_player(), 20)
+        betting = self._round(game, 1)
+        self.assertEqual(betting.to_act, 2)
+        betting.apply('4')
+        self.assertFalse(betting.closed)
+        self.assertEqual(betting.current, 0)
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def test_calls_a_shove_with_aces_and_folds_seven_deuce(self):
+        agent = MCTSAgent(iterations=600, seed=1)
+        aces = _heads_up([Card('Hearts', 'A'), Card('Spades', 'A')], shove=True)
+        self.assertEqual(agent(aces, aces.players[0]), ('4', 0))
+        seven_deuce = _heads_up([Card('Hearts', '7'), Card('Clubs', '2')], shove=True)
+        self.assertEqual(agent(seven_deuce, seven_deuce.players[0]), ('1', 0))
+
+    def test_search_leaves_the_game_untouched(self):
+        game = _heads_up([Card('Hearts', 'K'), Card('Spades', 'Q')], shove=False)
+        state = game.get_game_state()
+        deck = list(game.deck.cards)
+        MCTSAgent(iterations=200, seed=2)(game, game.players[0])
+        self.assertEqual(game.get_game_state(), state)
+        self.assertEqual(game.deck.cards, deck)
+
+    def test_root_parallel_search_sums_workers(self):
+        game = _heads_up([Card('Hearts', 'K'), Card('Spades', 'K')], shove=False)
+        with MCTSAgent(iterations=300, workers=2, seed=3) as agent:
+            choice, amount = agent(game, game.players[0])
+            self.assertEqual(sum(visits for visits, _ in agent.last_stats.values()), 300)
+        self.assertIn((choice, amount), agent.last_stats)
+
+    def test_time_budget(self):
+        game = _heads_up([Card('Hearts', 'K'), Card('Spades', 'K')], shove=False)
+        agent = MCTSAgent(iterations=None, time_limit=0.05, seed=4)
+        agent(game, game.players[0])
+        self.assertGreater(sum(visits for visits, _ in agent.last_stats.values()), 0)
+
+    def test_plays_headless_hands(self):
+        simulator = HeadlessSimulator(nb_players=3, agents=[MCTSAgent(iterations=50, seed=5), passive_agent,
+                                                             passive_agent], seed=6)
+        stats = simulator.run(5)
+        self.assertEqual(sum(stats["bankroll_deltas"]), 0)
+
+    def test_serves_ai_flag_players_in_betting_rounds(self):
+        game = Game(players=2, seed=8)
+        game.start_new_round()
+        handler = ActionHandler(game, NullGameLogger(game))
+        for player in game.players:
+            player.ai_flag = True
+            handler.handle_deal_card(player)
+            handler.handle_deal_card(player)
+        handle_betting_round(game, NullGameLogger(game), handler, 2, 1, ai_agent=passive_agent)
+        self.assertEqual(game.pot, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
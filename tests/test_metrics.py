@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from poker_game_engine.game_engine import Game, HandEvaluator
+from poker_game_engine.game_logger import GameLogger
+from poker_game_engine.metrics import Metrics, current_metrics
+from poker_game_engine.simulator import HeadlessSimulator, passive_agent
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_window_collects_hot_path_metrics(self):
+        simulator = HeadlessSimulator(nb_players=3, agents=[passive_agent] * 3, seed=2)
+        with Metrics() as metrics:
+            self.assertIs(current_metrics(), metrics)
+            for _ in range(20):
+                simulator.play_hand()
+            simulator.game.get_game_state()
+        snapshot = metrics.snapshot()
+        self.assertIsNone(current_metrics())
+        self.assertEqual(snapshot["hands"], 20)
+        self.assertEqual(snapshot["showdowns"], 20)
+        # Passive players always reach showdown with three hands to evaluate
+        self.assertEqual(snapshot["evaluator_calls_per_showdown"], 3.0)
+        self.assertGreater(snapshot["action_latency_p99"], 0)
+        self.assertGreaterEqual(snapshot["action_latency_p99"], snapshot["action_latency_p50"])
+        for name in ("deck_reset", "get_game_state", "action", "betting_apply", "betting_round", "hand"):
+            self.assertGreater(snapshot["timers"][name]["calls"], 0, name)
+        self.assertEqual(json.loads(metrics.to_json())["hands"], 20)
+        text = metrics.to_prometheus()
+        self.assertIn("poker_engine_hands_total 20", text)
+        self.assertIn('poker_engine_action_latency_seconds{quantile="0.99"}', text)
+
+    def test_disabled_metrics_leave_the_engine_untouched(self):
+        original = HandEvaluator.__dict__["best_hand"]
+        with Metrics():
+            self.assertIsNot(HandEvaluator.__dict__["best_hand"], original)
+        self.assertIs(HandEvaluator.__dict__["best_hand"], original)
+        metrics = Metrics()
+        Game(players=2).start_new_round()
+        self.assertEqual(metrics.snapshot()["timers"], {})
+
+    def test_one_window_at_a_time(self):
+        with Metrics():
+            with self.assertRaises(RuntimeError):
+                Metrics().enable()
+
+    def test_log_performance_metrics(self):
+        game = Game(players=2)
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'game_logs.log')
+            with GameLogger(game, log_to_file=True, log_file=log_file) as logger:
+                with Metrics():
+                    game.start_new_round()
+                    logger.log_performance_metrics()
+            with open(log_file) as log:
+                self.assertIn("Performance:", log.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.observation import ObservationEncoder, action_mask, ACTION_CHOICES
+
+
+def to_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+
+class TestObservation(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(players=3, seed=5)
+        self.handler = ActionHandler(game=self.game, logger=NullGameLogger(self.game))
+        self.game.start_new_round()
+        self.handler.post_blind(self.game.get_small_blind_player(), 10)
+        self.handler.post_blind(self.game.get_big_blind_player(), 20)
+        for player in self.game.players:
+            self.handler.handle_deal_card(player)
+            self.handler.handle_deal_card(player)
+        self.handler.deal_community_cards(3)
+        self.game.current_player_id = 0
+        self.encoder = ObservationEncoder(nb_players=3)
+
+    def test_layout(self):
+        observation = to_list(self.encoder.encode(self.game))
+        self.assertEqual(len(observation), self.encoder.obs_dim)
+        player = self.game.players[0]
+        self.assertEqual([i for i in range(52) if observation[i]], sorted(card.code for card in player.hand))
+        self.assertEqual([i - 52 for i in range(52, 104) if observation[i]],
+                         sorted(card.code for card in self.game.community_cards))
+        # Seat 0 is the dealer: bankrolls seen from seat 0 are [1000, 990, 980] out of 3000 chips
+        self.assertAlmostEqual(observation[104], 1000 / 3000, places=6)
+        self.assertAlmostEqual(observation[106], 980 / 3000, places=6)
+        self.assertEqual(observation[110:113], [1.0, 1.0, 1.0])
+        self.assertAlmostEqual(observation[113], 30 / 3000, places=6)  # Pot
+        self.assertAlmostEqual(observation[114], 20 / 3000, places=6)  # To call
+        self.assertEqual(observation[115:119], [0.0, 1.0, 0.0, 0.0])  # Flop
+        self.assertEqual(observation[119:122], [0.0, 0.0, 1.0])  # Dealer button
+
+    def test_observation_is_relative_to_the_player(self):
+        big_blind = self.game.get_big_blind_player()
+        observation = to_list(self.encoder.encode(self.game, big_blind))
+        self.assertAlmostEqual(observation[104], 980 / 3000, places=6)
+        self.assertEqual(observation[119:122], [0.0, 1.0, 0.0])
+
+    def test_action_mask_follows_the_handler_rules(self):
+        player = self.game.players[0]
+        self.assertEqual(to_list(action_mask(self.game, player)), [True, True, False, True, True])
+        big_blind = self.game.get_big_blind_player()
+        self.assertEqual(to_list(action_mask(self.game, big_blind)), [True, True, True, False, True])
+        player.fold()
+        self.assertEqual(to_list(action_mask(self.game, player)), [False] * len(ACTION_CHOICES))
+
+    def test_batch(self):
+        games = [self.game, Game(players=3, seed=6)]
+        games[1].start_new_round()
+        observations = to_list(self.encoder.encode_batch(games))
+        self.assertEqual(len(observations), 2)
+        self.assertEqual(observations[0], to_list(ObservationEncoder(3).encode(self.game)))
+        masks = to_list(self.encoder.action_mask_batch(games))
+        self.assertEqual(masks[1], [True, True, True, False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from poker_game_engine.game_engine import Game, Card
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.game_logger import NullGameLogger
+from poker_game_engine.pots import build_pots, settle_pots, return_uncalled_bet
+from poker_game_engine.simulator import run_headless_simulation
+
+
+def setup_hand(contributions, hands, board, folded=(), dealer_index=0):
+    game = Game(players=len(contributions))
+    game.dealer_index = dealer_index
+    game.community_cards = [Card(suit, value) for suit, value in board]
+    for player, amount, hand in zip(game.players, contributions, hands):
+        player.bankroll -= amount
+        player.total_game_bet = amount
+        player.hand = [Card(suit, value) for suit, value in hand]
+    for player_id in folded:
+        game.players[player_id].active = False
+    game.pot = sum(contributions)
+    return game
+
+
+BOARD = [('Hearts', '2'), ('Diamonds', '7'), ('Clubs', '9'), ('Spades', 'J'), ('Hearts', '4')]
+ACES = [('Spades', 'A'), ('Clubs', 'A')]
+KINGS = [('Spades', 'K'), ('Clubs', 'K')]
+QUEENS = [('Spades', 'Q'), ('Clubs', 'Q')]
+
+
+class TestPots(unittest.TestCase):
+
+    def test_short_all_in_creates_a_side_pot(self):
+        game = setup_hand([50, 200, 200], [ACES, KINGS, QUEENS], BOARD)
+        pots = build_pots(game.players)
+        self.assertEqual([(amount, [p.player_id for p in eligible]) for amount, eligible, _ in pots],
+                         [(150, [0, 1, 2]), (300, [1, 2])])
+        payouts = settle_pots(game)
+        self.assertEqual({p.player_id: chips for p, chips in payouts.items()}, {0: 150, 1: 300})
+        self.assertEqual([p.bankroll for p in game.players], [1100, 1100, 800])
+        self.assertEqual(game.pot, 0)
+
+    def test_folded_chips_stay_in_the_pot(self):
+        game = setup_hand([100, 40, 100], [KINGS, ACES, QUEENS], BOARD, folded=(1,))
+        pots = build_pots(game.players)
+        self.assertEqual(len(pots), 1)
+        self.assertEqual(pots[0][0], 240)
+        settle_pots(game)
+        self.assertEqual(game.players[0].bankroll, 1140)
+
+    def test_split_pot_odd_chip_goes_left_of_the_dealer(self):
+        board = [('Hearts', 'A'), ('Hearts', 'K'), ('Hearts', 'Q'), ('Hearts', 'J'), ('Hearts', '10')]
+        game = setup_hand([35, 35, 35], [ACES, KINGS, QUEENS], board, folded=(0,), dealer_index=1)
+        payouts = settle_pots(game)
+        # Royal flush on board: players 1 and 2 split 105, player 2 sits left of the dealer
+        self.assertEqual({p.player_id: chips for p, chips in payouts.items()}, {1: 52, 2: 53})
+
+    def test_uncalled_bet_is_returned(self):
+        game = setup_hand([20, 120, 0], [ACES, KINGS, QUEENS], BOARD, folded=(0, 2))
+        self.assertEqual(return_uncalled_bet(game), 100)
+        self.assertEqual(game.pot, 40)
+        payouts = settle_pots(game)
+        self.assertEqual({p.player_id: chips for p, chips in payouts.items()}, {1: 40})
+        self.assertEqual(game.players[1].bankroll, 1020)
+
+    def test_short_blind_posts_all_in(self):
+        game = Game(players=3)
+        handler = ActionHandler(game=game, logger=NullGameLogger(game))
+        player = game.players[0]
+        player.bankroll = 5
+        handler.post_blind(player, 20)
+        self.assertTrue(player.is_all_in)
+        self.assertEqual(game.pot, 5)
+
+    def test_all_in_call_for_less(self):
+        game = Game(players=2)
+        handler = ActionHandler(game=game, logger=NullGameLogger(game))
+        short, big = game.players
+        short.bankroll = 50
+        self.assertTrue(handler.player_action_input(big, '2', 200))
+        self.assertTrue(handler.player_action_input(short, '4'))
+        self.assertTrue(short.is_all_in)
+        self.assertEqual(game.pot, 250)
+
+    def test_chips_are_conserved_with_short_stacks(self):
+        stats = run_headless_simulation(nb_players=6, hands=500, seed=3,
+                                        small_blind=50, big_blind=100)
+        self.assertEqual(sum(stats["bankroll_deltas"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import unittest
+from poker_game_engine.server import TableServer, TableActor
+from poker_game_engine.state_tracker import apply_changes
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestTableServer(unittest.TestCase):
+
+    def test_actor_applies_actions_in_turn(self):
+        async def scenario():
+            actor = TableActor(0, nb_players=2, seed=1, action_timeout=1.0, max_hands=1)
+            updates = actor.subscribe()
+            task = asyncio.ensure_future(actor.run())
+            first = await updates.get()
+            self.assertTrue(first["full"])
+            await asyncio.sleep(0)
+            player = actor.table.player
+            other = 1 - player.player_id
+            actor.submit(other, '1')  # Out of turn, dropped
+            actor.submit(player.player_id, '1')
+            await task
+            self.assertEqual(actor.timeouts, 0)
+            self.assertEqual(actor.table.hands, 1)
+            self.assertEqual(sorted(p.bankroll for p in actor.table.game.players), [990, 1010])
+            messages = []
+            while True:
+                message = await updates.get()
+                if message is None:
+                    break
+                messages.append(message)
+            self.assertTrue(messages)
+            self.assertTrue(all(not message["full"] for message in messages))
+
+        run(scenario())
+
+    def test_timeouts_check_or_fold(self):
+        async def scenario():
+            server = TableServer()
+            actors = [server.add_table(nb_players=3, seed=index, action_timeout=0, max_hands=3)
+                      for index in range(200)]
+            await server.wait_closed()
+            self.assertTrue(all(actor.closed and actor.table.hands == 3 for actor in actors))
+            self.assertTrue(all(sum(p.bankroll for p in actor.table.game.players) == 3000 for actor in actors))
+            await server.close()
+
+        run(scenario())
+
+    def test_local_client_follows_the_table_state(self):
+        async def scenario():
+            server = TableServer()
+            actor = server.add_table(table_id=7, nb_players=2, seed=3, action_timeout=5.0, max_hands=1)
+            client = server.connect_local()
+            client.send({"op": "subscribe", "table_id": 7})
+            message = await client.receive(timeout=1)
+            state = message["state"]
+            while True:
+                current = state["current_player_id"]
+                client.send({"op": "action", "table_id": 7, "player_id": current, "choice": "4"})
+                client.send({"op": "action", "table_id": 7, "player_id": current, "choice": "3"})
+                message = await client.receive(timeout=1)
+                if message["type"] == "closed":
+                    break
+                self.assertEqual(message["type"], "state")
+                apply_changes(state, message["changes"])
+            self.assertEqual([p["bankroll"] for p in state["players"]],
+                             [p.bankroll for p in actor.table.game.players])
+            self.assertEqual(actor.timeouts, 0)
+            client.send({"op": "subscribe", "table_id": 99})
+            self.assertEqual((await client.receive(timeout=1))["type"], "error")
+            client.close()
+            await server.close()
+
+        run(scenario())
+
+    def test_malformed_messages_get_an_error(self):
+        async def scenario():
+            server = TableServer()
+            server.add_table(table_id=2, nb_players=2, seed=6, action_timeout=5.0, max_hands=1)
+            tcp = await server.serve_tcp()
+            host, port = tcp.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            for line in (b'[1, 2]', b'"subscribe"', b'{"op": "subscribe", "table_id": [2]}',
+                         b'{"op": "action", "table_id": 2, "player_id": 0, "choice": "2", "amount": "ten"}',
+                         b'{"op": "action", "table_id": 2, "player_id": 0, "choice": "2", "amount": null}'):
+                writer.write(line + b'\n')
+                message = json.loads(await asyncio.wait_for(reader.readline(), 1))
+                self.assertEqual(message["type"], "error")
+            # The connection is still served
+            writer.write(json.dumps({"op": "subscribe", "table_id": 2}).encode() + b'\n')
+            self.assertTrue(json.loads(await asyncio.wait_for(reader.readline(), 1))["full"])
+            writer.close()
+            await server.close()
+
+        run(scenario())
+
+    def test_tcp_transport(self):
+        async def scenario():
+            server = TableServer()
+            server.add_table(table_id=1, nb_players=2, seed=5, action_timeout=5.0, max_hands=1)
+            tcp = await server.serve_tcp()
+            host, port = tcp.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps({"op": "subscribe", "table_id": 1}).encode() + b'\n')
+            message = json.loads(await asyncio.wait_for(reader.readline(), 1))
+            self.assertTrue(message["full"])
+            current = message["state"]["current_player_id"]
+            writer.write(json.dumps({"op": "action", "table_id": 1, "player_id": current, "choice": "1"}).encode() + b'\n')
+            types = []
+            while not types or types[-1] != "closed":
+                types.append(json.loads(await asyncio.wait_for(reader.readline(), 1))["type"])
+            self.assertEqual(types[-1], "closed")
+            writer.close()
+            await server.close()
+
+        run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from poker_game_engine.simulator import HeadlessSimulator, passive_agent, run_headless_simulation
+
+
+def always_fold(game, player):
+    return ('1', 0)
+
+
+def invalid_agent(game, player):
+    return ('9', 0)
+
+
+class TestHeadlessSimulator(unittest.TestCase):
+
+    def test_seeded_runs_are_reproducible(self):
+        first = run_headless_simulation(nb_players=4, hands=200, seed=42)
+        second = run_headless_simulation(nb_players=4, hands=200, seed=42)
+        self.assertEqual(first["bankroll_deltas"], second["bankroll_deltas"])
+        self.assertEqual(first["wins"], second["wins"])
+
+    def test_chips_are_conserved(self):
+        stats = run_headless_simulation(nb_players=6, hands=300, seed=1)
+        self.assertEqual(sum(stats["bankroll_deltas"]), 0)
+        self.assertGreater(stats["hands"], 0)
+
+    def test_passive_hands_reach_showdown(self):
+        simulator = HeadlessSimulator(nb_players=3, agents=[passive_agent] * 3, seed=0)
+        result = simulator.play_hand()
+        self.assertTrue(result["showdown"])
+        self.assertEqual(result["pot"], 60)
+        self.assertEqual(len(simulator.game.community_cards), 5)
+        self.assertEqual(sum(p.bankroll for p in simulator.game.players), 3000)
+
+    def test_everyone_folds_to_the_big_blind(self):
+        simulator = HeadlessSimulator(nb_players=4, agents=[always_fold] * 4, seed=0)
+        big_blind_player = simulator.game.get_big_blind_player()
+        result = simulator.play_hand()
+        self.assertFalse(result["showdown"])
+        self.assertEqual(result["winners"], [big_blind_player.player_id])
+        self.assertEqual(result["pot"], 30)
+
+    def test_invalid_actions_fall_back(self):
+        simulator = HeadlessSimulator(nb_players=3, agents=[invalid_agent] * 3, seed=0)
+        result = simulator.play_hand()
+        self.assertTrue(result["showdown"])
+
+if __name__ == '__main__':
+    unittest.main()
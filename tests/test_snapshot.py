@@ -0,0 +1,56 @@
+import json
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.lookup_evaluator import LookupHandEvaluator
+from poker_game_engine.snapshot import game_to_dict, game_from_dict, game_to_bytes, game_from_bytes
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(players=4, evaluator=LookupHandEvaluator(), seed=12)
+        self.game.move_dealer()
+        self.game.start_new_round()
+        self.action_handler = ActionHandler(game=self.game,
+                                            logger=None)
+        self.action_handler.handle_bet(self.game.get_small_blind_player(), 10)
+        self.action_handler.handle_bet(self.game.get_big_blind_player(), 20)
+        for player in self.game.players:
+            self.action_handler.handle_deal_card(player)
+            self.action_handler.handle_deal_card(player)
+        self.action_handler.handle_fold(self.game.players[0])
+        self.action_handler.deal_community_cards(3)
+        self.game.players[3].ai_flag = True
+
+    def assertSameGame(self, restored):
+        self.assertEqual(game_to_dict(restored), game_to_dict(self.game))
+        self.assertEqual(restored.get_game_state(), self.game.get_game_state())
+        self.assertIsInstance(restored.evaluator, LookupHandEvaluator)
+        # The restored deck and RNG keep dealing exactly like the original
+        self.assertEqual(restored.deck.deal_order(), self.game.deck.deal_order())
+        restored.start_new_round()
+        self.game.start_new_round()
+        self.assertEqual(restored.deck.deal_order(), self.game.deck.deal_order())
+
+    def test_dict_round_trip(self):
+        data = json.loads(json.dumps(game_to_dict(self.game)))
+        self.assertSameGame(game_from_dict(data))
+
+    def test_binary_round_trip(self):
+        self.assertSameGame(game_from_bytes(game_to_bytes(self.game)))
+
+    def test_binary_without_rng_is_small(self):
+        data = game_to_bytes(self.game, include_rng=False)
+        self.assertLess(len(data), 200)
+        restored = game_from_bytes(data)
+        self.assertEqual(restored.get_game_state(), self.game.get_game_state())
+
+    def test_rejects_unknown_data(self):
+        with self.assertRaises(ValueError):
+            game_from_bytes(b'XXXX' + bytes(40))
+        with self.assertRaises(ValueError):
+            game_from_dict({"version": 99})
+
+if __name__ == '__main__':
+    unittest.main()
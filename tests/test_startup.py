@@ -0,0 +1,77 @@
+import ast
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+import unittest
+from poker_game_engine.__main__ import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules that game and search workers import, and those they must not pay for at startup
+CORE_MODULES = ("poker_game_engine.simulator", "poker_game_engine.table", "poker_game_engine.hand_history",
+                "poker_game_engine.snapshot", "poker_game_engine.tournament", "poker_game_engine.cfr",
+                "poker_game_engine.mcts", "poker_game_engine.equity_cache")
+HEAVY_MODULES = ("numpy", "pyarrow", "concurrent.futures", "multiprocessing", "logging.handlers", "statistics",
+                 "asyncio", "json")
+# Time importing every core module may add to a fresh interpreter, relative to the startup of a bare
+# interpreter on the same machine, so that slow or loaded runners scale both sides
+IMPORT_BUDGET = 8.0
+
+_PROBE = '''
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+modules = sorted(sys.modules)
+import logging
+print(repr({"elapsed": elapsed, "modules": modules, "root_handlers": len(logging.root.handlers)}))
+'''
+
+
+def _probe(modules: tuple) -> dict:
+    # Imports `modules` in a fresh interpreter, without a terminal: a module that starts a game fails on input()
+    completed = subprocess.run([sys.executable, '-c', _PROBE, *modules], cwd=ROOT, stdin=subprocess.DEVNULL,
+                               capture_output=True, text=True, check=True)
+    return ast.literal_eval(completed.stdout)
+
+
+def _startup_times(codes: tuple, repeat: int = 7) -> list:
+    # Best wall-clock time of a fresh interpreter running each of `codes`, run in turn so load hits all alike
+    best = [None] * len(codes)
+    for _ in range(repeat):
+        for index, code in enumerate(codes):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdin=subprocess.DEVNULL, check=True)
+            elapsed = time.perf_counter() - start
+            best[index] = elapsed if best[index] is None else min(best[index], elapsed)
+    return best
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_importing_the_simulator_has_no_side_effects(self):
+        result = _probe(("poker_game_engine.simulator",))
+        self.assertEqual(result["root_handlers"], 0)
+        self.assertFalse(os.path.exists(os.path.join(ROOT, 'game_logs.log')))
+
+    def test_core_modules_do_not_load_heavy_dependencies(self):
+        modules = set(_probe(CORE_MODULES)["modules"])
+        self.assertEqual([name for name in HEAVY_MODULES if name in modules], [])
+
+    def test_import_time_budget(self):
+        bare, core = _startup_times(('pass', 'import ' + ', '.join(CORE_MODULES)))
+        self.assertLess(core - bare, IMPORT_BUDGET * bare)
+
+    def test_main_runs_a_headless_simulation(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(['simulate', '--players', '3', '--hands', '20', '--seed', '4'])
+        self.assertEqual(status, 0)
+        self.assertIn("hands_per_second", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import copy
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.action_handlers import ActionHandler
+from poker_game_engine.state_tracker import StateTracker, apply_changes
+
+
+class TestStateTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(players=4, seed=1)
+        self.action_handler = ActionHandler(game=self.game,
+                                            logger=None)
+        self.game.start_new_round()
+        self.tracker = StateTracker(self.game)
+
+    def test_only_changed_fields_are_sent(self):
+        since = self.tracker.seq
+        self.action_handler.handle_bet(self.game.players[1], 10)
+        diff = self.tracker.get_changes(since)
+        self.assertFalse(diff["full"])
+        self.assertEqual(diff["seq"], since + 1)
+        self.assertEqual(diff["changes"], {
+            "pot": 10,
+            "current_player_id": 1,
+            "last_bet": 10,
+            "players": {1: {"bankroll": 990, "round_bet": 10}},
+        })
+
+    def test_no_change_keeps_sequence(self):
+        seq = self.tracker.commit()
+        self.assertEqual(self.tracker.commit(), seq)
+        self.assertEqual(self.tracker.get_changes(seq)["changes"], {})
+
+    def test_diffs_rebuild_the_full_state(self):
+        client = copy.deepcopy(self.tracker.snapshot())
+        state, seq = client["state"], client["seq"]
+        for player in self.game.players:
+            self.action_handler.handle_deal_card(player)
+            self.tracker.commit()
+        self.action_handler.handle_bet(self.game.players[1], 10)
+        self.action_handler.handle_bet(self.game.players[2], 20)
+        self.tracker.commit()
+        self.action_handler.deal_community_cards(3)
+        diff = self.tracker.get_changes(seq)
+        apply_changes(state, diff["changes"])
+        self.assertEqual(state, self.game.get_game_state())
+
+    def test_new_hand_with_as_many_cards_is_sent(self):
+        for player in self.game.players:
+            self.action_handler.handle_deal_card(player)
+            self.action_handler.handle_deal_card(player)
+        self.action_handler.deal_community_cards(3)
+        client = copy.deepcopy(self.tracker.snapshot())
+        state, seq = client["state"], client["seq"]
+        self.game.start_new_round()
+        for player in self.game.players:
+            self.action_handler.handle_deal_card(player)
+            self.action_handler.handle_deal_card(player)
+        self.action_handler.deal_community_cards(3)
+        diff = self.tracker.get_changes(seq)
+        self.assertIn("community_cards", diff["changes"])
+        self.assertEqual(len(diff["changes"]["players"]), 4)
+        apply_changes(state, diff["changes"])
+        self.assertEqual(state, self.game.get_game_state())
+
+    def test_stale_clients_get_a_snapshot(self):
+        tracker = StateTracker(self.game, history=2)
+        for amount in (10, 20, 30, 40):
+            self.action_handler.handle_bet(self.game.players[0], amount)
+            tracker.commit()
+        diff = tracker.get_changes(0)
+        self.assertTrue(diff["full"])
+        self.assertEqual(diff["state"], self.game.get_game_state())
+        self.assertIs(tracker.get_changes(-1), diff)
+
+if __name__ == '__main__':
+    unittest.main()
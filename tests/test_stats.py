@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+from poker_game_engine import stats as stats_module
+from poker_game_engine.columnar import ColumnarExporter
+from poker_game_engine.simulator import HeadlessSimulator
+from poker_game_engine.stats import PlayerStats, player_stats
+
+
+def _columns() -> tuple:
+    # Hand 1: player 0 raises, player 1 calls, player 0 wins at showdown. Hand 2: player 1 limps, player 0 checks
+    # and wins a showdown too.
+    actions = {
+        "hand_id": array('q', [1, 1, 1, 1, 2, 2]),
+        "street": array('b', [0, 0, 1, 1, 0, 0]),
+        "player_id": array('h', [0, 1, 1, 0, 1, 0]),
+        "action": array('b', [2, 4, 3, 3, 4, 3]),
+        "amount": array('q', [60, 0, 0, 0, 0, 0]),
+        "phase_bet": array('q', [60, 60, 0, 0, 20, 20]),
+        "pot": array('q', [60, 120, 120, 120, 40, 40]),
+        "is_raise": array('b', [1, 0, 0, 0, 0, 0]),
+    }
+    hands = {
+        "hand_id": array('q', [1, 1, 2, 2]),
+        "player_id": array('h', [0, 1, 0, 1]),
+        "big_blind": array('q', [20, 20, 20, 20]),
+        "net": array('q', [60, -60, 20, -20]),
+        "showdown": array('b', [1, 1, 1, 1]),
+        "won": array('b', [1, 0, 1, 0]),
+    }
+    return actions, hands
+
+
+class TestPlayerStats(unittest.TestCase):
+    def test_known_hands(self):
+        stats = PlayerStats()
+        stats.add(*_columns())
+        result = stats.result()
+        self.assertEqual(result[0], {"hands": 2, "vpip": 0.5, "pfr": 0.5, "showdowns": 2, "showdown_win_rate": 1.0,
+                                     "bb_per_100": 200.0})
+        self.assertEqual(result[1], {"hands": 2, "vpip": 1.0, "pfr": 0.0, "showdowns": 2, "showdown_win_rate": 0.0,
+                                     "bb_per_100": -200.0})
+
+    def test_loops_match_vectorized(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ColumnarExporter(directory, chunk_rows=500, format='npz') as exporter:
+                HeadlessSimulator(nb_players=4, seed=9, history=exporter).run(400)
+            result = player_stats(directory)
+            with mock.patch.object(stats_module, 'np', None):
+                fallback = player_stats(directory)
+        self.assertEqual(result.keys(), fallback.keys())
+        for player_id, values in result.items():
+            for name, value in values.items():
+                self.assertAlmostEqual(value, fallback[player_id][name])
+        self.assertGreater(sum(values["hands"] for values in result.values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
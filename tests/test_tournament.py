@@ -0,0 +1,34 @@
+import unittest
+from poker_game_engine.tournament import MultiTableRunner, balance_tables
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_balance_tables_removes_busted_players(self):
+        bankrolls = {pid: 100 for pid in range(12)}
+        for pid in (0, 1, 2, 3):
+            bankrolls[pid] = 0
+        tables = balance_tables([[0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]], bankrolls, table_size=6)
+        self.assertEqual(sorted(len(table) for table in tables), [4, 4])
+        self.assertEqual(sorted(pid for table in tables for pid in table), list(range(4, 12)))
+
+    def test_balance_tables_breaks_tables(self):
+        bankrolls = {pid: 100 for pid in range(18)}
+        for pid in range(0, 18, 2):
+            bankrolls[pid] = 0
+        tables = balance_tables([list(range(0, 6)), list(range(6, 12)), list(range(12, 18))], bankrolls, table_size=6)
+        self.assertEqual(sorted(len(table) for table in tables), [4, 5])
+
+    def test_results_stream_per_table(self):
+        runner = MultiTableRunner(nb_players=12, table_size=6, hands_per_level=20, seed=3, workers=1)
+        results = list(runner.run(max_levels=1))
+        self.assertEqual(sorted(result["table_id"] for result in results), [0, 1])
+        self.assertEqual(sum(runner.bankrolls.values()), 12 * 1000)
+
+    def test_parallel_run_matches_sequential_run(self):
+        sequential = MultiTableRunner(nb_players=12, hands_per_level=20, seed=9, workers=1).run_to_completion(max_levels=3)
+        parallel = MultiTableRunner(nb_players=12, hands_per_level=20, seed=9, workers=2).run_to_completion(max_levels=3)
+        self.assertEqual(sequential, parallel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from poker_game_engine.game_engine import Game
+from poker_game_engine.snapshot import game_to_dict
+
+
+def _dealt_game() -> Game:
+    game = Game(players=3, seed=11)
+    game.start_new_round()
+    for player in game.players:
+        player.add_card(game.deck.deal())
+        player.add_card(game.deck.deal())
+    game.players[1].bet(10)
+    game.players[2].bet(20)
+    game.pot = 30
+    game.last_bet = 20
+    return game
+
+
+class TestApplyUndo(unittest.TestCase):
+    def test_undo_restores_every_action(self):
+        game = _dealt_game()
+        states = [game_to_dict(game)]
+        self.assertTrue(game.apply_action('4'))
+        states.append(game_to_dict(game))
+        self.assertTrue(game.apply_action('2', 50))
+        states.append(game_to_dict(game))
+        self.assertTrue(game.apply_action('1'))
+        states.append(game_to_dict(game))
+        game.deal_street(3)
+        self.assertEqual(game.phase, 'Flop')
+        self.assertEqual([p.phase_bet for p in game.players], [0, 0, 0])
+        states.append(game_to_dict(game))
+        self.assertTrue(game.apply_action('5', player=game.players[0]))
+        while game.action_stack:
+            game.undo_action()
+            self.assertEqual(game_to_dict(game), states.pop())
+        self.assertEqual(states, [])
+
+    def test_illegal_actions_change_nothing(self):
+        game = _dealt_game()
+        before = game_to_dict(game)
+        self.assertFalse(game.apply_action('3'))  # A bet of 20 is pending
+        self.assertFalse(game.apply_action('2', 5))  # Below the last bet
+        self.assertFalse(game.apply_action('9'))
+        self.assertEqual(game.action_stack, [])
+        self.assertEqual(game_to_dict(game), before)
+
+    def test_new_round_clears_the_stack(self):
+        game = _dealt_game()
+        game.apply_action('4')
+        game.start_new_round()
+        self.assertEqual(game.action_stack, [])
+
+
+class TestClone(unittest.TestCase):
+    def test_clone_matches_and_is_independent(self):
+        game = _dealt_game()
+        game.apply_action('4')
+        clone = game.clone()
+        self.assertEqual(game_to_dict(clone), game_to_dict(game))
+        self.assertEqual(clone.action_stack, [])
+        self.assertIs(clone.evaluator, game.evaluator)
+        self.assertIs(clone.players[0].hand[0], game.players[0].hand[0])
+
+        clone.apply_action('2', 60)
+        clone.deal_street(3)
+        clone.start_new_round()
+        self.assertEqual(game.players[0].phase_bet, 20)
+        self.assertEqual(len(game.deck.cards), 46)
+        self.assertEqual(game.community_cards, [])
+
+    def test_clone_shuffles_like_the_original(self):
+        game = Game(players=2, seed=5)
+        clone = game.clone()
+        game.start_new_round()
+        clone.start_new_round()
+        self.assertEqual(clone.deck.cards, game.deck.cards)
+
+
+if __name__ == '__main__':
+    unittest.main()